@@ -0,0 +1,119 @@
+"""
+Iteration wall time of the swarm's reasoning step against worker count.
+
+"async" is the default execution mode: every agent steps in this process
+under asyncio.gather, sharing one broker. Each worker count then runs the
+same agents through ProcessAgentPool (swarm.execution: "process"). Worker
+start-up and the first (warm-up) step are excluded; the table shows the
+median over the remaining steps.
+
+Usage (from the project root):
+    python -m AGI.benchmarks.bench_parallel [--agents 8] [--workers 1 2 4] [--steps 5] [--no-model]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import numpy as np
+
+from AGI.src.bridge.batch import TokenBatch
+from AGI.src.swarm.agent import OmnidirectionalAgent
+from AGI.src.swarm.broker import InferenceBroker
+from AGI.src.swarm.memory import RuleMemory
+from AGI.src.swarm.parallel import ProcessAgentPool, RegistryModel
+
+MEMORY_PATH = "AGI/data/rule_memory.json"
+
+def _task(size: int):
+    grid = [[(r * 7 + c * 3) % 5 if (r + c) % 3 else 0 for c in range(size)] for r in range(size)]
+    return {"input": grid, "output": [row[::-1] for row in grid]}
+
+def _tokens(n: int, dim: int) -> TokenBatch:
+    rng = np.random.default_rng(0)
+    side = int(np.ceil(np.sqrt(n)))
+    metadata = [{"position_normalized": {"x": (i % side) / side, "y": (i // side) / side}} for i in range(n)]
+    return TokenBatch(rng.normal(size=(n, dim)).astype(np.float32), [f"t{i}" for i in range(n)], metadata=metadata)
+
+async def _time_steps(step, steps: int) -> float:
+    await step("warmup")
+    timings = []
+    for i in range(steps):
+        start = time.perf_counter()
+        await step(f"sector_{i}")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+async def _run_async(agents, tokens: TokenBatch, steps: int) -> float:
+    for agent in agents:
+        agent.perceive(tokens)
+
+    async def step(context):
+        await asyncio.gather(*(agent.run_reasoning_step(context) for agent in agents))
+    return await _time_steps(step, steps)
+
+async def _run_process(agents, tokens: TokenBatch, steps: int, workers: int, factory, task) -> float:
+    pool = ProcessAgentPool(num_workers=workers, model_factory=factory, task_data=task, memory_path=MEMORY_PATH)
+    try:
+        await pool.add_agents(agents)
+        await pool.perceive(tokens)
+
+        async def step(context):
+            results = await pool.step(context)
+            for agent in agents:
+                await agent.publish_candidates(results[agent.agent_id])
+        return await _time_steps(step, steps)
+    finally:
+        pool.close()
+
+def _make_agents(n: int, handle, task, memory: RuleMemory):
+    broker = InferenceBroker(handle) if handle is not None else None
+    agents = []
+    for i in range(n):
+        agent = OmnidirectionalAgent(agent_id=f"bench_{i}", model_handle=handle, task_data=task)
+        agent.rule_memory = memory
+        agent.broker = broker
+        agents.append(agent)
+    return agents
+
+async def main_async(args):
+    from AGI.src.config_loader import DEFAULT_CONFIG
+
+    factory = None
+    if not args.no_model:
+        factory = RegistryModel(args.model or DEFAULT_CONFIG.get("cortex", {}).get("model_name",
+                                                                               "openai/clip-vit-base-patch32"))
+    handle = factory() if factory is not None else None
+    task = _task(args.grid)
+    tokens = _tokens(args.tokens, args.dim)
+    memory = RuleMemory(MEMORY_PATH)
+
+    print(f"{args.agents} agents, {args.tokens} tokens, {args.grid}x{args.grid} task, "
+          f"model={'none' if factory is None else factory.model_name}, {os.cpu_count()} cores, "
+          f"median of {args.steps} steps")
+    header = f"{'mode':<12}{'step s':>10}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+
+    baseline = await _run_async(_make_agents(args.agents, handle, task, memory), tokens, args.steps)
+    print(f"{'async':<12}{baseline:>10.3f}{1.0:>8.2f}x")
+    for workers in args.workers:
+        seconds = await _run_process(_make_agents(args.agents, handle, task, memory), tokens, args.steps,
+                                     workers, factory, task)
+        print(f"{f'{workers} workers':<12}{seconds:>10.3f}{baseline / seconds:>8.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--workers", nargs="+", type=int,
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=256)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--grid", type=int, default=30)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--no-model", action="store_true", help="fallback scoring only (no CLIP)")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compare CLIP inference precisions on the example images.
+
+For each mode the cortex and text tower run in a fresh process so peak RSS
+is per mode. Embeddings are compared against fp32 by cosine similarity, and
+prompt rankings by top-1 agreement.
+
+Usage (from the project root):
+    python -m AGI.benchmarks.bench_precision [--modes fp32 bf16 int8] [--repeats 3]
+"""
+import argparse
+import glob
+import multiprocessing as mp
+import resource
+import statistics
+import time
+import numpy as np
+
+from AGI.src.model_registry import PRECISIONS
+
+EXAMPLE_IMAGES = ["AGI/examples/sample_image.png"] + sorted(glob.glob("AGI/examples/arc_tasks/*_composite.png"))
+
+PROMPTS = [
+    "identity: output grid is identical to input grid",
+    "reflection: mirror the top half of the input to the bottom output",
+    "reflection: mirror the left half of the input to the right output",
+    "color_fill: replace all 0-cells with the most frequent non-0 color",
+    "translation: shift all colored objects 3 cells to the right",
+    "pattern_continuation: continue the horizontal line until the edge",
+    "gravity: move all objects to the bottom of the grid",
+    "a photo of a cat",
+]
+
+def _run_mode(args):
+    model_name, dtype, repeats = args
+    import torch
+    from AGI.src.cortex.cortex import CLIPVisualCortex
+    from AGI.src.model_registry import ModelHandle
+
+    torch.set_num_threads(max(1, torch.get_num_threads()))
+    handle = ModelHandle(model_name, "cpu", dtype)
+    handle.load()
+    cortex = CLIPVisualCortex(handle=handle)
+    cortex.cache = None  # measure the model, not the cache
+
+    timings = []
+    segments = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        segments = cortex.process_batch(EXAMPLE_IMAGES)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    text = handle.text_features(PROMPTS).cpu().numpy()
+    text_seconds = time.perf_counter() - start
+
+    images = [np.array([s.embedding for s in image_segments], dtype=np.float32) for image_segments in segments]
+    return {
+        "dtype": dtype,
+        "load_seconds": handle.load_time_seconds,
+        "cortex_seconds": statistics.median(timings),
+        "text_seconds": text_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "model_mb": handle.memory_bytes() / 2**20,
+        "images": images,
+        "text": text,
+    }
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.linalg.norm(x, axis=-1, keepdims=True)
+
+def _drift(reference: dict, result: dict) -> dict:
+    patch_cos = np.concatenate([(_normalize(a) * _normalize(b)).sum(axis=1)
+                                for a, b in zip(reference["images"], result["images"])])
+    text_cos = (_normalize(reference["text"]) * _normalize(result["text"])).sum(axis=1)
+
+    # Does each image still pick the same best prompt (mean-patch vs prompt, as in the swarm)?
+    agree = []
+    for ref_img, img in zip(reference["images"], result["images"]):
+        ref_rank = _normalize(reference["text"]) @ _normalize(ref_img.mean(axis=0))
+        rank = _normalize(result["text"]) @ _normalize(img.mean(axis=0))
+        agree.append(int(np.argmax(ref_rank) == np.argmax(rank)))
+
+    return {
+        "patch_cos_mean": float(patch_cos.mean()),
+        "patch_cos_min": float(patch_cos.min()),
+        "text_cos_mean": float(text_cos.mean()),
+        "top1_agreement": float(np.mean(agree)),
+    }
+
+def main():
+    from AGI.src.config_loader import DEFAULT_CONFIG
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_CONFIG.get("cortex", {}).get("model_name", "openai/clip-vit-base-patch32"))
+    parser.add_argument("--modes", nargs="+", default=list(PRECISIONS), choices=PRECISIONS)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = ["fp32"] + [m for m in args.modes if m != "fp32"]
+    ctx = mp.get_context("spawn")
+    results = {}
+    for mode in modes:
+        with ctx.Pool(1) as pool:
+            results[mode] = pool.apply(_run_mode, ((args.model, mode, args.repeats),))
+
+    reference = results["fp32"]
+    print(f"{len(EXAMPLE_IMAGES)} images, {len(PROMPTS)} prompts, median of {args.repeats} runs")
+    header = f"{'mode':<6}{'cortex s':>10}{'speedup':>9}{'text s':>9}{'load s':>8}{'model MB':>10}{'peak RSS MB':>13}" \
+             f"{'patch cos':>11}{'min cos':>9}{'text cos':>10}{'top-1':>7}"
+    print(header)
+    print("-" * len(header))
+    for mode in modes:
+        r = results[mode]
+        d = _drift(reference, r)
+        print(f"{mode:<6}{r['cortex_seconds']:>10.3f}{reference['cortex_seconds'] / r['cortex_seconds']:>8.2f}x"
+              f"{r['text_seconds']:>9.3f}{r['load_seconds']:>8.2f}{r['model_mb']:>10.1f}{r['peak_rss_mb']:>13.1f}"
+              f"{d['patch_cos_mean']:>11.4f}{d['patch_cos_min']:>9.4f}{d['text_cos_mean']:>10.4f}{d['top1_agreement']:>7.2f}")
+
+if __name__ == "__main__":
+    main()
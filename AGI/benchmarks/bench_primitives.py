@@ -0,0 +1,117 @@
+"""
+Time the predictor's grid primitives against the per-cell Python loops they replaced.
+
+Pattern continuation runs on a single 30x30 grid and on a batch of grids:
+the loop reference goes grid by grid, while the vectorized version fills
+the whole (N, 30, 30) stack in one call. Shape fit (fit search plus
+placement) is timed on 30x30 grids with a small pattern; it needs scipy
+for the pattern's connected components and is skipped without it. Every
+result is checked against the reference.
+
+Usage (from the project root):
+    python -m AGI.benchmarks.bench_primitives [--size 30] [--batch 1000] [--repeats 5]
+"""
+import argparse
+import logging
+import statistics
+import time
+import numpy as np
+import structlog
+
+from AGI.src.swarm.predictor import ARCPredictor
+
+def _loop_horizontal(grid: np.ndarray) -> np.ndarray:
+    new_grid = grid.copy()
+    for i in range(new_grid.shape[0]):
+        row = new_grid[i]
+        last_color = 0
+        for j in range(new_grid.shape[1]):
+            if row[j] != 0:
+                last_color = row[j]
+            elif last_color != 0:
+                row[j] = last_color
+    return new_grid
+
+def _loop_vertical(grid: np.ndarray) -> np.ndarray:
+    return _loop_horizontal(grid.T).T
+
+def _loop_shape_fit_place(test_input: np.ndarray, pattern: np.ndarray) -> np.ndarray:
+    from scipy.ndimage import label, find_objects
+
+    predicted = test_input.copy()
+    labeled, num_features = label(pattern != 0)
+    if num_features == 0:
+        return predicted
+    obj_slice = find_objects(labeled)[0]
+    obj = pattern[obj_slice]
+    ph, pw = obj.shape
+    locations = []
+    for y in range(test_input.shape[0] - ph + 1):
+        for x in range(test_input.shape[1] - pw + 1):
+            if np.all(test_input[y:y + ph, x:x + pw][obj != 0] == 0):
+                locations.append((y - obj_slice[0].start, x - obj_slice[1].start))
+    if not locations:
+        return predicted
+    y_orig, x_orig = locations[0]
+    for r in range(pattern.shape[0]):
+        for c in range(pattern.shape[1]):
+            if pattern[r, c] != 0:
+                if 0 <= y_orig + r < predicted.shape[0] and 0 <= x_orig + c < predicted.shape[1]:
+                    predicted[y_orig + r, x_orig + c] = pattern[r, c]
+    return predicted
+
+def _median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def _row(name: str, loop_s: float, vector_s: float):
+    print(f"{name:<34}{loop_s * 1e3:>12.3f}{vector_s * 1e3:>14.3f}{loop_s / vector_s:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--density", type=float, default=0.2, help="fraction of nonzero cells")
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))  # keep per-call info logs out of the timings
+
+    rng = np.random.default_rng(0)
+    shape = (args.batch, args.size, args.size)
+    batch = rng.integers(1, 10, shape) * (rng.random(shape) < args.density)
+    grid = batch[0]
+
+    print(f"{args.size}x{args.size} grids, density {args.density}, median of {args.repeats} runs")
+    header = f"{'primitive':<34}{'loop ms':>12}{'vectorized ms':>14}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, loop, vectorized in (
+        ("continuation horizontal", _loop_horizontal, ARCPredictor.apply_pattern_continuation_horizontal),
+        ("continuation vertical", _loop_vertical, ARCPredictor.apply_pattern_continuation_vertical),
+    ):
+        assert np.array_equal(np.stack([loop(g) for g in batch]), vectorized(batch))
+        _row(f"{name} (1 grid)", _median_seconds(lambda: loop(grid), args.repeats),
+             _median_seconds(lambda: vectorized(grid), args.repeats))
+        _row(f"{name} ({args.batch} grids)", _median_seconds(lambda: [loop(g) for g in batch], args.repeats),
+             _median_seconds(lambda: vectorized(batch), args.repeats))
+
+    try:
+        import scipy  # noqa: F401  (find_fit_locations needs scipy.ndimage)
+    except ImportError:
+        print("shape fit place: skipped (scipy not installed)")
+        return
+    pattern = np.zeros((args.size, args.size), dtype=batch.dtype)
+    pattern[2:5, 3:7] = rng.integers(1, 10, (3, 4))
+    grids = [np.where(rng.random((args.size, args.size)) < 0.05, 1, 0) for _ in range(min(args.batch, 200))]
+    for g in grids:
+        assert np.array_equal(_loop_shape_fit_place(g, pattern), ARCPredictor.apply_shape_fit_place(g, pattern))
+    _row(f"shape fit place ({len(grids)} grids)",
+         _median_seconds(lambda: [_loop_shape_fit_place(g, pattern) for g in grids], args.repeats),
+         _median_seconds(lambda: [ARCPredictor.apply_shape_fit_place(g, pattern) for g in grids], args.repeats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Time rule retrieval by embedding similarity at several memory sizes.
+
+Rule embeddings are synthetic: clustered unit vectors in CLIP's 512-d text
+space, so no model is loaded. For each size the exact (brute-force) index and
+the IVF index are built from the same vectors; query latency is the median
+over queries near stored rules, and IVF recall@k is measured against exact.
+
+Usage (from the project root):
+    python -m AGI.benchmarks.bench_rule_index [--sizes 1000 10000 100000] [--queries 200]
+"""
+import argparse
+import statistics
+import time
+import numpy as np
+
+from AGI.src.swarm.rule_index import RuleVectorIndex
+
+def _clustered(rng: np.random.Generator, n: int, dim: int, clusters: int) -> np.ndarray:
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, n)] + 0.5 * rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def _time_queries(index: RuleVectorIndex, queries: np.ndarray, k: int):
+    timings, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append({text for text, _ in index.search(query, k)})
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{args.dim}-d embeddings, k={args.k}, nprobe={args.nprobe}, median of {args.queries} queries")
+    header = f"{'rules':>8}{'exact build s':>15}{'exact ms':>10}{'ivf build s':>13}{'ivf ms':>9}{'speedup':>9}{'recall@k':>10}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        vectors = _clustered(rng, size, args.dim, clusters=max(size // 100, 8))
+        texts = [f"rule {i}" for i in range(size)]
+        # Tasks resemble some stored rules: perturbed copies of random rule vectors
+        queries = vectors[rng.integers(0, size, args.queries)] + 0.02 * rng.normal(size=(args.queries, args.dim))
+
+        start = time.perf_counter()
+        exact = RuleVectorIndex(exact_threshold=size + 1)
+        exact.add(texts, vectors)
+        exact_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ivf = RuleVectorIndex(exact_threshold=1, nprobe=args.nprobe)
+        ivf.add(texts, vectors)
+        ivf_build = time.perf_counter() - start
+
+        exact_s, truth = _time_queries(exact, queries, args.k)
+        ivf_s, found = _time_queries(ivf, queries, args.k)
+        recall = np.mean([len(t & f) / len(t) for t, f in zip(truth, found)])
+        print(f"{size:>8}{exact_build:>15.3f}{exact_s * 1e3:>10.3f}{ivf_build:>13.3f}{ivf_s * 1e3:>9.3f}"
+              f"{exact_s / ivf_s:>8.2f}x{recall:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import time
+import numpy as np
+import torch
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from AGI.src.bridge.schemas import AgentToken, VisualSegment
+
+def _rows(vectors: Sequence[Sequence[float]], dtype) -> np.ndarray:
+    """(N, D) matrix of equal-length vectors; (0, 0) when there are none."""
+    if len(vectors) == 0:
+        return np.zeros((0, 0), dtype=dtype)
+    return np.array(vectors, dtype=dtype).reshape(len(vectors), -1)
+
+class TokenBatch:
+    """
+    Columnar batch of agent tokens: one contiguous (N, D) vector matrix plus
+    per-token metadata columns. Vectors are stored as float32 or float16;
+    `tensor()` hands them to torch without copying when possible.
+    Iterating or indexing with an int yields AgentToken views for code that
+    still expects the list-of-tokens API.
+    """
+    def __init__(self, vectors: np.ndarray, token_ids: List[str],
+                 context_refs: Optional[List[Optional[str]]] = None,
+                 timestamps: Optional[np.ndarray] = None,
+                 priorities: Optional[np.ndarray] = None,
+                 metadata: Optional[List[Dict[str, Any]]] = None):
+        vectors = np.asarray(vectors)
+        if vectors.dtype not in (np.float32, np.float16):
+            vectors = vectors.astype(np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(len(token_ids), -1) if len(token_ids) else vectors.reshape(0, 0)
+        n = len(token_ids)
+        if vectors.shape[0] != n:
+            raise ValueError(f"Expected {n} vectors, got {vectors.shape[0]}")
+
+        self.vectors = np.ascontiguousarray(vectors)
+        self.token_ids = list(token_ids)
+        self.context_refs = list(context_refs) if context_refs is not None else [None] * n
+        self.timestamps = np.asarray(timestamps, dtype=np.float64) if timestamps is not None else np.full(n, time.time())
+        self.priorities = np.asarray(priorities, dtype=np.float32) if priorities is not None else np.ones(n, dtype=np.float32)
+        self.metadata = list(metadata) if metadata is not None else [{} for _ in range(n)]
+
+    @classmethod
+    def empty(cls, dim: int = 0, dtype=np.float32) -> "TokenBatch":
+        return cls(np.zeros((0, dim), dtype=dtype), [])
+
+    @classmethod
+    def from_tokens(cls, tokens: Sequence[AgentToken], dtype=np.float32) -> "TokenBatch":
+        if isinstance(tokens, TokenBatch):
+            return tokens
+        return cls(
+            _rows([t.vector for t in tokens], dtype),
+            [t.token_id for t in tokens],
+            context_refs=[t.context_ref for t in tokens],
+            timestamps=[t.timestamp for t in tokens],
+            priorities=[t.priority for t in tokens],
+            metadata=[t.metadata for t in tokens],
+        )
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[VisualSegment], dtype=np.float32,
+                      timestamp: Optional[float] = None) -> "TokenBatch":
+        timestamp = time.time() if timestamp is None else timestamp
+        return cls(
+            _rows([s.embedding for s in segments], dtype),
+            [f"token_{s.segment_id}" for s in segments],
+            context_refs=[s.segment_id for s in segments],
+            timestamps=np.full(len(segments), timestamp),
+            metadata=[s.metadata for s in segments],
+        )
+
+    @classmethod
+    def concat(cls, batches: Iterable["TokenBatch"]) -> "TokenBatch":
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        dtype = np.result_type(*[b.vectors.dtype for b in batches])
+        return cls(
+            np.concatenate([b.vectors for b in batches]).astype(dtype, copy=False),
+            [i for b in batches for i in b.token_ids],
+            context_refs=[r for b in batches for r in b.context_refs],
+            timestamps=np.concatenate([b.timestamps for b in batches]),
+            priorities=np.concatenate([b.priorities for b in batches]),
+            metadata=[m for b in batches for m in b.metadata],
+        )
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def take(self, indices: Sequence[int]) -> "TokenBatch":
+        indices = np.asarray(indices, dtype=np.int64)
+        return TokenBatch(
+            self.vectors[indices],
+            [self.token_ids[i] for i in indices],
+            context_refs=[self.context_refs[i] for i in indices],
+            timestamps=self.timestamps[indices],
+            priorities=self.priorities[indices],
+            metadata=[self.metadata[i] for i in indices],
+        )
+
+    def tensor(self, indices: Optional[Sequence[int]] = None, device: str = "cpu") -> torch.Tensor:
+        """
+        Float32 tensor of the vectors (optionally a row subset). The full
+        float32 matrix on CPU shares memory with the batch.
+        """
+        if not self.vectors.flags.writeable:
+            # e.g. decoded from immutable bytes; torch can only share writable memory
+            rows = self.vectors if indices is None else self.vectors[np.asarray(indices, dtype=np.int64)]
+            return torch.from_numpy(np.array(rows)).to(device=device, dtype=torch.float32)
+        matrix = torch.from_numpy(self.vectors)
+        if indices is not None:
+            matrix = matrix[torch.as_tensor(indices, dtype=torch.long)]
+        return matrix.to(device=device, dtype=torch.float32)
+
+    def token(self, i: int) -> AgentToken:
+        # model_construct skips per-element validation; the data is already typed
+        return AgentToken.model_construct(
+            token_id=self.token_ids[i],
+            vector=self.vectors[i].tolist(),
+            context_ref=self.context_refs[i],
+            timestamp=float(self.timestamps[i]),
+            priority=float(self.priorities[i]),
+            metadata=self.metadata[i],
+        )
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[AgentToken, "TokenBatch"]:
+        if isinstance(key, slice):
+            return self.take(range(len(self))[key])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return self.token(key)
+
+    def __iter__(self) -> Iterator[AgentToken]:
+        for i in range(len(self)):
+            yield self.token(i)
+
+    def to_tokens(self) -> List[AgentToken]:
+        """Compatibility view as a list of AgentTokens."""
+        return list(self)
@@ -0,0 +1,195 @@
+"""
+Compact binary format for VisualSegment, AgentToken and Hypothesis batches.
+
+Layout (all little-endian):
+
+    magic      4 bytes   b"BRV3"
+    version    uint8
+    kind       uint8     1 = segments, 2 = tokens, 3 = hypotheses
+    reserved   uint16
+    header_len uint32
+    header     JSON (utf-8): string/metadata columns plus an "arrays" table
+               of {name, dtype, shape, offset} entries
+    padding    to an 8-byte boundary
+    body       raw array blocks, each 8-byte aligned
+
+Numeric columns live in the body as raw blocks, so decoding is a
+`np.frombuffer` view rather than float-to-text parsing. Decoding from a
+writable buffer (bytearray, or `read_file`) yields writable, zero-copy arrays.
+"""
+import json
+import mmap
+import struct
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from AGI.src.bridge.batch import TokenBatch
+from AGI.src.bridge.schemas import AgentToken, VisualSegment
+from AGI.src.swarm.schemas import Hypothesis
+
+MAGIC = b"BRV3"
+VERSION = 1
+KIND_SEGMENTS = 1
+KIND_TOKENS = 2
+KIND_HYPOTHESES = 3
+
+_PREAMBLE = struct.Struct("<4sBBHI")
+_ALIGN = 8
+
+class CodecError(ValueError):
+    pass
+
+def _json_default(value: Any):
+    # Metadata may carry NumPy scalars/arrays from the cortex
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+def _pack(kind: int, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> bytes:
+    table = []
+    blocks = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("<"))
+        table.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape), "offset": offset})
+        data = array.tobytes()
+        blocks.append(data + b"\0" * _pad(len(data)))
+        offset += len(data) + _pad(len(data))
+
+    header = dict(header, arrays=table)
+    header_bytes = json.dumps(header, separators=(",", ":"), default=_json_default).encode("utf-8")
+    preamble = _PREAMBLE.pack(MAGIC, VERSION, kind, 0, len(header_bytes))
+    head = preamble + header_bytes
+    return b"".join([head, b"\0" * _pad(len(head))] + blocks)
+
+def _unpack(buf, expected_kind: int) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    view = memoryview(buf)
+    if len(view) < _PREAMBLE.size:
+        raise CodecError("Buffer too small")
+    magic, version, kind, _, header_len = _PREAMBLE.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise CodecError("Not a BRV3 buffer")
+    if version > VERSION:
+        raise CodecError(f"Unsupported format version {version}")
+    if kind != expected_kind:
+        raise CodecError(f"Expected kind {expected_kind}, got {kind}")
+
+    start = _PREAMBLE.size
+    header = json.loads(bytes(view[start:start + header_len]).decode("utf-8"))
+    body = start + header_len
+    body += _pad(body)
+
+    arrays = {}
+    for entry in header.pop("arrays"):
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"])) if entry["shape"] else 1
+        array = np.frombuffer(view, dtype=dtype, count=count, offset=body + entry["offset"])
+        arrays[entry["name"]] = array.reshape(entry["shape"])
+    return header, arrays
+
+def peek_kind(buf) -> int:
+    """Return the record kind of an encoded buffer without decoding it."""
+    magic, _, kind, _, _ = _PREAMBLE.unpack_from(memoryview(buf), 0)
+    if magic != MAGIC:
+        raise CodecError("Not a BRV3 buffer")
+    return kind
+
+# --- Segments -------------------------------------------------------------
+
+def encode_segments(segments: Sequence[VisualSegment], dtype: str = "float32") -> bytes:
+    if segments:
+        embeddings = np.array([s.embedding for s in segments], dtype=dtype).reshape(len(segments), -1)
+    else:
+        embeddings = np.zeros((0, 0), dtype=dtype)
+    header = {
+        "ids": [s.segment_id for s in segments],
+        "metadata": [s.metadata for s in segments],
+        "summaries": [s.content_summary for s in segments],
+    }
+    return _pack(KIND_SEGMENTS, header, {"embeddings": embeddings})
+
+def decode_segments(buf) -> List[VisualSegment]:
+    header, arrays = _unpack(buf, KIND_SEGMENTS)
+    embeddings = arrays["embeddings"].astype(np.float32, copy=False)
+    return [
+        VisualSegment.model_construct(segment_id=sid, embedding=emb.tolist(), metadata=meta, content_summary=summary)
+        for sid, emb, meta, summary in zip(header["ids"], embeddings, header["metadata"], header["summaries"])
+    ]
+
+# --- Tokens ---------------------------------------------------------------
+
+def encode_tokens(tokens: Union[TokenBatch, Sequence[AgentToken]]) -> bytes:
+    batch = TokenBatch.from_tokens(tokens)
+    header = {
+        "ids": batch.token_ids,
+        "context_refs": batch.context_refs,
+        "metadata": batch.metadata,
+    }
+    arrays = {
+        "vectors": batch.vectors,
+        "timestamps": batch.timestamps,
+        "priorities": batch.priorities,
+    }
+    return _pack(KIND_TOKENS, header, arrays)
+
+def decode_tokens(buf) -> TokenBatch:
+    """Decode into a TokenBatch whose vectors view the buffer directly."""
+    header, arrays = _unpack(buf, KIND_TOKENS)
+    return TokenBatch(
+        arrays["vectors"],
+        header["ids"],
+        context_refs=header["context_refs"],
+        timestamps=arrays["timestamps"],
+        priorities=arrays["priorities"],
+        metadata=header["metadata"],
+    )
+
+# --- Hypotheses -----------------------------------------------------------
+
+def encode_hypotheses(hypotheses: Sequence[Hypothesis]) -> bytes:
+    header = {
+        "ids": [h.hypothesis_id for h in hypotheses],
+        "content": [h.content for h in hypotheses],
+        "agents": [h.agent_id for h in hypotheses],
+        "evidence": [h.evidence for h in hypotheses],
+        "path_history": [h.path_history for h in hypotheses],
+        "metadata": [h.metadata for h in hypotheses],
+    }
+    arrays = {
+        "scores": np.array([h.score for h in hypotheses], dtype=np.float64),
+        "iterations": np.array([h.iteration for h in hypotheses], dtype=np.int32),
+    }
+    return _pack(KIND_HYPOTHESES, header, arrays)
+
+def decode_hypotheses(buf) -> List[Hypothesis]:
+    header, arrays = _unpack(buf, KIND_HYPOTHESES)
+    return [
+        Hypothesis.model_construct(
+            hypothesis_id=hid, content=content, score=float(score), evidence=list(evidence),
+            path_history=list(path), agent_id=agent, iteration=int(iteration), metadata=meta,
+        )
+        for hid, content, agent, evidence, path, meta, score, iteration in zip(
+            header["ids"], header["content"], header["agents"], header["evidence"],
+            header["path_history"], header["metadata"], arrays["scores"], arrays["iterations"])
+    ]
+
+# --- Files ----------------------------------------------------------------
+
+def write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def read_file(path: str) -> memoryview:
+    """
+    Map a file copy-on-write: decoded arrays view the page cache directly
+    and stay writable without touching the file.
+    """
+    with open(path, "rb") as f:
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
@@ -1,6 +1,9 @@
 import time
-from typing import List
+import numpy as np
+from typing import AsyncIterator, List
 from AGI.src.bridge.schemas import VisualSegment, AgentToken
+from AGI.src.bridge.batch import TokenBatch
+from AGI.src.config_loader import DEFAULT_CONFIG
 
 class Bridge:
     """
@@ -22,8 +25,21 @@ class Bridge:
         )
     
     @staticmethod
-    def translate_batch(segments: List[VisualSegment]) -> List[AgentToken]:
+    def translate_batch(segments: List[VisualSegment], dtype: str = None) -> TokenBatch:
         """
-        Convert a batch of VisualSegments to AgentTokens.
+        Convert a batch of VisualSegments into a columnar TokenBatch.
+        Iterating the batch still yields AgentTokens.
         """
-        return [Bridge.translate_segment(s) for s in segments]
+        dtype = dtype or DEFAULT_CONFIG.get("bridge", {}).get("storage_dtype", "float32")
+        return TokenBatch.from_segments(segments, dtype=np.dtype(dtype))
+
+
+    @staticmethod
+    async def translate_stream(segment_chunks: AsyncIterator[List[VisualSegment]],
+                               dtype: str = None) -> AsyncIterator[TokenBatch]:
+        """
+        Translate a stream of segment chunks incrementally, one TokenBatch per chunk.
+        """
+        async for segments in segment_chunks:
+            if segments:
+                yield Bridge.translate_batch(segments, dtype=dtype)
@@ -1,4 +1,19 @@
 from AGI.src.cortex.cortex import CLIPVisualCortex
+from AGI.src.cortex.grid import GridVisualCortex
+from AGI.src.config_loader import DEFAULT_CONFIG
 
 # Default to the real CLIP-based visual cortex implementation
 VisualCortex = CLIPVisualCortex
+
+def create_cortex(config: dict = None):
+    """
+    Build the cortex selected by `cortex.type` ("clip" or "grid").
+    The grid cortex never loads a model.
+    """
+    config = config if config is not None else DEFAULT_CONFIG.get("cortex", {})
+    cortex_type = config.get("type", "clip")
+    if cortex_type == "grid":
+        return GridVisualCortex()
+    if cortex_type == "clip":
+        return CLIPVisualCortex()
+    raise ValueError(f"Unknown cortex type: {cortex_type}")
@@ -1,9 +1,37 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Iterator, List, Optional
 from AGI.src.bridge.schemas import VisualSegment
 
+_DONE = object()
+
 class VisualCortexBase(ABC):
     @abstractmethod
     def process(self, image_path: str) -> List[VisualSegment]:
         """Process an image file and return segmented embeddings."""
         pass
+
+    def process_batch(self, image_paths: List[str]) -> List[List[VisualSegment]]:
+        """Process several images; implementations may override to share forward passes."""
+        return [self.process(path) for path in image_paths]
+
+    def iter_segments(self, image_path: Any) -> Iterator[List[VisualSegment]]:
+        """
+        Yield segments in chunks as they become available. The default yields
+        everything at once; implementations override to yield incrementally.
+        """
+        yield self.process(image_path)
+
+    async def stream(self, image_path: Any, executor: Optional[Executor] = None) -> AsyncIterator[List[VisualSegment]]:
+        """
+        Async view of `iter_segments`. Each chunk is produced in a thread
+        executor so the event loop (and the swarm) keeps running meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = self.iter_segments(image_path)
+        while True:
+            chunk = await loop.run_in_executor(executor, next, chunks, _DONE)
+            if chunk is _DONE:
+                break
+            yield chunk
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import shutil
+import time
+import numpy as np
+import structlog
+from typing import Optional, Tuple, Dict
+
+logger = structlog.get_logger()
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk cache for patch embeddings.
+    Each entry is a directory holding `embeddings.npy` and `coords.npy`,
+    loaded back memory-mapped so a warm run never copies or recomputes them.
+    """
+    def __init__(self, cache_dir: str = "AGI/data/embedding_cache",
+                 max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(image_bytes: bytes, model_name: str, grid_size: int, patch_size: int, dtype: str) -> str:
+        # Precision is part of the model identity: fp32/bf16/int8 embeddings differ
+        digest = hashlib.sha256(image_bytes)
+        digest.update(f"|{model_name}@{dtype}|{grid_size}|{patch_size}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Return (embeddings, coords) as read-only memory maps, or None on a miss.
+        """
+        entry = self._entry_dir(key)
+        try:
+            embeddings = np.load(os.path.join(entry, "embeddings.npy"), mmap_mode="r")
+            coords = np.load(os.path.join(entry, "coords.npy"), mmap_mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+
+        if self.max_age_seconds is not None and time.time() - os.path.getmtime(entry) > self.max_age_seconds:
+            self.misses += 1
+            return None
+
+        # Touch so size-based eviction drops the least recently used entries first
+        os.utime(entry, None)
+        self.hits += 1
+        return embeddings, coords
+
+    def put(self, key: str, embeddings: np.ndarray, coords: np.ndarray):
+        """
+        Store an entry atomically: write into a temp dir, then rename into place.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = self._entry_dir(key)
+        tmp = f"{entry}.tmp{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+        np.save(os.path.join(tmp, "embeddings.npy"), np.ascontiguousarray(embeddings, dtype=np.float32))
+        np.save(os.path.join(tmp, "coords.npy"), np.ascontiguousarray(coords, dtype=np.float64))
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another writer got there first; its content is identical
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=entry)
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(path) or ".tmp" in name:
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+        return entries
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Drop entries older than `max_age_seconds`, then the least recently
+        used ones until the cache fits in `max_bytes`. The `keep` entry (the
+        one just written) is never dropped. Returns entries removed.
+        """
+        if self.max_bytes is None and self.max_age_seconds is None:
+            return 0
+
+        now = time.time()
+        entries = sorted(self._entries())
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            too_old = self.max_age_seconds is not None and now - mtime > self.max_age_seconds
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if path == keep or not (too_old or too_big):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("embedding_cache_evicted", removed=removed, remaining_bytes=total)
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
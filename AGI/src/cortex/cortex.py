@@ -1,53 +1,77 @@
-import torch
+import io
 from PIL import Image
 import numpy as np
-from transformers import CLIPProcessor, CLIPModel
-from typing import List, Tuple
+from typing import Iterator, List, Tuple, Optional
 
 from AGI.src.cortex.base import VisualCortexBase
+from AGI.src.cortex.cache import EmbeddingCache
 from AGI.src.bridge.schemas import VisualSegment
+from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.model_registry import MODEL_REGISTRY, ModelHandle
 
 class CLIPVisualCortex(VisualCortexBase):
-    def __init__(self, model_name: str = "openai/clip-vit-base-patch32"):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"Loading CLIP model '{model_name}' on {self.device}...")
-        self.model = CLIPModel.from_pretrained(model_name).to(self.device)
-        self.processor = CLIPProcessor.from_pretrained(model_name)
+    def __init__(self, model_name: str = None, patch_size: int = None, batch_size: int = None,
+                 cache: Optional[EmbeddingCache] = None, handle: Optional[ModelHandle] = None):
+        config = DEFAULT_CONFIG.get("cortex", {})
+        # The model itself is loaded lazily by the shared registry on first embed
+        self.handle = handle or MODEL_REGISTRY.get(model_name)
+        self.model_name = self.handle.model_name
+        self.device = self.handle.device
         self.grid_size = 224  # CLIP input size
-        self.patch_size = 32  # For ViT-B/32
+        self.patch_size = patch_size or config.get("patch_size", 32)  # For ViT-B/32
+        # Number of patches embedded per forward pass
+        self.batch_size = batch_size or config.get("batch_size", 64)
+        # Smaller chunks when streaming so reasoning can start on the first patches
+        self.stream_chunk_size = config.get("stream_chunk_size", 16)
 
-    def _extract_patch_embeddings(self, image: Image.Image) -> Tuple[List[np.ndarray], List[Tuple[float, float]]]:
-        """Extract embeddings from grid patches for pseudo-segmentation."""
+        cache_config = config.get("cache", {})
+        if cache is None and cache_config.get("enabled", False):
+            cache = EmbeddingCache(cache_dir=cache_config.get("dir", "AGI/data/embedding_cache"),
+                                   max_bytes=cache_config.get("max_bytes"),
+                                   max_age_seconds=cache_config.get("max_age_seconds"))
+        self.cache = cache
+
+    @property
+    def model(self):
+        return self.handle.model
+
+    @property
+    def processor(self):
+        return self.handle.processor
+
+    def _crop_patches(self, image: Image.Image) -> Tuple[List[Image.Image], List[Tuple[float, float]]]:
+        """Cut the resized image into grid patches with their normalized coordinates."""
         # Resize while preserving aspect for consistent patching
         image_resized = image.resize((self.grid_size, self.grid_size))
-        
-        embeddings = []
+
+        patches = []
         coords = []
-        
-        with torch.no_grad():
-            for y in range(0, self.grid_size, self.patch_size):
-                for x in range(0, self.grid_size, self.patch_size):
-                    # Crop the patch
-                    patch = image_resized.crop((x, y, x + self.patch_size, y + self.patch_size))
-                    # Process patch
-                    patch_inputs = self.processor(images=patch, return_tensors="pt").to(self.device)
-                    # Extract features
-                    patch_emb = self.model.get_image_features(**patch_inputs)[0].cpu().numpy()
-                    embeddings.append(patch_emb)
-                    # Normalized coordinates for spatial awareness
-                    coords.append((x / self.grid_size, y / self.grid_size))
-        
-        return embeddings, coords
+        for y in range(0, self.grid_size, self.patch_size):
+            for x in range(0, self.grid_size, self.patch_size):
+                patches.append(image_resized.crop((x, y, x + self.patch_size, y + self.patch_size)))
+                # Normalized coordinates for spatial awareness
+                coords.append((x / self.grid_size, y / self.grid_size))
+        return patches, coords
 
-    def process(self, image_path: str) -> List[VisualSegment]:
-        """
-        Process an image file and return segmented embeddings.
-        """
-        image = Image.open(image_path).convert("RGB")
-        embeddings, coords = self._extract_patch_embeddings(image)
-        
-        segments = []
+    def _embed_patches(self, patches: List[Image.Image]) -> np.ndarray:
+        """Embed patches in chunks of `batch_size`, one forward pass per chunk."""
+        chunks = []
+        for start in range(0, len(patches), self.batch_size):
+            features = self.handle.image_features(patches[start:start + self.batch_size])
+            chunks.append(features.cpu().numpy())
+        if not chunks:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(chunks, axis=0)
+
+    def _extract_patch_embeddings(self, image: Image.Image) -> Tuple[List[np.ndarray], List[Tuple[float, float]]]:
+        """Extract embeddings from grid patches for pseudo-segmentation."""
+        patches, coords = self._crop_patches(image)
+        embeddings = self._embed_patches(patches)
+        return list(embeddings), coords
+
+    def _build_segments(self, embeddings, coords: List[Tuple[float, float]]) -> List[VisualSegment]:
         import uuid
+        segments = []
         for emb, (norm_x, norm_y) in zip(embeddings, coords):
             segments.append(
                 VisualSegment(
@@ -62,3 +86,80 @@ class CLIPVisualCortex(VisualCortexBase):
                 )
             )
         return segments
+
+    def _cache_key(self, image_bytes: bytes) -> str:
+        return EmbeddingCache.make_key(image_bytes, self.model_name, self.grid_size, self.patch_size,
+                                       self.handle.dtype)
+
+    def process(self, image_path: str) -> List[VisualSegment]:
+        """
+        Process an image file and return segmented embeddings.
+        """
+        return self.process_batch([image_path])[0]
+
+    def process_batch(self, image_paths: List[str]) -> List[List[VisualSegment]]:
+        """
+        Process several images at once. Patches from all images that miss the
+        cache share the same forward passes; segments are returned per image,
+        in input order.
+        """
+        results: List[Optional[List[VisualSegment]]] = [None] * len(image_paths)
+        pending = []  # (result index, cache key, coords) for images that need embedding
+        all_patches = []
+        for i, path in enumerate(image_paths):
+            with open(path, "rb") as f:
+                image_bytes = f.read()
+
+            key = None
+            if self.cache is not None:
+                key = self._cache_key(image_bytes)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    embeddings, coords = cached
+                    results[i] = self._build_segments(embeddings, [tuple(c) for c in coords.tolist()])
+                    continue
+
+            image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+            patches, coords = self._crop_patches(image)
+            all_patches.extend(patches)
+            pending.append((i, key, coords))
+
+        if pending:
+            embeddings = self._embed_patches(all_patches)
+            offset = 0
+            for i, key, coords in pending:
+                image_embeddings = embeddings[offset:offset + len(coords)]
+                offset += len(coords)
+                if key is not None:
+                    self.cache.put(key, image_embeddings, np.asarray(coords, dtype=np.float64))
+                results[i] = self._build_segments(image_embeddings, coords)
+        return results
+
+    def iter_segments(self, image_path: str) -> Iterator[List[VisualSegment]]:
+        """
+        Yield segments chunk by chunk as patches are embedded. A cache hit
+        yields everything at once; a miss is written to the cache at the end.
+        """
+        with open(image_path, "rb") as f:
+            image_bytes = f.read()
+
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(image_bytes)
+            cached = self.cache.get(key)
+            if cached is not None:
+                embeddings, coords = cached
+                yield self._build_segments(embeddings, [tuple(c) for c in coords.tolist()])
+                return
+
+        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        patches, coords = self._crop_patches(image)
+        chunk_size = min(self.batch_size, self.stream_chunk_size)
+        chunks = []
+        for start in range(0, len(patches), chunk_size):
+            embeddings = self._embed_patches(patches[start:start + chunk_size])
+            chunks.append(embeddings)
+            yield self._build_segments(embeddings, coords[start:start + chunk_size])
+
+        if key is not None and chunks:
+            self.cache.put(key, np.concatenate(chunks, axis=0), np.asarray(coords, dtype=np.float64))
@@ -49,12 +49,22 @@ class GridUpdate(BaseModel):
     color: int
 
 # API Endpoints
+def _load_memory():
+    # Goes through RuleMemory so journaled changes not yet compacted are included
+    from AGI.src.swarm.memory import RuleMemory
+    return RuleMemory(storage_path=MEMORY_PATH)
+
 @app.get("/api/memory")
 async def get_memory():
-    if os.path.exists(MEMORY_PATH):
-        with open(MEMORY_PATH, "r") as f:
-            return json.load(f)
-    return {"rules": []}
+    return {"rules": _load_memory().rules}
+
+@app.get("/api/models")
+async def get_models():
+    from AGI.src.model_registry import MODEL_REGISTRY
+    from AGI.src.text_cache import TEXT_CACHE
+    from AGI.src.swarm.verification import VERIFICATION_CACHE
+    return {"models": MODEL_REGISTRY.stats(), "text_cache": TEXT_CACHE.stats(),
+            "verification_cache": VERIFICATION_CACHE.stats()}
 
 @app.get("/api/state")
 async def get_reasoning_state():
@@ -70,38 +80,31 @@ async def get_reasoning_state():
 @app.post("/api/predict")
 async def trigger_predict():
     from AGI.src.swarm.predictor import ARCPredictor
+    from AGI.src.swarm.verification import VERIFICATION_CACHE
     
     ACTIVE_TASK["current_step"] = 3
     ACTIVE_TASK["active_hypotheses"] = []
     
     # 1. Load Rules from Memory
+    # (RuleMemory handles both the {"rules": [...]} and legacy {"rule_text": weight} schemas)
     rules = []
-    if os.path.exists(MEMORY_PATH):
-        try:
-            with open(MEMORY_PATH, "r") as f:
-                data = json.load(f)
-            with open(MEMORY_PATH, "r") as f:
-                data = json.load(f)
-                if "rules" in data and isinstance(data["rules"], list): 
-                    # New Schema: {"rules": [{"text":...}, ...]}
-                    rules = [r["text"] for r in data["rules"]]
-                elif isinstance(data, dict): 
-                    # Legacy Schema: {"rule_text": weight}
-                    rules = list(data.keys())
-        except Exception as e:
-            print(f"Error loading rules: {e}")
-
-    # 1.5 Load Hints from hints.json (High Priority)
-    HINTS_PATH = os.path.join(BASE_DIR, "data", "hints.json")
-    if os.path.exists(HINTS_PATH):
+    memory = None
+    try:
+        memory = _load_memory()
+        rules = [r["text"] for r in memory.rules]
+    except Exception as e:
+        print(f"Error loading rules: {e}")
+
+    # 1.5 Load Hints (High Priority)
+    hint_text = None
+    if memory is not None:
         try:
-            with open(HINTS_PATH, "r") as f:
-                hint_data = json.load(f)
-                hint_text = hint_data.get("hint")
-                if hint_text:
-                     print(f"Loaded Hint as Rule: {hint_text}")
-                     # Prepend to check it first
-                     rules.insert(0, hint_text)
+            hint_data = memory.get_hint()
+            hint_text = hint_data.get("hint") if hint_data else None
+            if hint_text:
+                 print(f"Loaded Hint as Rule: {hint_text}")
+                 # Prepend to check it first
+                 rules.insert(0, hint_text)
         except Exception as e:
              print(f"Error loading hints: {e}")
 
@@ -116,8 +119,7 @@ async def trigger_predict():
             try:
                 # Check if rule validates against Human Solution (Test Input -> Human Output)
                 # We still use train_pairs[0] as the pattern source
-                pred = ARCPredictor.apply_rule(rule, ACTIVE_TASK["test_input"], demo_pair=train_pairs[0])
-                if pred == human_sol:
+                if VERIFICATION_CACHE.verify(rule, ACTIVE_TASK["test_input"], human_sol, demo_pair=train_pairs[0]):
                     print(f"Rule verified by Human Solution: {rule}")
                     consensus_rule = rule
                     # Optionally we could also verify against train_pairs here to serve as "Sanity Check"
@@ -131,16 +133,10 @@ async def trigger_predict():
         for rule in rules:
             is_consistent = True
             for pair in train_pairs:
-                try:
-                    # Apply rule to training input. 
-                    # We use the FIRST training example as the 'source' of the pattern to be consistent.
-                    pred = ARCPredictor.apply_rule(rule, pair["input"], demo_pair=train_pairs[0])
-                    
-                    # Check exact match with training output
-                    if pred != pair["output"]:
-                        is_consistent = False
-                        break
-                except Exception:
+                # Apply rule to training input and check for an exact match (memoized;
+                # a rule that raises counts as inconsistent).
+                # We use the FIRST training example as the 'source' of the pattern to be consistent.
+                if not VERIFICATION_CACHE.verify(rule, pair["input"], pair["output"], demo_pair=train_pairs[0]):
                     is_consistent = False
                     break
             
@@ -151,7 +147,7 @@ async def trigger_predict():
     # 3. Generate Prediction
     if consensus_rule and ACTIVE_TASK["test_input"]:
         print(f"Consensus Reached on Rule: {consensus_rule}")
-        final_grid = ARCPredictor.apply_rule(consensus_rule, ACTIVE_TASK["test_input"], demo_pair=train_pairs[0])
+        final_grid = VERIFICATION_CACHE.predict(consensus_rule, ACTIVE_TASK["test_input"], demo_pair=train_pairs[0])
         ACTIVE_TASK["last_prediction"] = final_grid
         ACTIVE_TASK["active_hypotheses"] = [
             {"hypothesis_id": "consensus_01", "content": consensus_rule, "score": 1.0, "evidence": ["all_train_pairs"]}
@@ -159,21 +155,16 @@ async def trigger_predict():
     else:
         # Check if we have a hint that we can force-execute
         hint_applied = False
-        HINTS_PATH = os.path.join(BASE_DIR, "data", "hints.json")
-        if os.path.exists(HINTS_PATH) and ACTIVE_TASK["test_input"]:
+        if hint_text and ACTIVE_TASK["test_input"]:
              try:
-                with open(HINTS_PATH, "r") as f:
-                    hint_data = json.load(f)
-                    hint_text = hint_data.get("hint")
-                    if hint_text:
-                        print(f"Force-executing Hint: {hint_text}")
-                        # Apply hint to test input
-                        final_grid = ARCPredictor.apply_rule(hint_text, ACTIVE_TASK["test_input"], demo_pair=train_pairs[0] if train_pairs else None)
-                        ACTIVE_TASK["last_prediction"] = final_grid
-                        ACTIVE_TASK["active_hypotheses"] = [
-                            {"hypothesis_id": "hint_force_01", "content": f"[Hint] {hint_text}", "score": 0.5, "evidence": ["user_hint_only"]}
-                        ]
-                        hint_applied = True
+                print(f"Force-executing Hint: {hint_text}")
+                # Apply hint to test input
+                final_grid = ARCPredictor.apply_rule(hint_text, ACTIVE_TASK["test_input"], demo_pair=train_pairs[0] if train_pairs else None)
+                ACTIVE_TASK["last_prediction"] = final_grid
+                ACTIVE_TASK["active_hypotheses"] = [
+                    {"hypothesis_id": "hint_force_01", "content": f"[Hint] {hint_text}", "score": 0.5, "evidence": ["user_hint_only"]}
+                ]
+                hint_applied = True
              except Exception as e:
                  print(f"Failed to force hint: {e}")
 
@@ -248,13 +239,8 @@ async def inject_knowledge(injection: KnowledgeInjection):
         print("Human solution grid received.")
         ACTIVE_TASK["human_solution"] = injection.human_grid
         
-    # Here we would update a 'hints.json' or shared state thatSwarm reads
-    hint_path = os.path.join(BASE_DIR, "data", "hints.json")
-    with open(hint_path, "w") as f:
-        data = {"hint": injection.text, "timestamp": "now"}
-        if injection.human_grid:
-            data["solution"] = injection.human_grid
-        json.dump(data, f)
+    # Stored through the rule store (hints.json or the SQLite hints table) that the Swarm reads
+    _load_memory().set_hint(injection.text, injection.human_grid)
         
     return {"status": "success", "message": "Knowledge and solution injected."}
 
@@ -3,7 +3,7 @@ import structlog
 from AGI.src.bridge.protocol import Bridge
 from AGI.src.swarm.core import Swarm
 from AGI.src.hitl.interface import HITLInterface
-from AGI.src.cortex import VisualCortex
+from AGI.src.cortex import create_cortex, GridVisualCortex
 
 # Set up logging
 structlog.configure()
@@ -13,8 +13,7 @@ async def main():
     logger.info("starting_agi_system")
     
     # 1. Initialize Components
-    from AGI.src.cortex import VisualCortex
-    cortex = VisualCortex() 
+    cortex = create_cortex()
     # Example ARC Task Data (Mirroring)
     user_task = {
         "input": [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 3, 3, 3, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]], 
@@ -22,32 +21,33 @@ async def main():
     }
 
     swarm = Swarm(num_agents=3, 
-                  clip_model=getattr(cortex, 'model', None), 
-                  clip_processor=getattr(cortex, 'processor', None),
+                  model_handle=getattr(cortex, 'handle', None),
                   task_data=user_task)
     
     # 2. Process Input
     import os
     image_path = "AGI/examples/arc_tasks/task_user_composite.png"
-    if not os.path.exists(image_path):
+    if isinstance(cortex, GridVisualCortex):
+        # The grid cortex reads the task directly, no rendering needed
+        image_path = user_task
+    elif not os.path.exists(image_path):
         logger.warning("sample_image_not_found_using_mock", path=image_path)
         from AGI.src.cortex.mock import MockCortex
         cortex = MockCortex()
         image_path = "mock_data"
         
-    logger.info("processing_input", path=image_path)
-    segments = cortex.process(image_path)
-
-    logger.info("input_processed", num_segments=len(segments))
+    logger.info("processing_input", path=image_path if isinstance(image_path, str) else "grid_task")
+    # Cortex embeds in a worker thread and yields segments chunk by chunk
+    segment_stream = cortex.stream(image_path)
     
-    # 3. Translate to tokens via Bridge
-    tokens = Bridge.translate_batch(segments)
-    logger.info("tokens_generated", num_tokens=len(tokens))
+    # 3. Translate to tokens via Bridge, incrementally
+    token_stream = Bridge.translate_stream(segment_stream)
     
     # 4. Run Swarm reasoning
     logger.info("running_swarm_reasoning")
-    # For ARC, we use the composite image to discover the rule
-    best_hypothesis = await swarm.run_consensus_loop(tokens)
+    # For ARC, we use the composite image to discover the rule.
+    # Reasoning starts on the first chunk and overlaps with embedding.
+    best_hypothesis = await swarm.run_consensus_loop(token_stream)
     
     # Example ARC Input Grid (the center object from task_user)
     # This would typically come from the task JSON
@@ -83,5 +83,9 @@ async def main():
     else:
         logger.error("no_hypothesis_found")
 
+    from AGI.src.text_cache import TEXT_CACHE
+    logger.info("text_cache_stats", **TEXT_CACHE.stats())
+    TEXT_CACHE.save()
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,176 @@
+import threading
+import time
+import torch
+import structlog
+from typing import Any, Dict, List, Optional, Tuple
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+
+logger = structlog.get_logger()
+
+def _as_features(output) -> torch.Tensor:
+    """
+    Newer transformers releases wrap projected features in a model output;
+    older ones return the tensor directly.
+    """
+    if isinstance(output, torch.Tensor):
+        return output
+    return output.pooler_output
+
+def default_device() -> str:
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+# Supported inference precisions. "int8" swaps every nn.Linear for a
+# dynamically quantized one (CPU only); "bf16" casts all weights.
+PRECISIONS = ("fp32", "bf16", "int8")
+
+def apply_precision(model: torch.nn.Module, dtype: str, device: str) -> torch.nn.Module:
+    if dtype == "fp32":
+        return model
+    if dtype == "bf16":
+        return model.to(torch.bfloat16)
+    if dtype == "int8":
+        if device != "cpu":
+            raise ValueError("int8 dynamic quantization is only available on CPU")
+        from torch.ao.quantization import quantize_dynamic
+        return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    raise ValueError(f"Unsupported model dtype: {dtype} (expected one of {PRECISIONS})")
+
+class ModelHandle:
+    """
+    Lazy handle on a CLIP model/processor pair. Nothing is loaded until
+    `model` or `processor` is first accessed.
+    """
+    def __init__(self, model_name: str, device: str = "cpu", dtype: str = "fp32",
+                 model: Any = None, processor: Any = None):
+        self.model_name = model_name
+        self.device = device
+        self.dtype = dtype
+        self._model = model
+        self._processor = processor
+        # Loaded from model_name (not handed preloaded objects), so another process can build it too
+        self.rebuildable = model is None and processor is None
+        self._lock = threading.Lock()
+        self.load_time_seconds: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self.load()
+        return self._model
+
+    @property
+    def processor(self):
+        if self._processor is None:
+            self.load()
+        return self._processor
+
+    def load(self):
+        with self._lock:
+            from transformers import CLIPModel, CLIPProcessor
+
+            if self._processor is None:
+                self._processor = CLIPProcessor.from_pretrained(self.model_name)
+            if self._model is not None:
+                return
+            if self.dtype not in PRECISIONS:
+                raise ValueError(f"Unsupported model dtype: {self.dtype} (expected one of {PRECISIONS})")
+
+            start = time.perf_counter()
+            print(f"Loading CLIP model '{self.model_name}' on {self.device} ({self.dtype})...")
+            model = CLIPModel.from_pretrained(self.model_name).to(self.device)
+            model.eval()
+            self._model = apply_precision(model, self.dtype, self.device)
+            self.load_time_seconds = time.perf_counter() - start
+            logger.info("model_loaded", model=self.model_name, device=self.device, dtype=self.dtype,
+                        seconds=round(self.load_time_seconds, 3), memory_mb=round(self.memory_bytes() / 2**20, 1))
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the model state, including packed int8 weights (0 while unloaded)."""
+        if self._model is None:
+            return 0
+
+        def nbytes(value) -> int:
+            # Quantized linears keep their weights as packed (tensor, bias) tuples
+            if isinstance(value, torch.Tensor):
+                return value.numel() * value.element_size()
+            if isinstance(value, (tuple, list)):
+                return sum(nbytes(v) for v in value)
+            return 0
+
+        return sum(nbytes(v) for v in self._model.state_dict().values())
+
+    def image_features(self, images: List[Any]) -> torch.Tensor:
+        """Embed a list of PIL images; returns float32 features on the handle device."""
+        inputs = self.processor(images=images, return_tensors="pt").to(self.device)
+        if self.dtype == "bf16":
+            inputs["pixel_values"] = inputs["pixel_values"].to(torch.bfloat16)
+        with torch.no_grad():
+            return _as_features(self.model.get_image_features(**inputs)).to(torch.float32)
+
+    def text_features(self, texts: List[str]) -> torch.Tensor:
+        """Embed a list of strings; returns float32 features on the handle device."""
+        inputs = self.processor(text=texts, return_tensors="pt", padding=True).to(self.device)
+        with torch.no_grad():
+            return _as_features(self.model.get_text_features(**inputs)).to(torch.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "device": self.device,
+            "dtype": self.dtype,
+            "loaded": self.loaded,
+            "load_time_seconds": self.load_time_seconds,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+def wrap_model(clip_model: Any, clip_processor: Any, device: str = None) -> Optional[ModelHandle]:
+    """
+    Wrap model/processor objects passed in by hand in a preloaded handle, so
+    callers only deal with handles. Returns None if either is missing.
+    """
+    if clip_model is None or clip_processor is None:
+        return None
+    name = getattr(getattr(clip_model, "config", None), "_name_or_path", None) or "injected"
+    return ModelHandle(name, device or default_device(), model=clip_model, processor=clip_processor)
+
+class ModelRegistry:
+    """
+    Process-wide registry so the cortex, agents, swarm and HITL server share
+    one copy of each (model_name, device, dtype).
+    """
+    def __init__(self):
+        self._handles: Dict[Tuple[str, str, str], ModelHandle] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = None, device: str = None, dtype: str = None) -> ModelHandle:
+        config = DEFAULT_CONFIG.get("cortex", {})
+        model_name = model_name or config.get("model_name", "openai/clip-vit-base-patch32")
+        device = device or default_device()
+        dtype = dtype or config.get("precision", "fp32")
+        key = (model_name, device, dtype)
+        with self._lock:
+            if key not in self._handles:
+                self._handles[key] = ModelHandle(model_name, device, dtype)
+            return self._handles[key]
+
+    def register(self, handle: ModelHandle) -> ModelHandle:
+        """Register an already-built handle (e.g. a preloaded or test model)."""
+        with self._lock:
+            self._handles[(handle.model_name, handle.device, handle.dtype)] = handle
+        return handle
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [handle.stats() for handle in self._handles.values()]
+
+    def clear(self):
+        with self._lock:
+            self._handles.clear()
+
+# Global registry instance
+MODEL_REGISTRY = ModelRegistry()
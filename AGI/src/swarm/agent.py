@@ -3,13 +3,16 @@ import uuid
 import structlog
 import torch
 import numpy as np
-from typing import List, Optional, Dict, Any, Set
-from transformers import CLIPProcessor, CLIPModel
+from typing import List, Optional, Dict, Any, Set, Union
 from AGI.src.swarm.schemas import Hypothesis, AgentAction
 from AGI.src.bridge.schemas import AgentToken
+from AGI.src.bridge.batch import TokenBatch
 from AGI.src.curiosity.scorer import CuriosityScorer
-from AGI.src.swarm.predictor import ARCPredictor
+from AGI.src.swarm.verification import VerificationCache
+from AGI.src.swarm.evidence import EvidenceIndex, weighted_similarity
 from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.model_registry import ModelHandle, wrap_model
+from AGI.src.text_cache import TEXT_CACHE
 
 logger = structlog.get_logger()
 
@@ -18,12 +21,13 @@ class OmnidirectionalAgent:
     An agent capable of reasoning across past and future states.
     """
     
-    def __init__(self, bus: Any = None, agent_id: str = None, clip_model=None, clip_processor=None, task_data: Dict = None):
+    def __init__(self, bus: Any = None, agent_id: str = None, clip_model=None, clip_processor=None, task_data: Dict = None,
+                 model_handle: Optional[ModelHandle] = None):
         self.config = DEFAULT_CONFIG.get("curiosity", {})
         self.agent_id = agent_id or str(uuid.uuid4())
         self.bus = bus
         self.task_data = task_data
-        self.memory: List[AgentToken] = []
+        self.memory: TokenBatch = TokenBatch.empty()
         self.active_hypotheses: Dict[str, Hypothesis] = {}
         self.seen_descriptions: Set[str] = set() 
         self.iteration = 0
@@ -34,10 +38,22 @@ class OmnidirectionalAgent:
         from AGI.src.swarm.memory import RuleMemory
         self.rule_memory: Optional[RuleMemory] = None
         
-        # Shared or new CLIP handles
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.clip_model = clip_model
-        self.clip_processor = clip_processor
+        # Shared CLIP handle from the model registry (loaded lazily on first use)
+        self.model_handle = model_handle or wrap_model(clip_model, clip_processor)
+        self.device = self.model_handle.device if self.model_handle else "cpu"
+        # Set by the Swarm to batch inference across agents (see swarm/broker.py)
+        self.broker = None
+        # Replaced by the Swarm's shared instance
+        self.verification_cache = VerificationCache()
+        # Set by the Swarm in epoch cross-validation mode
+        self.defer_pruning = False
+
+        # Evidence selection: index rebuilt on each perceive, sampled per candidate round
+        swarm_config = DEFAULT_CONFIG.get("swarm", {})
+        self.evidence_sampling = swarm_config.get("evidence_sampling", "importance")
+        self.evidence_size = swarm_config.get("evidence_size", 12)
+        self.retrieval_k = swarm_config.get("retrieval_k", 1)
+        self.evidence_index = EvidenceIndex(self.memory, device=self.device)
         
         # ARC-Specific Transformation Rule Bank
         self.prompt_bank = [
@@ -62,23 +78,89 @@ class OmnidirectionalAgent:
         if self.bus:
             self.bus.subscribe("hypotheses", self.cross_validate)
         
-    def perceive(self, tokens: List[AgentToken]):
+    @property
+    def clip_model(self):
+        return self.model_handle.model if self.model_handle else None
+
+    @property
+    def clip_processor(self):
+        return self.model_handle.processor if self.model_handle else None
+
+    def perceive(self, tokens: Union[TokenBatch, List[AgentToken]]):
         """
         Ingest tokens into the agent's memory.
         """
         logger.debug("agent_perceive", agent_id=self.agent_id, num_tokens=len(tokens))
-        self.memory.extend(tokens)
+        self.memory = TokenBatch.concat([self.memory, TokenBatch.from_tokens(tokens)])
+        self.evidence_index = EvidenceIndex(self.memory, device=self.device)
         
     async def generate_candidate(self, context: str) -> List[Hypothesis]:
         """
         Step 1: Data-Driven Candidate Generation.
         Propose candidates from a prompt bank and score them via CLIP similarity.
         """
-        if not self.clip_model or not self.clip_processor:
+        if self.model_handle is None:
             # Fallback if CLIP not loaded (lazy load or mock-ish)
-             print("Warning: CLIP component missing in agent, using generic scoring.")
+             logger.debug("clip_missing_using_generic_scoring", agent_id=self.agent_id)
              return await self._generate_fallback_candidates(context)
 
+        selected_prompts = self._select_prompts()
+        
+        new_candidates = []
+
+        # Gather evidence vectors from memory
+        if not self.memory:
+            return []
+            
+        # Sample patches for evidence from the precomputed saliency index.
+        # Spatial weights (centre-biased) and normalized embeddings are ready tensors.
+        evidence_idx = self.evidence_index.sample(self.evidence_size, self.evidence_sampling)
+        evidence_ids = [self.memory.token_ids[i] for i in evidence_idx.tolist()]
+        evidence_embeddings = self.evidence_index.normalized[evidence_idx]
+        weights_tensor = self.evidence_index.weights[evidence_idx]
+        
+        # Score every prompt against every evidence patch in one step:
+        # one text-encoder call for all prompts, one (P, K) similarity matrix.
+        # With a swarm broker, the request is coalesced with the other agents'.
+        if self.broker is not None:
+            scores = await self.broker.score(selected_prompts, evidence_embeddings, weights_tensor)
+        else:
+            text_embs = TEXT_CACHE.encode(self.model_handle, selected_prompts)
+            scores = weighted_similarity(text_embs, evidence_embeddings, weights_tensor)
+        weighted_sims = scores.tolist()
+        
+        for prompt_text, weighted_sim in zip(selected_prompts, weighted_sims):
+            # Curiosity boost
+            curiosity_bonus = 0.2 if prompt_text not in self.seen_descriptions else 0.0
+            self.seen_descriptions.add(prompt_text)
+            
+            # Mapping clip score to 0-1 range
+            # Memory boost: if rule was successful before, give it a head start
+            is_prior = self.rule_memory is not None and prompt_text in self.rule_memory
+            
+            memory_boost = 0.3 if is_prior else 0.0
+            total_score = 0.4 + weighted_sim * 0.4 + curiosity_bonus + memory_boost + random.uniform(-0.05, 0.05)
+            
+            h_id = f"hyp_{uuid.uuid4().hex[:12]}"
+            hyp = Hypothesis(
+                hypothesis_id=h_id,
+                agent_id=self.agent_id,
+                content=prompt_text,
+                score=min(1.0, total_score),
+                evidence=list(evidence_ids),
+                iteration=self.iteration,
+                metadata={"clip_raw_score": weighted_sim, "context": context}
+            )
+            new_candidates.append(hyp)
+            self.active_hypotheses[h_id] = hyp
+            
+        return new_candidates
+
+    def _select_prompts(self) -> List[str]:
+        """
+        Mix high-weight memory rules, rehearsal rules, rules retrieved by
+        similarity to the task, and the standard bank.
+        """
         selected_prompts = []
         
         if self.rule_memory:
@@ -96,6 +178,12 @@ class OmnidirectionalAgent:
                 sampled_rehearsal = random.choices([r["text"] for r in rehearsal], k=num_rehearsal)
                 selected_prompts.extend(sampled_rehearsal)
 
+            # Rules whose text sits nearest the task's mean patch embedding
+            centroid = self.evidence_index.centroid
+            if self.retrieval_k and self.model_handle is not None and centroid is not None:
+                nearest = self.rule_memory.nearest_rules(self.model_handle, centroid, k=self.retrieval_k)
+                selected_prompts.extend(r["text"] for r in nearest)
+
         # Fill/Add from standard bank (30% or whatever is left)
         needed = self.max_per_iter - len(selected_prompts)
         if needed > 0:
@@ -109,77 +197,44 @@ class OmnidirectionalAgent:
         
         # Dedupe while preserving order
         selected_prompts = list(dict.fromkeys(selected_prompts))[:self.max_per_iter]
-        
-        new_candidates = []
+        return selected_prompts
 
-        # Gather evidence vectors from memory
+    async def _generate_fallback_candidates(self, context: str) -> List[Hypothesis]:
+        """
+        Generic scoring used when no CLIP model is available (e.g. the grid
+        cortex). Candidates rely on curiosity and memory priors; self-verification
+        against the task data does the real ranking.
+        """
         if not self.memory:
             return []
-            
-        # Sample patches for evidence
-        num_samples = min(12, len(self.memory))
-        evidence_tokens = random.sample(self.memory, num_samples)
-        
-        # Spatial weighting: Give higher weight to central patches for object identification
-        # Metadata contains 'position_normalized': {'x': norm_x, 'y': norm_y}
-        weights = []
-        for t in evidence_tokens:
-            pos = t.metadata.get('position_normalized', {'x': 0.5, 'y': 0.5})
-            # Simple Gaussian-like weight, higher for center (0.5, 0.5)
-            # Center is usually where the subject is in close-up photos
-            dist_sq = (pos['x'] - 0.5)**2 + (pos['y'] - 0.5)**2
-            weight = max(0.1, 1.0 - (dist_sq ** 0.5) * 1.5) 
-            weights.append(weight)
-            
-        evidence_embeddings = torch.tensor([t.vector for t in evidence_tokens]).to(self.device).to(torch.float32)
-        weights_tensor = torch.tensor(weights).to(self.device).to(torch.float32)
-        
-        for prompt_text in selected_prompts:
-            # Curiosity boost
+
+        evidence_idx = self.evidence_index.sample(self.evidence_size, self.evidence_sampling)
+        evidence_ids = [self.memory.token_ids[i] for i in evidence_idx.tolist()]
+
+        new_candidates = []
+        for prompt_text in self._select_prompts():
             curiosity_bonus = 0.2 if prompt_text not in self.seen_descriptions else 0.0
             self.seen_descriptions.add(prompt_text)
-            
-            # Compute CLIP similarity
-            text_inputs = self.clip_processor(text=[prompt_text], return_tensors="pt", padding=True).to(self.device)
-            with torch.no_grad():
-                text_emb = self.clip_model.get_text_features(**text_inputs).to(torch.float32)
-            
-            # Normalize for cosine similarity
-            text_emb = text_emb / text_emb.norm(dim=-1, keepdim=True)
-            norm_evidence = evidence_embeddings / evidence_embeddings.norm(dim=-1, keepdim=True)
-            
-            # Similarities between text and each patch [batch=1, N_patches]
-            similarities = torch.mm(text_emb, norm_evidence.T)[0]
-            
-            # Apply spatial weights
-            weighted_sim = (similarities * weights_tensor).sum() / weights_tensor.sum()
-            # Mapping clip score to 0-1 range
-            # Memory boost: if rule was successful before, give it a head start
-            is_prior = False
-            if self.rule_memory:
-                 is_prior = any(r["text"] == prompt_text for r in self.rule_memory.rules)
-            
+
+            is_prior = self.rule_memory is not None and prompt_text in self.rule_memory
+
             memory_boost = 0.3 if is_prior else 0.0
-            total_score = 0.4 + weighted_sim.item() * 0.4 + curiosity_bonus + memory_boost + random.uniform(-0.05, 0.05)
-            
+            total_score = 0.4 + curiosity_bonus + memory_boost + random.uniform(-0.05, 0.05)
+
             h_id = f"hyp_{uuid.uuid4().hex[:12]}"
             hyp = Hypothesis(
                 hypothesis_id=h_id,
                 agent_id=self.agent_id,
                 content=prompt_text,
                 score=min(1.0, total_score),
-                evidence=[t.token_id for t in evidence_tokens],
+                evidence=list(evidence_ids),
                 iteration=self.iteration,
-                metadata={"clip_raw_score": weighted_sim.item(), "context": context}
+                metadata={"clip_raw_score": None, "context": context}
             )
             new_candidates.append(hyp)
             self.active_hypotheses[h_id] = hyp
-            
-        return new_candidates
 
-    async def _generate_fallback_candidates(self, context: str) -> List[Hypothesis]:
-        # Legacy placeholder logic if CLIP not injected
-        return []
+        return new_candidates
 
     async def self_verify(self, hypotheses: List[Hypothesis]):
         """
@@ -194,18 +249,11 @@ class OmnidirectionalAgent:
 
             # Empirical boost if task_data is present
             if self.task_data and "input" in self.task_data and "output" in self.task_data:
-                try:
-                    predicted = ARCPredictor.apply_rule(hyp.content, self.task_data["input"])
-                    if predicted == self.task_data["output"]:
-                        hyp.score = min(1.0, hyp.score + 0.5) # Massive boost for correctness
-                        hyp.evidence.append("Empirical Match: Rule correctly transforms input to output.")
-                    else:
-                        # Slight penalty for incorrect execution if we are sure of the mapping
-                        # but be careful with DSL limitations
-                        pass
-                except Exception as e:
-                    # If rule can't be executed yet, no boost or penalty
-                    pass
+                # Memoized: the same rule strings recur across agents and iterations.
+                # Rules that can't be executed yet get no boost or penalty.
+                if self.verification_cache.verify(hyp.content, self.task_data["input"], self.task_data["output"]):
+                    hyp.score = min(1.0, hyp.score + 0.5) # Massive boost for correctness
+                    hyp.evidence.append("Empirical Match: Rule correctly transforms input to output.")
 
     async def cross_validate(self, peer_hypothesis: Hypothesis):
         """
@@ -238,13 +286,24 @@ class OmnidirectionalAgent:
         # 2. Self-Verify
         await self.self_verify(candidates)
         
+        return await self.publish_candidates(candidates)
+
+    async def publish_candidates(self, candidates: List[Hypothesis]) -> List[Hypothesis]:
+        """
+        Steps 3-4 for candidates generated here or, in process execution
+        mode, by this agent's replica in a worker.
+        """
+        for h in candidates:
+            self.active_hypotheses[h.hypothesis_id] = h
+
         # 3. Publish (Triggering Cross-Val in others)
         if self.bus:
             for h in candidates:
                 await self.bus.publish("hypotheses", h)
         
-        # 4. Local Pruning
-        self._prune_weak()
+        # 4. Local Pruning (the Swarm prunes after epoch cross-validation instead)
+        if not self.defer_pruning:
+            self._prune_weak()
         
         self.iteration += 1
         return list(self.active_hypotheses.values())
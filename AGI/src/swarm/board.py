@@ -0,0 +1,259 @@
+"""
+Shared-memory hypothesis board for multi-process swarms.
+
+A `multiprocessing.shared_memory` block with a fixed layout:
+
+    header   magic, version, lanes, capacity, rule_capacity, rule_bytes,
+             creator pid
+    lanes    per lane: write_count, rule_count, writer pid (uint64 each)
+    records  lanes x capacity ring of (seq, score, rule_id, iteration,
+             hypothesis_id, agent_id)
+    rules    lanes x rule_capacity interned rule texts
+
+Each process writes to its own lane, so writes need no lock. A record slot
+is guarded by a seqlock: the writer makes `seq` odd, fills the fields, then
+makes it even again, and publishes by bumping the lane's write_count.
+Readers copy the slots they want in one NumPy gather and keep only those
+whose `seq` matches the expected generation before and after the copy, so
+reads never block writers and never see torn records. Rule texts are
+interned per lane and referenced by id, so a record is a few dozen bytes
+and reading the board copies no strings until they are asked for.
+
+The seqlock relies on stores to shared memory becoming visible in program
+order, which holds on x86 (TSO); weaker memory models need fences that
+NumPy does not expose.
+"""
+import os
+import uuid
+import numpy as np
+import structlog
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.swarm.schemas import Hypothesis
+
+logger = structlog.get_logger()
+
+MAGIC = 0x42525642  # "BRVB"
+VERSION = 1
+
+RECORD_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("score", "<f8"),
+    ("rule_id", "<i4"),
+    ("iteration", "<i4"),
+    ("hypothesis_id", "S32"),
+    ("agent_id", "S40"),
+])
+_HEADER = np.dtype([("magic", "<u4"), ("version", "<u4"), ("lanes", "<u4"), ("capacity", "<u4"),
+                    ("rule_capacity", "<u4"), ("rule_bytes", "<u4"), ("creator_pid", "<u8")])
+_LANE = np.dtype([("write_count", "<u8"), ("rule_count", "<u8"), ("pid", "<u8"), ("pad", "<u8")])
+
+def _layout(lanes: int, capacity: int, rule_capacity: int, rule_bytes: int) -> Tuple[np.dtype, Dict[str, int]]:
+    rule_dtype = np.dtype([("length", "<u4"), ("text", f"S{rule_bytes}")])
+    offsets = {"lanes": _HEADER.itemsize}
+    offsets["records"] = offsets["lanes"] + lanes * _LANE.itemsize
+    offsets["rules"] = offsets["records"] + lanes * capacity * RECORD_DTYPE.itemsize
+    offsets["size"] = offsets["rules"] + lanes * rule_capacity * rule_dtype.itemsize
+    return rule_dtype, offsets
+
+class SharedHypothesisBoard:
+    """
+    Fixed-layout ring of hypothesis records in shared memory.
+
+    Create it once (`SharedHypothesisBoard()`), then `attach(name, lane)`
+    from other processes; every process must write through its own lane.
+    The creating process owns the segment and should `unlink()` it.
+    """
+    def __init__(self, name: Optional[str] = None, lanes: int = None, capacity: int = None,
+                 rule_capacity: int = None, rule_bytes: int = 248, lane: int = 0, create: bool = True):
+        config = DEFAULT_CONFIG.get("swarm", {}).get("board", {})
+        self.owner = create
+        if create:
+            lanes = lanes or config.get("lanes", 16)
+            capacity = capacity or config.get("capacity", 65536)
+            rule_capacity = rule_capacity or config.get("rule_capacity", 4096)
+            _, offsets = _layout(lanes, capacity, rule_capacity, rule_bytes)
+            name = name or f"brainv3_board_{uuid.uuid4().hex[:12]}"
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=offsets["size"])
+            header = np.ndarray((), dtype=_HEADER, buffer=self.shm.buf)
+            header[()] = (MAGIC, VERSION, lanes, capacity, rule_capacity, rule_bytes, os.getpid())
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            header = np.ndarray((), dtype=_HEADER, buffer=self.shm.buf)
+            if int(header["magic"]) != MAGIC or int(header["version"]) > VERSION:
+                self.shm.close()
+                raise ValueError(f"{name} is not a hypothesis board")
+            if int(header["creator_pid"]) != os.getpid():
+                # Before 3.13 attaching registers the segment for unlinking when this process exits
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            lanes, capacity = int(header["lanes"]), int(header["capacity"])
+            rule_capacity, rule_bytes = int(header["rule_capacity"]), int(header["rule_bytes"])
+
+        self.lanes, self.capacity = lanes, capacity
+        self.rule_capacity, self.rule_bytes = rule_capacity, rule_bytes
+        rule_dtype, offsets = _layout(lanes, capacity, rule_capacity, rule_bytes)
+        buf = self.shm.buf
+        self._lane_state = np.ndarray((lanes,), dtype=_LANE, buffer=buf, offset=offsets["lanes"])
+        self._records = np.ndarray((lanes, capacity), dtype=RECORD_DTYPE, buffer=buf, offset=offsets["records"])
+        self._rules = np.ndarray((lanes, rule_capacity), dtype=rule_dtype, buffer=buf, offset=offsets["rules"])
+
+        if not 0 <= lane < lanes:
+            raise ValueError(f"Lane {lane} out of range (board has {lanes})")
+        self.lane = lane
+        self._lane_state["pid"][lane] = os.getpid()
+        # This process's interned rules, and rule texts resolved from any lane
+        self._rule_ids: Dict[str, int] = {}
+        self._rule_texts: Dict[int, str] = {}
+        self._rules_full_logged = False
+
+    @classmethod
+    def attach(cls, name: str, lane: int) -> "SharedHypothesisBoard":
+        return cls(name=name, lane=lane, create=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # --- Writing (this process's lane only) ---------------------------------
+
+    def intern(self, text: str) -> int:
+        """Board-wide id of a rule text, adding it to this lane's table if new."""
+        rule_id = self._rule_ids.get(text)
+        if rule_id is not None:
+            return rule_id
+        count = int(self._lane_state["rule_count"][self.lane])
+        if count >= self.rule_capacity:
+            if not self._rules_full_logged:
+                logger.warning("board_rule_table_full", lane=self.lane, capacity=self.rule_capacity)
+                self._rules_full_logged = True
+            return -1
+        data = text.encode("utf-8")[:self.rule_bytes]
+        self._rules[self.lane, count] = (len(data), data)
+        self._lane_state["rule_count"][self.lane] = count + 1  # publish after the text is in place
+        rule_id = self.lane * self.rule_capacity + count
+        self._rule_ids[text] = rule_id
+        self._rule_texts[rule_id] = text
+        return rule_id
+
+    def append(self, hypothesis: Hypothesis) -> int:
+        """Write a record (a re-published hypothesis supersedes its older records); returns its position."""
+        rule_id = self.intern(hypothesis.content)
+        position = int(self._lane_state["write_count"][self.lane])
+        ring, slot = self._records[self.lane], position % self.capacity
+        seq = int(ring["seq"][slot])
+        ring["seq"][slot] = seq + 1  # odd: write in progress
+        ring["score"][slot] = hypothesis.score
+        ring["rule_id"][slot] = rule_id
+        ring["iteration"][slot] = hypothesis.iteration
+        ring["hypothesis_id"][slot] = hypothesis.hypothesis_id.encode("utf-8")[:32]
+        ring["agent_id"][slot] = hypothesis.agent_id.encode("utf-8")[:40]
+        ring["seq"][slot] = seq + 2
+        self._lane_state["write_count"][self.lane] = position + 1
+        return position
+
+    # --- Reading (any lane, lock-free) --------------------------------------
+
+    def rule_text(self, rule_id: int) -> str:
+        if rule_id < 0:
+            return ""
+        text = self._rule_texts.get(rule_id)
+        if text is None:
+            lane, index = divmod(rule_id, self.rule_capacity)
+            entry = self._rules[lane, index]
+            text = bytes(entry["text"])[:int(entry["length"])].decode("utf-8", "replace")
+            self._rule_texts[rule_id] = text
+        return text
+
+    def _read_lane(self, lane: int, start: int) -> Tuple[np.ndarray, int, int]:
+        """Valid records of `lane` from position `start` on: (records, next position, lost)."""
+        end = int(self._lane_state["write_count"][lane])
+        lost = max(0, end - self.capacity - start)
+        start += lost
+        if start >= end:
+            return self._records[lane, :0].copy(), end, lost
+        positions = np.arange(start, end, dtype=np.int64)
+        slots = positions % self.capacity
+        ring = self._records[lane]
+        expected = (positions // self.capacity + 1) * 2  # seq after the slot's n-th complete write
+        before = ring["seq"][slots].copy()
+        records = ring[slots]  # fancy indexing copies
+        after = ring["seq"][slots]
+        valid = (before == expected) & (after == expected)
+        return records[valid], end, lost + int((~valid).sum())
+
+    def cursor(self) -> List[int]:
+        """Read positions at the current end of every lane."""
+        return [int(count) for count in self._lane_state["write_count"]]
+
+    def read(self, cursor: Optional[List[int]] = None, skip_own: bool = False) -> Tuple[np.ndarray, List[int]]:
+        """
+        Records written since `cursor` (default: everything still in the
+        ring), with a "lane" column, plus the advanced cursor.
+        """
+        cursor = list(cursor) if cursor is not None else [0] * self.lanes
+        chunks = []
+        for lane in range(self.lanes):
+            if skip_own and lane == self.lane:
+                cursor[lane] = int(self._lane_state["write_count"][lane])
+                continue
+            records, cursor[lane], _ = self._read_lane(lane, cursor[lane])
+            if len(records):
+                chunks.append((lane, records))
+        dtype = np.dtype(RECORD_DTYPE.descr + [("lane", "<u4")])
+        out = np.zeros(sum(len(r) for _, r in chunks), dtype=dtype)
+        offset = 0
+        for lane, records in chunks:
+            for field in RECORD_DTYPE.names:
+                out[field][offset:offset + len(records)] = records[field]
+            out["lane"][offset:offset + len(records)] = lane
+            offset += len(records)
+        return out, cursor
+
+    def latest(self) -> np.ndarray:
+        """Newest record per hypothesis id across every lane."""
+        records, _ = self.read()
+        if not len(records):
+            return records
+        # An id is written by one lane, where later positions come last: keep its last occurrence
+        _, last = np.unique(records["hypothesis_id"][::-1], return_index=True)
+        return records[len(records) - 1 - last]
+
+    def top(self, k: int = 10) -> np.ndarray:
+        """The k best-scoring hypotheses on the board."""
+        records = self.latest()
+        order = np.argsort(-records["score"], kind="stable")[:k]
+        return records[order]
+
+    def to_hypotheses(self, records: np.ndarray) -> List[Hypothesis]:
+        """Materialize records as (evidence-free) Hypothesis objects."""
+        return [
+            Hypothesis.model_construct(
+                hypothesis_id=r["hypothesis_id"].decode("utf-8"), agent_id=r["agent_id"].decode("utf-8"),
+                content=self.rule_text(int(r["rule_id"])), score=float(r["score"]),
+                iteration=int(r["iteration"]), evidence=[], path_history=[],
+                metadata={"board_lane": int(r["lane"])} if "lane" in records.dtype.names else {},
+            )
+            for r in records
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self._lane_state["write_count"]
+        return {
+            "name": self.name,
+            "lane": self.lane,
+            "lanes_in_use": int((counts > 0).sum()),
+            "records_written": int(counts.sum()),
+            "rules": int(self._lane_state["rule_count"].sum()),
+            "bytes": self.shm.size,
+        }
+
+    def close(self):
+        # Drop the NumPy views first so the buffer can be released
+        self._lane_state = self._records = self._rules = None
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
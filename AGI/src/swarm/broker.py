@@ -0,0 +1,132 @@
+import asyncio
+import structlog
+import torch
+from typing import Any, Dict, List, Optional
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.model_registry import ModelHandle
+from AGI.src.text_cache import TEXT_CACHE, TextEmbeddingCache
+
+logger = structlog.get_logger()
+
+class _Request:
+    __slots__ = ("texts", "evidence", "weights", "future")
+
+    def __init__(self, texts: List[str], evidence: Optional[torch.Tensor] = None,
+                 weights: Optional[torch.Tensor] = None):
+        self.texts = texts
+        self.evidence = evidence
+        self.weights = weights
+        self.future: Optional[asyncio.Future] = None
+
+class InferenceBroker:
+    """
+    Swarm-level coalescing of agent inference requests.
+
+    Agents `await` embedding or scoring requests; the broker collects every
+    request submitted within `max_wait_ms` (or until `max_batch_size`
+    requests are pending) and serves them with one text-encoder call and one
+    batched similarity computation, then resolves each request's future.
+    Agents of one iteration all submit before the timer fires, so N agents
+    cost one forward pass instead of N.
+    """
+    def __init__(self, handle: ModelHandle, max_batch_size: int = None, max_wait_ms: float = None,
+                 cache: Optional[TextEmbeddingCache] = None):
+        config = DEFAULT_CONFIG.get("swarm", {}).get("broker", {})
+        self.handle = handle
+        self.max_batch_size = max_batch_size or config.get("max_batch_size", 64)
+        self.max_wait_ms = config.get("max_wait_ms", 2.0) if max_wait_ms is None else max_wait_ms
+        self.cache = cache or TEXT_CACHE
+        self._pending: List[_Request] = []
+        self._timer: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def embed(self, texts: List[str]) -> torch.Tensor:
+        """Unit-norm text embeddings (len(texts), D)."""
+        return await self._submit(_Request(list(texts)))
+
+    async def score(self, prompts: List[str], evidence: torch.Tensor, weights: torch.Tensor) -> torch.Tensor:
+        """
+        Weighted prompt-vs-evidence similarity (len(prompts),), as
+        `weighted_similarity` computes it for a single agent.
+        """
+        return await self._submit(_Request(list(prompts), evidence, weights))
+
+    def _submit(self, request: _Request) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        request.future = loop.create_future()
+        self._pending.append(request)
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.create_task(self._flush_later())
+        return request.future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_wait_ms / 1000.0)
+        self._timer = None
+        self.flush()
+
+    def flush(self):
+        """Serve every pending request now."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            results = self._run(batch)
+        except Exception as e:
+            logger.error("broker_batch_failed", requests=len(batch), error=str(e))
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        for request, result in zip(batch, results):
+            if not request.future.done():
+                request.future.set_result(result)
+
+    def _run(self, batch: List[_Request]) -> List[torch.Tensor]:
+        self.batches += 1
+        self.requests += len(batch)
+
+        # One encoder call for the union of all requested texts
+        texts = list(dict.fromkeys(t for r in batch for t in r.texts))
+        embeddings = self.cache.encode(self.handle, texts)
+        row = {text: i for i, text in enumerate(texts)}
+        results = [embeddings[[row[t] for t in r.texts]] for r in batch]
+
+        scoring = [i for i, r in enumerate(batch) if r.evidence is not None]
+        if scoring:
+            # Pad to (A, P, D) prompts and (A, K, D) evidence; padded evidence gets weight 0
+            max_p = max(len(batch[i].texts) for i in scoring)
+            max_k = max(len(batch[i].evidence) for i in scoring)
+            dim = embeddings.shape[1]
+            device = embeddings.device
+            text = torch.zeros(len(scoring), max_p, dim, device=device)
+            evidence = torch.zeros(len(scoring), max_k, dim, device=device)
+            weights = torch.zeros(len(scoring), max_k, device=device)
+            for a, i in enumerate(scoring):
+                request = batch[i]
+                text[a, :len(request.texts)] = results[i]
+                evidence[a, :len(request.evidence)] = request.evidence.to(device)
+                weights[a, :len(request.weights)] = request.weights.to(device)
+
+            sims = torch.bmm(text, evidence.transpose(1, 2))  # (A, P, K)
+            scores = torch.bmm(sims, weights.unsqueeze(-1)).squeeze(-1) / weights.sum(dim=1, keepdim=True).clamp_min(1e-12)
+            for a, i in enumerate(scoring):
+                results[i] = scores[a, :len(batch[i].texts)]
+
+        logger.debug("broker_batch", requests=len(batch), texts=len(texts), scoring=len(scoring))
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
@@ -1,34 +1,270 @@
 import asyncio
-from typing import Dict, List, Callable, Any
+import time
+from typing import Dict, List, Callable, Any, Optional
 import structlog
 
+from AGI.src.config_loader import DEFAULT_CONFIG
+
 logger = structlog.get_logger()
 
+BUS_BACKENDS = ("local", "redis")
+DELIVERY_MODES = ("queued", "inline")
+OVERFLOW_POLICIES = ("block", "drop_oldest", "coalesce")
+
+def _coalesce_key(message: Any) -> Any:
+    # Re-publications of one hypothesis supersede each other; other messages never merge
+    return getattr(message, "hypothesis_id", None) or id(message)
+
+class _Subscription:
+    """
+    One subscriber's bounded queue and the consumer task serving it.
+
+    Queue items are [enqueued_at, message] boxes so "coalesce" can swap a
+    newer message into a pending box without reordering the queue.
+    """
+    def __init__(self, bus: "MessageBus", topic: str, callback: Callable):
+        self.bus = bus
+        self.topic = topic
+        self.callback = callback
+        self.is_async = asyncio.iscoroutinefunction(callback)
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self._pending: Dict[Any, list] = {}
+        # Messages accepted but not yet delivered (queued or in the current batch)
+        self.unfinished = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_lag = 0.0
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            # First use, or the bus moved to a new event loop
+            self.queue = asyncio.Queue(maxsize=self.bus.queue_size)
+            self._pending.clear()
+            self.unfinished = 0
+            self.task = loop.create_task(self._consume())
+
+    async def put(self, message: Any):
+        self._ensure_running()
+        policy = self.bus.overflow
+        if policy == "coalesce":
+            box = self._pending.get(_coalesce_key(message))
+            if box is not None:
+                box[1] = message
+                self.coalesced += 1
+                return
+        if self.queue.full() and policy != "block":
+            dropped = self.queue.get_nowait()
+            self._pending.pop(_coalesce_key(dropped[1]), None)
+            self.queue.task_done()
+            self.unfinished -= 1
+            self.dropped += 1
+        box = [time.perf_counter(), message]
+        if policy == "coalesce":
+            self._pending[_coalesce_key(message)] = box
+        self.unfinished += 1
+        # Blocks the publisher only under the "block" policy with a full queue
+        await self.queue.put(box)
+
+    async def _consume(self):
+        while True:
+            batch = [await self.queue.get()]
+            if self.bus.batch_window > 0 and self.queue.qsize() < self.bus.batch_size - 1:
+                await asyncio.sleep(self.bus.batch_window)
+            while len(batch) < self.bus.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            now = time.perf_counter()
+            for box in batch:
+                self.max_lag = max(self.max_lag, now - box[0])
+                self._pending.pop(_coalesce_key(box[1]), None)
+            for _, message in batch:
+                try:
+                    if self.is_async:
+                        await self.callback(message)
+                    else:
+                        self.callback(message)
+                except Exception as e:
+                    logger.error("bus_callback_failed", topic=self.topic, error=str(e))
+                self.delivered += 1
+                self.unfinished -= 1
+                self.queue.task_done()
+
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
 class MessageBus:
     """
     A simple in-memory pub/sub system for agent communication.
+
+    With `bus.delivery: "queued"` (the default) every subscriber has its
+    own bounded asyncio.Queue served by a dedicated consumer task, so a
+    publish only enqueues and does not wait for the callbacks. Consumers
+    deliver in micro-batches (up to `batch_size` messages, optionally
+    collected over `batch_window_ms`). On a full queue, `overflow` either
+    blocks the publisher ("block"), drops the oldest entry
+    ("drop_oldest"), or coalesces ("coalesce": a queued hypothesis is
+    replaced in place by its re-publication, otherwise the oldest entry is
+    dropped). `drain()` waits until everything published so far has been
+    delivered. "inline" delivery awaits every callback inside `publish`.
+
+    This is also the interface for distributed backends (see
+    `swarm/redis_bus.py`): they deliver to local subscribers the same way
+    and add `start()`/`close()` for their connections.
     """
-    
-    def __init__(self):
+
+    def __init__(self, delivery: str = None, queue_size: int = None, overflow: str = None,
+                 batch_size: int = None, batch_window_ms: float = None):
+        config = DEFAULT_CONFIG.get("bus", {})
+        self.delivery = delivery or config.get("delivery", "queued")
+        self.queue_size = queue_size or config.get("queue_size", 1024)
+        self.overflow = overflow or config.get("overflow", "block")
+        self.batch_size = batch_size or config.get("batch_size", 64)
+        window_ms = config.get("batch_window_ms", 0.0) if batch_window_ms is None else batch_window_ms
+        self.batch_window = window_ms / 1000.0
+        if self.delivery not in DELIVERY_MODES:
+            raise ValueError(f"Unknown bus delivery mode: {self.delivery} (expected one of {DELIVERY_MODES})")
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown bus overflow policy: {self.overflow} (expected one of {OVERFLOW_POLICIES})")
+
         self.subscribers: Dict[str, List[Callable]] = {}
-        
+        # Parallel to `subscribers`: one queue per registration
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+        # Topics mirrored through a shared-memory board, and their pollers
+        self._boards: Dict[str, Any] = {}
+        self._board_cursors: Dict[str, List[int]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self.board_poll = config.get("board_poll_ms", 5.0) / 1000.0
+
     def subscribe(self, topic: str, callback: Callable):
         if topic not in self.subscribers:
             self.subscribers[topic] = []
+            self._subscriptions[topic] = []
         self.subscribers[topic].append(callback)
+        self._subscriptions[topic].append(_Subscription(self, topic, callback))
         logger.debug("subscribed_to_topic", topic=topic)
-        
+
+    def unsubscribe(self, topic: str, callback: Callable):
+        if callback in self.subscribers.get(topic, []):
+            i = self.subscribers[topic].index(callback)
+            del self.subscribers[topic][i]
+            self._subscriptions[topic].pop(i).close()
+            logger.debug("unsubscribed_from_topic", topic=topic)
+
+    def bind_topic(self, topic: str, board: Any):
+        """
+        Mirror `topic` through a SharedHypothesisBoard (swarm/board.py):
+        local publications are appended to this process's lane, and records
+        other processes write are delivered here as evidence-free Hypothesis
+        objects, polled every `bus.board_poll_ms` once the bus has started
+        and on every `drain()`.
+        """
+        self._boards[topic] = board
+        self._board_cursors[topic] = board.cursor()
+
+    def unbind_topic(self, topic: str):
+        """Stop mirroring `topic` through its board (e.g. before the board is released)."""
+        poller = self._pollers.pop(topic, None)
+        if poller is not None:
+            poller.cancel()
+        self._boards.pop(topic, None)
+        self._board_cursors.pop(topic, None)
+
+    async def start(self):
+        """Connect to any shared transport and start board pollers."""
+        for topic in self._boards:
+            if topic not in self._pollers:
+                self._pollers[topic] = asyncio.create_task(self._poll_board(topic))
+
+    async def close(self):
+        """Deliver what is queued, stop the consumers and release any shared transport."""
+        pollers, self._pollers = list(self._pollers.values()), {}
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        await self.drain()
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
     async def publish(self, topic: str, message: Any):
+        await self._deliver(topic, message)
+        board = self._boards.get(topic)
+        if board is not None:
+            board.append(message)
+
+    async def _pull_board(self, topic: str):
+        """Deliver what other processes wrote to `topic`'s board since the last pull."""
+        board = self._boards[topic]
+        records, self._board_cursors[topic] = board.read(self._board_cursors[topic], skip_own=True)
+        for hypothesis in board.to_hypotheses(records):
+            await self._deliver(topic, hypothesis)
+
+    async def _poll_board(self, topic: str):
+        while True:
+            await asyncio.sleep(self.board_poll)
+            await self._pull_board(topic)
+
+    async def _deliver(self, topic: str, message: Any):
+        """Hand `message` to this process's subscribers of `topic`."""
         if topic not in self.subscribers:
             return
-            
+
         logger.debug("publishing_message", topic=topic)
+        if self.delivery == "queued":
+            for subscription in list(self._subscriptions[topic]):
+                await subscription.put(message)
+            return
+
         tasks = []
         for callback in self.subscribers[topic]:
             if asyncio.iscoroutinefunction(callback):
                 tasks.append(callback(message))
             else:
                 callback(message)
-        
+
         if tasks:
             await asyncio.gather(*tasks)
+
+    async def drain(self):
+        """Wait until every queued message, including ones callbacks publish meanwhile, is delivered."""
+        for topic in self._boards:
+            await self._pull_board(topic)
+        while True:
+            busy = [s for subscriptions in self._subscriptions.values() for s in subscriptions
+                    if s.task is not None and s.unfinished]
+            if not busy:
+                return
+            await asyncio.gather(*(s.queue.join() for s in busy))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-topic queue depth, worst delivery lag, and delivered/dropped/coalesced counts."""
+        return {
+            topic: {
+                "subscribers": len(subscriptions),
+                "depth": sum(s.depth() for s in subscriptions),
+                "max_depth": max((s.depth() for s in subscriptions), default=0),
+                "max_lag_ms": round(max((s.max_lag for s in subscriptions), default=0.0) * 1000, 3),
+                "delivered": sum(s.delivered for s in subscriptions),
+                "dropped": sum(s.dropped for s in subscriptions),
+                "coalesced": sum(s.coalesced for s in subscriptions),
+            }
+            for topic, subscriptions in self._subscriptions.items()
+        }
+
+def create_bus(backend: str = None, **kwargs) -> MessageBus:
+    """The message bus selected by `bus.backend` in the config."""
+    backend = backend or DEFAULT_CONFIG.get("bus", {}).get("backend", "local")
+    if backend == "local":
+        return MessageBus(**kwargs)
+    if backend == "redis":
+        from AGI.src.swarm.redis_bus import RedisMessageBus
+        return RedisMessageBus(**kwargs)
+    raise ValueError(f"Unknown message bus backend: {backend} (expected one of {BUS_BACKENDS})")
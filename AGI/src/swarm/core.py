@@ -1,36 +1,126 @@
 import asyncio
-from typing import List, Dict
+import os
+from typing import AsyncIterator, Callable, List, Dict, Optional, Union
 import structlog
 from AGI.src.swarm.agent import OmnidirectionalAgent
 from AGI.src.swarm.schemas import Hypothesis
 from AGI.src.bridge.schemas import AgentToken
-from AGI.src.swarm.comms import MessageBus
+from AGI.src.bridge.batch import TokenBatch
+from AGI.src.swarm.comms import MessageBus, create_bus
+from AGI.src.swarm.board import SharedHypothesisBoard
+from AGI.src.swarm.broker import InferenceBroker
+from AGI.src.swarm.cross_validation import EpochCrossValidator
+from AGI.src.swarm.parallel import ProcessAgentPool, RegistryModel
+from AGI.src.swarm.scheduler import IterationScheduler
+from AGI.src.swarm.verification import VerificationCache
 from AGI.src.config_loader import DEFAULT_CONFIG
 from AGI.src.swarm.predictor import ARCPredictor
 from AGI.src.swarm.memory import RuleMemory
 from AGI.src.swarm.verifier import SwarmVerifier
+from AGI.src.text_cache import TEXT_CACHE
+from AGI.src.model_registry import ModelHandle, wrap_model
 import torch
 import uuid
 
 logger = structlog.get_logger()
 
+class _TokenFeed:
+    """
+    Pumps an async stream of TokenBatches into a queue in the background so
+    the consensus loop can pick up whatever has arrived between iterations.
+    """
+    def __init__(self, source: AsyncIterator[TokenBatch]):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.finished = False
+        self.task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[TokenBatch]):
+        try:
+            async for batch in source:
+                await self.queue.put(batch)
+        finally:
+            await self.queue.put(None)
+
+    def _take(self, item) -> List[TokenBatch]:
+        if item is None:
+            self.finished = True
+            return []
+        return [item]
+
+    async def next(self) -> List[TokenBatch]:
+        """Wait for the next batch (empty list once the stream is exhausted)."""
+        if self.finished:
+            return []
+        return self._take(await self.queue.get())
+
+    def drain(self) -> List[TokenBatch]:
+        """Everything that has arrived so far, without waiting."""
+        batches = []
+        while not self.finished and not self.queue.empty():
+            batches.extend(self._take(self.queue.get_nowait()))
+        return batches
+
+    async def rest(self) -> List[TokenBatch]:
+        """Wait for the stream to finish and return the remaining batches."""
+        batches = []
+        while not self.finished:
+            batches.extend(await self.next())
+        await self.task  # re-raise any error from the source
+        return batches
+
 class Swarm:
     """
     Orchestrates a collection of agents to reach a consensus.
     """
     
-    def __init__(self, num_agents: int = None, clip_model = None, clip_processor = None, task_data: Dict = None):
+    def __init__(self, num_agents: int = None, clip_model = None, clip_processor = None, task_data: Dict = None,
+                 model_handle: Optional[ModelHandle] = None, model_factory: Optional[Callable[[], ModelHandle]] = None,
+                 bus: Optional[MessageBus] = None, board: Optional[SharedHypothesisBoard] = None):
+        """
+        `bus` defaults to the backend selected by `bus.backend`; with a
+        distributed bus, swarms in other processes or on other hosts that
+        share its channels publish into this one.
+
+        `board` (or `swarm.board.enabled`) mirrors the "hypotheses" topic
+        through a shared-memory board: swarms in other processes on this
+        machine attach it with their own lane, and their hypotheses join
+        this swarm's global pool without being serialized.
+
+        `model_factory` is only used in process execution mode: a picklable
+        callable that builds the model handle inside each worker (default:
+        load model_handle's model and precision through the worker's registry).
+        A handle built from preloaded model objects can't be loaded that way,
+        so process mode then requires an explicit factory.
+        """
         self.config = DEFAULT_CONFIG.get("swarm", {})
         n_agents = num_agents or self.config.get("num_agents", 5)
         self.task_data = task_data
+        # One handle shared by every agent; nothing loads until something embeds
+        self.model_handle = model_handle or wrap_model(clip_model, clip_processor)
+        
+        # Coalesces the agents' CLIP scoring into one batched call per iteration
+        broker_config = self.config.get("broker", {})
+        self.broker = None
+        if self.model_handle and broker_config.get("enabled", True):
+            self.broker = InferenceBroker(self.model_handle)
+        
+        # Rule executions are memoized once for all agents
+        self.verification_cache = VerificationCache()
         
-        self.bus = MessageBus()
+        self.bus = bus or create_bus()
+        self.board = board
+        # A board created here is released by close(); a board passed in belongs to the caller
+        self._owns_board = False
+        if self.board is None and self.config.get("board", {}).get("enabled", False):
+            self.board = SharedHypothesisBoard()
+            self._owns_board = True
+        if self.board is not None:
+            self.bus.bind_topic("hypotheses", self.board)
         self.rule_memory = RuleMemory()
         
         # Pull rules from memory to bias agents
         self.agents = [OmnidirectionalAgent(bus=self.bus, 
-                                            clip_model=clip_model, 
-                                            clip_processor=clip_processor,
+                                            model_handle=self.model_handle,
                                             task_data=task_data) 
                        for _ in range(n_agents)]
         
@@ -39,65 +129,173 @@ class Swarm:
         
         # Load human hints
         hints = []
-        hint_path = "AGI/data/hints.json"
-        if os.path.exists(hint_path):
-            try:
-                with open(hint_path, 'r') as f:
-                    data = json.load(f)
-                    hints.append(data.get("hint", ""))
-            except:
-                pass
+        hint = self.rule_memory.get_hint()
+        if hint:
+            hints.append(hint.get("hint", ""))
 
         for agent in self.agents:
             agent.rule_memory = self.rule_memory
+            agent.broker = self.broker
+            agent.verification_cache = self.verification_cache
             # Hints get top priority
             for hint in hints:
                 if hint:
                     agent.prompt_bank.insert(0, hint)
             
+            in_bank = set(agent.prompt_bank)
             for rule in top_rules:
-                if rule not in agent.prompt_bank:
+                if rule not in in_bank:
                     agent.prompt_bank.append(rule)
+                    in_bank.add(rule)
+
+        # "epoch" replaces per-publish agent callbacks with one batched pass per iteration
+        self.cross_validation = self.config.get("cross_validation", "epoch")
+        self._epoch_publications: List[Hypothesis] = []
+        if self.cross_validation == "epoch":
+            for agent in self.agents:
+                self.bus.unsubscribe("hypotheses", agent.cross_validate)
+                agent.defer_pruning = True
 
         self.global_hypotheses: List[Hypothesis] = []
         self.iteration_count = 0
         self.max_iterations = self.config.get("max_iterations", 20)
-        self.timeout = self.config.get("agent_timeout_seconds", 5.0)        
+        # Per-iteration deadline; agents still running carry over instead of being cancelled
+        self.scheduler = IterationScheduler(deadline_seconds=self.config.get("agent_timeout_seconds", 5.0))
+
+        # "process" runs the agents' reasoning steps in worker processes
+        self.execution = self.config.get("execution", "async")
+        self.model_factory = model_factory
+        if model_factory is None and self.model_handle is not None and self.model_handle.rebuildable:
+            self.model_factory = RegistryModel(self.model_handle.model_name, self.model_handle.dtype)
+        self.process_pool: Optional[ProcessAgentPool] = None
         # Subscribe to new hypotheses
         self.bus.subscribe("hypotheses", self._handle_new_hypothesis)
 
+    @property
+    def timeout(self) -> float:
+        """Per-iteration agent deadline in seconds (the scheduler's)."""
+        return self.scheduler.deadline_seconds
+
+    @timeout.setter
+    def timeout(self, seconds: float):
+        self.scheduler.deadline_seconds = seconds
+
     async def _handle_new_hypothesis(self, hypothesis: Hypothesis):
         """
         Callback when any agent publishes a hypothesis.
         """
         self.global_hypotheses.append(hypothesis)
+        if self.cross_validation == "epoch":
+            self._epoch_publications.append(hypothesis)
         logger.debug("received_hypothesis", hypothesis_id=hypothesis.hypothesis_id)
         
-    async def run_consensus_loop(self, input_tokens: List[AgentToken]):
+    def _run_cross_validation_epoch(self):
+        """Apply this iteration's publications to every agent at once, then prune."""
+        publications, self._epoch_publications = self._epoch_publications, []
+        EpochCrossValidator.apply(self.agents, publications)
+        for agent in self.agents:
+            agent._prune_weak()
+
+    async def _perceive(self, batches: List[TokenBatch], seen: TokenBatch) -> TokenBatch:
+        """Hand newly arrived tokens to every agent; returns all tokens seen so far."""
+        new_tokens = TokenBatch.concat(batches)
+        if len(new_tokens):
+            if self.process_pool is not None:
+                await self.process_pool.perceive(new_tokens)
+            else:
+                for agent in self.agents:
+                    agent.perceive(new_tokens)
+        return TokenBatch.concat([seen, new_tokens])
+
+    async def _start_process_pool(self):
+        if self.model_handle is not None and self.model_factory is None:
+            raise ValueError(f"Process execution rebuilds the model in each worker, but model handle "
+                             f"'{self.model_handle.model_name}' wraps preloaded objects; pass a picklable "
+                             f"model_factory to Swarm")
+        workers = self.config.get("process_workers", 0) or os.cpu_count() or 1
+        self.process_pool = ProcessAgentPool(
+            num_workers=min(workers, len(self.agents)),
+            model_factory=self.model_factory,
+            task_data=self.task_data,
+            memory_path=self.rule_memory.storage_path,
+        )
+        await self.process_pool.add_agents(self.agents)
+
+    async def _run_process_step(self, agent: OmnidirectionalAgent, context: str):
+        """The agent's candidates come from its worker; publishing and pruning happen here."""
+        candidates = await self.process_pool.step_agent(agent.agent_id, context)
+        await agent.publish_candidates(candidates)
+
+    def close(self):
+        """
+        Shut down worker processes, if any (without waiting for a step still
+        running in one), and release the shared board if this swarm created it.
+        """
+        if self.process_pool is not None:
+            self.process_pool.close()
+            self.process_pool = None
+        if self.board is not None and self._owns_board:
+            self.bus.unbind_topic("hypotheses")
+            self.board.close()
+            self.board.unlink()
+            self.board = None
+            self._owns_board = False
+
+    async def run_consensus_loop(self, input_tokens: Union[TokenBatch, List[AgentToken], AsyncIterator[TokenBatch]]):
         """
         Main reasoning loop.
+        `input_tokens` may also be an async stream of TokenBatches (see
+        Bridge.translate_stream): reasoning starts on the first batch and later
+        batches are perceived between iterations.
         """
-        logger.info("starting_consensus_loop", num_agents=len(self.agents), num_tokens=len(input_tokens))
+        await self.bus.start()
+        try:
+            if self.execution == "process":
+                await self._start_process_pool()
+            return await self._consensus_loop(input_tokens)
+        finally:
+            self.close()
+            await self.bus.close()
+
+    async def _consensus_loop(self, input_tokens: Union[TokenBatch, List[AgentToken], AsyncIterator[TokenBatch]]):
+        feed = None
+        if hasattr(input_tokens, "__aiter__"):
+            feed = _TokenFeed(input_tokens)
+            initial = await feed.next()
+        else:
+            # Agents share one columnar batch instead of copying token lists
+            initial = [TokenBatch.from_tokens(input_tokens)]
+        logger.info("starting_consensus_loop", num_agents=len(self.agents),
+                    num_tokens=sum(len(b) for b in initial), streaming=feed is not None)
         
         # Initial perception
-        for agent in self.agents:
-            agent.perceive(input_tokens)
+        input_tokens = await self._perceive(initial, TokenBatch.empty())
             
         for i in range(self.max_iterations):
             self.iteration_count = i
             logger.debug("iteration_step", step=i)
+
+            if feed is not None:
+                input_tokens = await self._perceive(feed.drain(), input_tokens)
             
             # Step 1, 2, 3: Candidate Generation -> Self-Verify -> Publish (Cross-Val)
             # Agents perform internal reasoning and publish candidates to the bus.
-            tasks = [asyncio.wait_for(agent.run_reasoning_step(context=f"sector_{i}"), timeout=self.timeout) 
-                     for agent in self.agents]
-            try:
-                # This gathers and triggers cross-validation listeners on the bus simultaneously
-                await asyncio.gather(*tasks)
-            except asyncio.TimeoutError:
-                logger.warning("agent_timeout_during_reasoning", step=i)
-            except Exception as e:
-                logger.error("agent_unhandled_error", error=str(e))
+            # Publishing triggers cross-validation listeners on the bus as agents finish.
+            # Agents that miss the deadline keep running and publish in a later iteration.
+            context = f"sector_{i}"
+            if self.process_pool is not None:
+                # Still one job per agent, so deadlines, latency and benching stay per agent
+                jobs = {agent.agent_id: (lambda agent=agent: self._run_process_step(agent, context))
+                        for agent in self.agents}
+            else:
+                jobs = {agent.agent_id: (lambda agent=agent: agent.run_reasoning_step(context=context))
+                        for agent in self.agents}
+            await self.scheduler.run_iteration(jobs)
+            # Queued bus delivery: let this iteration's publications reach every subscriber
+            await self.bus.drain()
+
+            if self.cross_validation == "epoch":
+                self._run_cross_validation_epoch()
                 
             # Step 4: Swarm-level Pruning and Strengthening
             # Strengthen based on global consensus markers and merge similar findings
@@ -113,9 +311,19 @@ class Swarm:
                 logger.info("consensus_reached", step=i, top_score=self.global_hypotheses[0].score)
                 break
                 
+        # Stragglers' late candidates would not be cross-validated any more
+        await self.scheduler.finish()
+        await self.bus.drain()
+
+        if feed is not None:
+            # Synthesis aligns against every patch, so wait for the stream to finish
+            input_tokens = await self._perceive(await feed.rest(), input_tokens)
+            logger.info("stream_complete", num_tokens=len(input_tokens))
+
         # Memory Decay: Rules not proposed in this run decay slightly
         proposed_rules = [h.content for h in self.global_hypotheses]
         self.rule_memory.decay_unused(proposed_rules)
+        self.rule_memory.flush()
 
         # Final Refinement: Global alignment and Synthesis
         final_h = await self._synthesize_final_hypothesis(input_tokens)
@@ -131,10 +339,10 @@ class Swarm:
         Executes the rule in the hypothesis using the ARCPredictor.
         """
         logger.info("applying_transformation_rule", rule=hypothesis.content)
-        predicted = ARCPredictor.apply_rule(hypothesis.content, input_grid)
+        predicted = self.verification_cache.predict(hypothesis.content, input_grid)
         return predicted
 
-    async def _synthesize_final_hypothesis(self, all_tokens: List[AgentToken]) -> Hypothesis:
+    async def _synthesize_final_hypothesis(self, all_tokens: TokenBatch) -> Hypothesis:
         """
         Synthesizes a final rich hypothesis by merging top consensus results
         and calculating global CLIP alignment.
@@ -160,19 +368,14 @@ class Swarm:
              final_content = f"{primary.content}, including {additional_info[0]}"
 
         # Global alignment: CLIP similarity against MEAN of ALL patches
-        clip_model = self.agents[0].clip_model
-        clip_processor = self.agents[0].clip_processor
-        device = self.agents[0].device
+        handle = self.model_handle
 
-        if clip_model and clip_processor and all_tokens:
-            all_vectors = torch.tensor([t.vector for t in all_tokens]).to(device).to(torch.float32)
+        if handle and all_tokens:
+            all_vectors = all_tokens.tensor(device=handle.device)
             mean_emb = all_vectors.mean(dim=0, keepdim=True)
             mean_emb = mean_emb / mean_emb.norm(dim=-1, keepdim=True)
             
-            text_inputs = clip_processor(text=[final_content], return_tensors="pt", padding=True).to(device)
-            with torch.no_grad():
-                text_emb = clip_model.get_text_features(**text_inputs).to(torch.float32)
-            text_emb = text_emb / text_emb.norm(dim=-1, keepdim=True)
+            text_emb = TEXT_CACHE.encode(handle, [final_content])
             
             global_sim = torch.mm(text_emb, mean_emb.T).item()
             logger.info("global_alignment_check", score=global_sim, content=final_content)
@@ -228,6 +431,15 @@ class Swarm:
         
         return convergence_ratio >= threshold or self.global_hypotheses[0].score > 0.98
 
+    def leaderboard(self, k: int = 10) -> List[Hypothesis]:
+        """
+        Best hypotheses across every swarm sharing the board (this swarm's
+        pool without one, or once close() has released a board it created).
+        """
+        if self.board is None:
+            return self.global_hypotheses[:k]
+        return self.board.to_hypotheses(self.board.top(k))
+
     def _get_best_hypothesis(self) -> Hypothesis:
         if not self.global_hypotheses:
             return None
@@ -0,0 +1,67 @@
+import numpy as np
+import torch
+from typing import Optional
+
+from AGI.src.bridge.batch import TokenBatch
+
+SAMPLING_MODES = ("importance", "topk", "random")
+
+class EvidenceIndex:
+    """
+    Precomputed per-batch evidence statistics, built once when an agent
+    perceives tokens:
+
+    - `normalized`: unit-norm embeddings, ready for cosine similarity
+    - `weights`: the centre-biased spatial weight of each token
+    - `centroid`: the unit-norm mean patch embedding, a summary of the task
+    - `saliency`: cosine distance from the batch centroid. Background patches
+      (the bulk of an ARC composite) sit near the centroid and score low.
+
+    Selecting k evidence tokens is then an index lookup instead of a
+    per-call Python loop.
+    """
+    def __init__(self, batch: TokenBatch, device: str = "cpu"):
+        self.size = len(batch)
+        vectors = batch.tensor(device=device)
+        self.normalized = vectors / vectors.norm(dim=-1, keepdim=True).clamp_min(1e-12)
+
+        if self.size:
+            centroid = self.normalized.mean(dim=0)
+            self.centroid = centroid / centroid.norm().clamp_min(1e-12)
+            self.saliency = (1.0 - self.normalized @ self.centroid).clamp_min(0.0)
+        else:
+            self.centroid = None
+            self.saliency = torch.zeros(0, device=device)
+
+        # Simple Gaussian-like weight, higher for center (0.5, 0.5)
+        positions = np.array([[m.get("position_normalized", {}).get("x", 0.5),
+                               m.get("position_normalized", {}).get("y", 0.5)] for m in batch.metadata],
+                             dtype=np.float32).reshape(-1, 2)
+        dist = np.sqrt(((positions - 0.5) ** 2).sum(axis=1))
+        self.weights = torch.from_numpy(np.maximum(0.1, 1.0 - dist * 1.5).astype(np.float32)).to(device)
+
+        # Importance mixes saliency and position; the floor keeps every token reachable
+        importance = self.saliency * self.weights + 1e-3
+        self.probabilities = importance / importance.sum() if self.size else importance
+        self.ranked = torch.argsort(importance, descending=True)
+
+    def sample(self, k: int, mode: str = "importance", generator: Optional[torch.Generator] = None) -> torch.Tensor:
+        """Return indices of k evidence tokens."""
+        k = min(k, self.size)
+        if k == 0:
+            return torch.zeros(0, dtype=torch.long)
+        if mode == "topk":
+            return self.ranked[:k]
+        if mode == "importance":
+            return torch.multinomial(self.probabilities, k, replacement=False, generator=generator)
+        if mode == "random":
+            return torch.randperm(self.size, generator=generator, device=self.weights.device)[:k]
+        raise ValueError(f"Unknown evidence sampling mode: {mode} (expected one of {SAMPLING_MODES})")
+
+def weighted_similarity(text_embeddings: torch.Tensor, evidence: torch.Tensor, weights: torch.Tensor) -> torch.Tensor:
+    """
+    Spatially weighted mean cosine similarity of each prompt over the evidence.
+    Inputs are unit-norm (P, D) prompts, (K, D) evidence and (K,) weights;
+    returns (P,) scores from a single matrix multiply.
+    """
+    return (text_embeddings @ evidence.T) @ weights / weights.sum()
@@ -1,126 +1,278 @@
-import json
-import os
+import bisect
 import structlog
 import random
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Iterable, Optional, Tuple
+
+from AGI.src.swarm.rule_index import RuleVectorIndex, embed_texts
+from AGI.src.swarm.rule_store import RuleStore, create_rule_store
+from AGI.src.text_cache import TextEmbeddingCache
 
 logger = structlog.get_logger()
 
+# The project's learned rules (hints.json lives next to it)
+DEFAULT_STORAGE_PATH = "AGI/data/rule_memory.json"
+
+# Rules below this weight are offered for rehearsal
+REHEARSAL_WEIGHT = 0.8
+
+class _FenwickTree:
+    """
+    Prefix sums over rule weights: O(log n) point updates and O(log n)
+    sampling proportional to weight.
+    """
+    def __init__(self, values: Iterable[float] = ()):
+        self.tree = [0.0]
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self.tree) - 1
+
+    def _prefix(self, i: int) -> float:
+        # Sum of the first i values
+        total = 0.0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def append(self, value: float):
+        i = len(self.tree)
+        # Node i covers (i - lowbit(i), i]
+        self.tree.append(value + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+
+    def add(self, index: int, delta: float):
+        i = index + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        return self._prefix(len(self))
+
+    def find(self, target: float) -> int:
+        """Index of the value whose cumulative range contains `target`."""
+        pos = 0
+        step = 1 << (len(self).bit_length())
+        while step:
+            nxt = pos + step
+            if nxt <= len(self) and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(pos, len(self) - 1)
+
 class RuleMemory:
     """
     Persistent storage for successful ARC transformation rules with no forgetting.
     Implements weighted rules, rehearsal mechanism, and decay.
+
+    `rules` keeps insertion order (and is what gets saved). Lookups go through
+    a text -> slot dict, top-N and rehearsal through a weight-ordered list of
+    (-weight, slot) keys, and weighted sampling through a Fenwick tree.
+
+    Persistence goes through a pluggable RuleStore (`memory.backend`): a
+    JSON snapshot with a write-behind journal, or SQLite for several
+    processes sharing one memory. Call `flush()` to force pending changes
+    to disk.
+
+    Each rule's text embedding lives in a per-model RuleVectorIndex, built
+    on the first `nearest_rules` call and kept in step as rules arrive.
     """
-    def __init__(self, storage_path: str = "AGI/data/rule_memory.json"):
-        self.storage_path = storage_path
+    def __init__(self, storage_path: str = None, backend: Optional[str] = None):
+        self.storage_path = storage_path or DEFAULT_STORAGE_PATH
+        self.store: RuleStore = create_rule_store(self.storage_path, backend)
         self.rules: List[Dict] = []
+        self._vector_indexes: Dict[str, RuleVectorIndex] = {}
         self._load()
+        self._reindex()
+
+    def _reindex(self):
+        self._slots: Dict[str, int] = {}
+        for slot, rule in enumerate(self.rules):
+            self._slots.setdefault(rule["text"], slot)
+        self._order: List[Tuple[float, int]] = sorted((-self._weight(slot), slot) for slot in range(len(self.rules)))
+        self._sampler = _FenwickTree(self._weight(slot) for slot in range(len(self.rules)))
+        for index in self._vector_indexes.values():
+            index.pending = [text for text in self._slots if text not in index]
+
+    def _weight(self, slot: int) -> float:
+        return self.rules[slot].get("weight", 1.0)
+
+    def _set_weight(self, slot: int, weight: float):
+        old = self._weight(slot)
+        del self._order[bisect.bisect_left(self._order, (-old, slot))]
+        self.rules[slot]["weight"] = weight
+        bisect.insort(self._order, (-weight, slot))
+        self._sampler.add(slot, weight - old)
+
+    def _append(self, rule: Dict):
+        slot = len(self.rules)
+        self.rules.append(rule)
+        self._slots[rule["text"]] = slot
+        bisect.insort(self._order, (-self._weight(slot), slot))
+        self._sampler.append(self._weight(slot))
+        for index in self._vector_indexes.values():
+            index.pending.append(rule["text"])
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __contains__(self, rule_text: str) -> bool:
+        return rule_text in self._slots
+
+    def get(self, rule_text: str) -> Optional[Dict]:
+        slot = self._slots.get(rule_text)
+        return None if slot is None else self.rules[slot]
         
     def _load(self):
-        if os.path.exists(self.storage_path):
-            with open(self.storage_path, 'r') as f:
-                try:
-                    data = json.load(f)
-                    # Support legacy dict format if it exists, or the new list format
-                    if isinstance(data, dict):
-                        # Convert legacy Dict[str, float] to List[Dict]
-                        self.rules = [
-                            {
-                                "text": text,
-                                "weight": weight,
-                                "success_count": int(weight * 2), # Heuristic conversion
-                                "last_used": datetime.now().isoformat()
-                            }
-                            for text, weight in data.items()
-                        ]
-                    else:
-                        self.rules = data.get("rules", [])
-                except Exception as e:
-                    logger.error("memory_load_failed", error=str(e))
-                except Exception as e:
-                    logger.error("memory_load_failed", error=str(e))
-                    self.rules = []
+        try:
+            self.rules = self.store.load()
+        except Exception as e:
+            logger.error("memory_load_failed", error=str(e))
+            self.rules = []
+        self._apply_hint()
 
+    def _apply_hint(self):
         # Load hints as high priority rules
-        hints_path = os.path.join(os.path.dirname(self.storage_path), "hints.json")
-        if os.path.exists(hints_path):
-             try:
-                with open(hints_path, 'r') as f:
-                    data = json.load(f)
-                    # hints.json usually has {"hint": "text", "timestamp": "..."}
-                    # We treat it as a single high-priority rule injection
-                    hint_text = data.get("hint")
-                    if hint_text:
-                        # Check if already exists to update or append
-                        for rule in self.rules:
-                            if rule["text"] == hint_text:
-                                rule["weight"] = 3.0 # Super high priority
-                                break
-                        else:
-                            self.rules.append({
-                                "text": hint_text,
-                                "weight": 3.0,
-                                "success_count": 0,
-                                "last_used": datetime.now().isoformat()
-                            })
-             except Exception as e:
-                logger.error("hints_load_failed", error=str(e))
-                    
+        try:
+            hint = self.store.get_hint()
+        except Exception as e:
+            logger.error("hints_load_failed", error=str(e))
+            return
+        # A hint is {"hint": "text", "timestamp": "..."}
+        # We treat it as a single high-priority rule injection
+        hint_text = hint.get("hint") if hint else None
+        if hint_text:
+            # Check if already exists to update or append
+            for rule in self.rules:
+                if rule["text"] == hint_text:
+                    rule["weight"] = 3.0 # Super high priority
+                    break
+            else:
+                self.rules.append({
+                    "text": hint_text,
+                    "weight": 3.0,
+                    "success_count": 0,
+                    "last_used": datetime.now().isoformat()
+                })
+
+    def get_hint(self) -> Optional[Dict]:
+        """Latest human hint ({"hint", "timestamp"[, "solution"]}) or None."""
+        return self.store.get_hint()
+
+    def set_hint(self, text: str, solution: Optional[List[List[int]]] = None):
+        self.store.set_hint(text, solution)
+
+    def flush(self):
+        """Make every change so far durable."""
+        self.store.flush()
+
+    def compact(self):
+        self.store.compact()
+
     def save(self):
-        os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-        with open(self.storage_path, 'w') as f:
-            json.dump({"rules": self.rules}, f, indent=4)
+        self.store.flush()
+        self.store.compact()
+
+    def reload(self):
+        """Re-read the store, picking up other writers' changes."""
+        self._load()
+        self._reindex()
             
     def add_or_update(self, rule_text: str):
         """
         Record a successful rule. Increases weight and success count.
         """
-        for rule in self.rules:
-            if rule["text"] == rule_text:
-                rule["success_count"] += 1
-                rule["weight"] = min(2.0, rule.get("weight", 1.0) + 0.5)
-                rule["last_used"] = datetime.now().isoformat()
-                break
+        slot = self._slots.get(rule_text)
+        current = None if slot is None else self.rules[slot]
+        updated = self.store.record_success(rule_text, current, datetime.now().isoformat())
+        if current is not None:
+            self._set_weight(slot, updated["weight"])
+            current.update(updated)
         else:
-            self.rules.append({
-                "text": rule_text,
-                "weight": 1.0,
-                "success_count": 1,
-                "last_used": datetime.now().isoformat()
-            })
-        self.save()
+            self._append(updated)
+        self.store.maybe_flush()
         logger.info("memory_updated", rule=rule_text)
 
     def decay_unused(self, used_this_run: List[str]):
         """
         Light decay for rules not used in the current run.
         """
-        for rule in self.rules:
-            if rule["text"] not in used_this_run:
-                rule["weight"] = max(0.3, rule.get("weight", 1.0) - 0.01)
-        self.save()
+        rules = self.store.decay(set(used_this_run), self.rules)
+        if rules is not self.rules:
+            # The store re-read its state; keep the hint's priority on top of it
+            self.rules = rules
+            self._apply_hint()
+        # Touches every rule anyway, so rebuild the indexes in one go
+        self._reindex()
+        self.store.maybe_flush()
         logger.info("memory_decayed")
 
     def get_weighted_rules(self, top_n: Optional[int] = None) -> List[Dict]:
         """
         Retrieve rules sorted by weight.
         """
-        sorted_rules = sorted(self.rules, key=lambda x: x.get("weight", 1.0), reverse=True)
-        return sorted_rules[:top_n] if top_n else sorted_rules
+        order = self._order[:top_n] if top_n else self._order
+        return [self.rules[slot] for _, slot in order]
 
     def get_rehearsal_candidates(self, n: int = 3) -> List[Dict]:
         """
         Lowest weight rules but still above floor.
         """
-        low_weight = [r for r in self.rules if r.get("weight", 1.0) < 0.8]
-        if not low_weight:
+        # Weights below the threshold form the tail of the weight order
+        start = bisect.bisect_right(self._order, (-REHEARSAL_WEIGHT, len(self.rules)))
+        count = len(self._order) - start
+        if not count:
+            return []
+        picks = random.sample(range(start, len(self._order)), min(n, count))
+        return [self.rules[self._order[i][1]] for i in picks]
+
+    def sample_weighted(self, k: int = 1) -> List[Dict]:
+        """
+        Draw k rules (with replacement) with probability proportional to
+        weight, O(log n) per draw.
+        """
+        total = self._sampler.total()
+        if not self.rules or total <= 0:
+            return []
+        return [self.rules[self._sampler.find(random.random() * total)] for _ in range(k)]
+
+    def vector_index(self, handle: Any) -> RuleVectorIndex:
+        """The rule embedding index for `handle`'s text encoder, brought up to date."""
+        key = TextEmbeddingCache.model_key(handle)
+        index = self._vector_indexes.get(key)
+        if index is None:
+            index = self._vector_indexes[key] = RuleVectorIndex()
+            index.pending = list(self._slots)
+        if index.pending:
+            texts = list(dict.fromkeys(t for t in index.pending if t not in index))
+            index.pending = []
+            if texts:
+                index.add(texts, embed_texts(handle, texts))
+        return index
+
+    def rule_embedding(self, handle: Any, rule_text: str):
+        """Cached unit-norm text embedding of a stored rule, or None."""
+        if rule_text not in self._slots:
+            return None
+        return self.vector_index(handle).embedding(rule_text)
+
+    def nearest_rules(self, handle: Any, query, k: int = 5) -> List[Dict]:
+        """
+        The k rules whose text embeddings are most similar to `query`
+        (e.g. a task's mean patch embedding), best first.
+        """
+        if not self.rules or k <= 0:
             return []
-        return random.sample(low_weight, min(n, len(low_weight)))
+        hits = self.vector_index(handle).search(query, k)
+        return [self.rules[self._slots[text]] for text, _ in hits if text in self._slots]
 
     # Legacy compatibility
     def persist_rule(self, rule: str, weight: float = 1.0):
         self.add_or_update(rule)
+        self.flush()
 
     def get_top_rules(self, k: int = 5) -> List[str]:
         return [r["text"] for r in self.get_weighted_rules(top_n=k)]
@@ -0,0 +1,208 @@
+"""
+Process-parallel agent execution.
+
+Candidate scoring, self-verification and rule execution are CPU-bound and
+synchronous, so under `asyncio.gather` every agent shares one core. In
+`swarm.execution: "process"` mode the Swarm hands its agents' reasoning to
+worker processes instead:
+
+- each worker is a single-process `ProcessPoolExecutor` started with the
+  "spawn" method, and loads the model, rule memory and task once in its
+  initializer;
+- agents are pinned round-robin to workers, and each worker hosts replicas
+  that keep per-agent generation state (tokens, seen prompts, iteration);
+- tokens travel to workers and hypotheses back in the binary codec format.
+
+Each agent is still its own scheduler job (see scheduler.py); steps of
+agents pinned to one worker that start together go out as one call. Within
+a worker, agents run concurrently behind one InferenceBroker, so a worker
+makes one text-encoder call per iteration. The coordinator keeps the
+agents' active hypotheses and feeds the returned candidates to its own bus,
+so cross-validation, pruning and convergence work as in the async mode.
+"""
+import asyncio
+import multiprocessing as mp
+import os
+import structlog
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from AGI.src.bridge.batch import TokenBatch
+from AGI.src.bridge.codec import decode_hypotheses, decode_tokens, encode_hypotheses, encode_tokens
+from AGI.src.swarm.schemas import Hypothesis
+
+logger = structlog.get_logger()
+
+# Per-process state of a worker, set up by _init_worker
+_WORKER: Dict[str, Any] = {}
+
+class RegistryModel:
+    """Picklable model factory: the worker loads (model_name, dtype) through its own registry."""
+    def __init__(self, model_name: str, dtype: str = "fp32", device: str = "cpu"):
+        self.model_name = model_name
+        self.dtype = dtype
+        self.device = device
+
+    def __call__(self):
+        from AGI.src.model_registry import MODEL_REGISTRY
+        return MODEL_REGISTRY.get(self.model_name, self.device, self.dtype)
+
+def _init_worker(model_factory: Optional[Callable], task_data: Optional[Dict], memory_path: Optional[str],
+                 memory_backend: Optional[str], torch_threads: int):
+    import torch
+    from AGI.src.swarm.broker import InferenceBroker
+    from AGI.src.swarm.memory import RuleMemory
+    from AGI.src.swarm.verification import VerificationCache
+
+    torch.set_num_threads(torch_threads)
+    handle = model_factory() if model_factory is not None else None
+    if handle is not None:
+        handle.model  # load now rather than inside the first step
+    _WORKER.update(
+        handle=handle,
+        task_data=task_data,
+        rule_memory=RuleMemory(memory_path, memory_backend) if memory_path else None,
+        broker=InferenceBroker(handle) if handle is not None else None,
+        verification_cache=VerificationCache(),
+        agents={},
+        loop=asyncio.new_event_loop(),
+    )
+
+def _worker_add_agents(specs: List[Dict[str, Any]]):
+    from AGI.src.swarm.agent import OmnidirectionalAgent
+
+    for spec in specs:
+        agent = OmnidirectionalAgent(agent_id=spec["agent_id"], model_handle=_WORKER["handle"],
+                                     task_data=_WORKER["task_data"])
+        agent.prompt_bank = list(spec["prompt_bank"])
+        agent.max_per_iter = spec["max_per_iter"]
+        agent.rule_memory = _WORKER["rule_memory"]
+        agent.broker = _WORKER["broker"]
+        agent.verification_cache = _WORKER["verification_cache"]
+        _WORKER["agents"][agent.agent_id] = agent
+
+def _worker_perceive(payload: bytes):
+    tokens = decode_tokens(payload)
+    for agent in _WORKER["agents"].values():
+        agent.perceive(tokens)
+
+async def _generate(agent, context: str) -> List[Hypothesis]:
+    candidates = await agent.generate_candidate(context)
+    await agent.self_verify(candidates)
+    # The coordinator owns active hypotheses; the replica only keeps generation state
+    agent.active_hypotheses.clear()
+    agent.iteration += 1
+    return candidates
+
+async def _generate_all(agents: List, context: str) -> List[List[Hypothesis]]:
+    return await asyncio.gather(*(_generate(agent, context) for agent in agents))
+
+def _worker_step(context: str, agent_ids: Optional[List[str]] = None) -> Dict[str, bytes]:
+    agents = list(_WORKER["agents"].values()) if agent_ids is None else [_WORKER["agents"][i] for i in agent_ids]
+    results = _WORKER["loop"].run_until_complete(_generate_all(agents, context))
+    return {agent.agent_id: encode_hypotheses(candidates) for agent, candidates in zip(agents, results)}
+
+class ProcessAgentPool:
+    """
+    Worker processes that generate and self-verify candidates for pinned
+    agents. `model_factory` is a picklable zero-argument callable returning
+    a ModelHandle inside the worker (None runs agents without a model).
+    """
+    def __init__(self, num_workers: int = None, model_factory: Optional[Callable] = None,
+                 task_data: Optional[Dict] = None, memory_path: Optional[str] = None,
+                 memory_backend: Optional[str] = None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        # Split the cores between workers instead of oversubscribing them
+        torch_threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+        context = mp.get_context("spawn")
+        self.workers = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker,
+                                initargs=(model_factory, task_data, memory_path, memory_backend, torch_threads))
+            for _ in range(self.num_workers)
+        ]
+        self.assignment: Dict[str, int] = {}
+        # Per-worker step batches still collecting agents, and dispatched ones in flight
+        self._collecting: Dict[int, Dict[str, Any]] = {}
+        self._dispatched: set = set()
+
+    async def _each(self, fn: Callable, *args, workers: Optional[Sequence[int]] = None) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        targets = range(len(self.workers)) if workers is None else workers
+        return await asyncio.gather(*(loop.run_in_executor(self.workers[w], fn, *args) for w in targets))
+
+    def _busy_workers(self) -> List[int]:
+        return sorted(set(self.assignment.values()))
+
+    async def add_agents(self, agents: Sequence):
+        """Pin agents round-robin to workers and build their replicas there."""
+        specs: Dict[int, List[Dict[str, Any]]] = {}
+        for agent in agents:
+            worker = len(self.assignment) % len(self.workers)
+            self.assignment[agent.agent_id] = worker
+            specs.setdefault(worker, []).append({"agent_id": agent.agent_id, "prompt_bank": agent.prompt_bank,
+                                                 "max_per_iter": agent.max_per_iter})
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.workers[w], _worker_add_agents, s)
+                               for w, s in specs.items()))
+        logger.info("process_pool_ready", workers=len(self.workers), agents=len(self.assignment))
+
+    async def perceive(self, tokens: TokenBatch):
+        """Send newly arrived tokens to every worker (encoded once)."""
+        if len(tokens):
+            await self._each(_worker_perceive, encode_tokens(tokens), workers=self._busy_workers())
+
+    async def step(self, context: str) -> Dict[str, List[Hypothesis]]:
+        """One reasoning step for every agent: agent_id -> new, self-verified candidates."""
+        results: Dict[str, List[Hypothesis]] = {}
+        for encoded in await self._each(_worker_step, context, workers=self._busy_workers()):
+            for agent_id, payload in encoded.items():
+                results[agent_id] = decode_hypotheses(payload)
+        return results
+
+    async def step_agent(self, agent_id: str, context: str) -> List[Hypothesis]:
+        """
+        One reasoning step for one agent: its new, self-verified candidates.
+        Agents pinned to the same worker that step in the same event-loop
+        tick share one worker call (and so one text-encoder batch).
+        """
+        worker = self.assignment[agent_id]
+        batch = self._collecting.get(worker)
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._collecting[worker] = {"context": context, "agents": [], "result": loop.create_future()}
+            # Runs after the other jobs started in this tick have joined the batch
+            loop.call_soon(self._dispatch, worker)
+        batch["agents"].append(agent_id)
+        # Shielded: one agent's job being cancelled must not cancel its worker-mates' results
+        encoded = await asyncio.shield(batch["result"])
+        return decode_hypotheses(encoded[agent_id])
+
+    def _dispatch(self, worker: int):
+        batch = self._collecting.pop(worker)
+        task = asyncio.ensure_future(self._run_batch(worker, batch))
+        self._dispatched.add(task)
+        task.add_done_callback(self._dispatched.discard)
+
+    async def _run_batch(self, worker: int, batch: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        try:
+            encoded = await loop.run_in_executor(self.workers[worker], _worker_step, batch["context"], batch["agents"])
+        except asyncio.CancelledError:
+            batch["result"].cancel()
+            raise
+        except Exception as e:
+            batch["result"].set_exception(e)
+            batch["result"].exception()  # retrieved here in case every waiting job was cancelled
+        else:
+            batch["result"].set_result(encoded)
+
+    def close(self):
+        """
+        Cancel queued work and let the workers exit. Does not wait, so it is
+        safe to call from the event loop: a step already running in a worker
+        finishes in the background and its result is dropped.
+        """
+        for task in self._dispatched:
+            task.cancel()
+        for worker in self.workers:
+            worker.shutdown(wait=False, cancel_futures=True)
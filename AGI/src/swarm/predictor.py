@@ -2,6 +2,8 @@ import numpy as np
 import structlog
 from typing import List
 
+from AGI.src.swarm.rule_compiler import RULE_COMPILER, Plan
+
 logger = structlog.get_logger()
 
 class ARCPredictor:
@@ -13,109 +15,62 @@ class ARCPredictor:
     def apply_rule(rule_content: str, input_grid: List[List[int]], demo_pair: dict = None) -> List[List[int]]:
         """
         Apply a textual rule (or chain of rules) to a grid.
-        Rules can be separated by commas or 'including'.
+        Rules can be separated by commas or 'including'; the text is
+        compiled once into a plan (see rule_compiler.py) and cached.
         """
-        import re
-        # Normalize and split into atomic rules
-        atomic_rules = re.split(r',| including ', rule_content.lower())
-        
-        current_grid = np.array(input_grid)
-        
-        for rule_raw in atomic_rules:
-            rule_lower = rule_raw.strip()
-            if not rule_lower:
-                continue
-            
-            logger.info("applying_atomic_rule", rule=rule_lower)
-                
-            # Logic for each atomic rule
-            if "identity" in rule_lower:
-                pass # stays same
-                
-            elif "reflection" in rule_lower:
-                if "top" in rule_lower and "bottom" in rule_lower:
-                    mid = current_grid.shape[0] // 2
-                    res = current_grid.copy()
-                    res[mid:] = np.flipud(current_grid[:mid])
-                    current_grid = res
-                elif "left" in rule_lower and "right" in rule_lower:
-                    mid = current_grid.shape[1] // 2
-                    res = current_grid.copy()
-                    res[:, mid:] = np.fliplr(current_grid[:, :mid])
-                    current_grid = res
+        plan = RULE_COMPILER.compile(rule_content)
+        return ARCPredictor.run_plan(plan, np.array(input_grid), demo_pair).tolist()
 
-            elif "color_fill" in rule_lower:
+    @staticmethod
+    def run_plan(plan: Plan, grid: np.ndarray, demo_pair: dict = None) -> np.ndarray:
+        """Execute a compiled rule plan on a grid."""
+        current_grid = grid
+        for op, params in plan:
+            if op == "reflect_rows":
+                mid = current_grid.shape[0] // 2
+                res = current_grid.copy()
+                res[mid:] = np.flipud(current_grid[:mid])
+                current_grid = res
+            elif op == "reflect_cols":
+                mid = current_grid.shape[1] // 2
+                res = current_grid.copy()
+                res[:, mid:] = np.fliplr(current_grid[:, :mid])
+                current_grid = res
+            elif op == "color_fill":
                 vals, counts = np.unique(current_grid[current_grid > 0], return_counts=True)
                 if len(vals) > 0:
-                    most_freq = vals[np.argmax(counts)]
                     res = current_grid.copy()
-                    res[res == 0] = most_freq
+                    res[res == 0] = vals[np.argmax(counts)]
                     current_grid = res
-                    current_grid = res
-            
-            elif "rotation" in rule_lower:
-                k = 0
-                if "90" in rule_lower: k = 1 # 90 deg clockwise (numpy rot90 is counter-clockwise, so we use k=-1 or 3)
-                elif "180" in rule_lower: k = 2
-                elif "270" in rule_lower: k = 3
-                
-                # np.rot90 rotates counter-clockwise by default. 
-                # k=1 -> 90deg CCW. 
-                # Requirement: "90 degrees clockwise" -> 270 degrees CCW -> k=3 (or k=-1)
-                if k == 1: k = 3 
-                elif k == 3: k = 1
-                
-                current_grid = np.rot90(current_grid, k=k)
-            
-            elif "pattern_continuation" in rule_lower:
-                if "horizontal" in rule_lower:
-                    current_grid = ARCPredictor.apply_pattern_continuation_horizontal(current_grid)
-                elif "vertical" in rule_lower:
-                    current_grid = ARCPredictor.apply_pattern_continuation_vertical(current_grid)
-                else:
-                    current_grid = ARCPredictor.apply_pattern_continuation_horizontal(current_grid)
-                    current_grid = ARCPredictor.apply_pattern_continuation_vertical(current_grid)
-
-            elif any(phrase in rule_lower for phrase in ["fit", "same shape", "place pattern", "insert where matches", "shape match"]):
-                 if demo_pair:
-                      pattern = ARCPredictor.extract_pattern_from_demo(np.array(demo_pair["input"]), np.array(demo_pair["output"]))
-                      current_grid = ARCPredictor.apply_shape_fit_place(current_grid, pattern)
-            
-            elif "shape_fit" in rule_lower: # Explicit call for shape fit
-                 if demo_pair:
-                      pattern = ARCPredictor.extract_pattern_from_demo(np.array(demo_pair["input"]), np.array(demo_pair["output"]))
-                      current_grid = ARCPredictor.apply_shape_fit_place(current_grid, pattern)
+            elif op == "rotate":
+                current_grid = np.rot90(current_grid, k=params[0])
+            elif op == "continue_horizontal":
+                current_grid = ARCPredictor.apply_pattern_continuation_horizontal(current_grid)
+            elif op == "continue_vertical":
+                current_grid = ARCPredictor.apply_pattern_continuation_vertical(current_grid)
+            elif op == "shape_fit":
+                if demo_pair:
+                    pattern = ARCPredictor.extract_pattern_from_demo(np.array(demo_pair["input"]), np.array(demo_pair["output"]))
+                    current_grid = ARCPredictor.apply_shape_fit_place(current_grid, pattern)
+        return current_grid
 
-            else:
-                logger.warning("sub_rule_not_implemented", rule=rule_lower)
-                
-        return current_grid.tolist()
+    @staticmethod
+    def _forward_fill(grid: np.ndarray, axis: int) -> np.ndarray:
+        """Carry each nonzero cell forward over the zeros after it along `axis`."""
+        positions = np.arange(grid.shape[axis]).reshape([-1 if a == axis % grid.ndim else 1 for a in range(grid.ndim)])
+        # Index of the last nonzero cell so far (0 before the first one, whose cell is then 0 too)
+        last = np.maximum.accumulate(np.where(grid != 0, positions, 0), axis=axis)
+        return np.take_along_axis(grid, last, axis=axis)
 
     @staticmethod
     def apply_pattern_continuation_horizontal(grid: np.ndarray) -> np.ndarray:
-        new_grid = grid.copy()
-        for i in range(new_grid.shape[0]):
-            row = new_grid[i]
-            last_color = 0
-            for j in range(new_grid.shape[1]):
-                if row[j] != 0:
-                    last_color = row[j]
-                elif last_color != 0:
-                    row[j] = last_color 
-        return new_grid
+        """Fill each row's zeros with the last color to their left; works on (..., H, W) batches."""
+        return ARCPredictor._forward_fill(np.asarray(grid), axis=-1)
 
     @staticmethod
     def apply_pattern_continuation_vertical(grid: np.ndarray) -> np.ndarray:
-        new_grid = grid.copy()
-        for j in range(new_grid.shape[1]):
-            col = new_grid[:, j]
-            last_color = 0
-            for i in range(new_grid.shape[0]):
-                if col[i] != 0:
-                    last_color = col[i]
-                elif last_color != 0:
-                    col[i] = last_color
-        return new_grid
+        """Fill each column's zeros with the last color above them; works on (..., H, W) batches."""
+        return ARCPredictor._forward_fill(np.asarray(grid), axis=-2)
 
     @staticmethod
     def extract_pattern_from_demo(demo_input: np.ndarray, demo_output: np.ndarray) -> np.ndarray:
@@ -149,17 +104,14 @@ class ARCPredictor:
         try:
             obj_slice = find_objects(labeled)[0]  # Take first/main object
             obj = pattern[obj_slice]
-            ph, pw = obj.shape
-            
-            locations = []
             ih, iw = test_input.shape
-            for y in range(ih - ph + 1):
-                for x in range(iw - pw + 1):
-                    slice_grid = test_input[y:y+ph, x:x+pw]
-                    # Fit condition: where pattern has color, test must be empty (0)
-                    if np.all(slice_grid[obj != 0] == 0):
-                        locations.append((y - obj_slice[0].start, x - obj_slice[1].start))  # Adjust for bounding
-            return locations
+            if obj.shape[0] > ih or obj.shape[1] > iw:
+                return []
+            # Fit condition: where pattern has color, test must be empty (0), checked for every window at once
+            windows = np.lib.stride_tricks.sliding_window_view(test_input, obj.shape)
+            fits = ~np.any(windows[..., obj != 0] != 0, axis=-1)
+            # argwhere is row-major: same order as scanning y, then x
+            return [(y - obj_slice[0].start, x - obj_slice[1].start) for y, x in np.argwhere(fits).tolist()]
         except Exception:
             return []
 
@@ -172,26 +124,12 @@ class ARCPredictor:
         if not locations:
             return predicted  # No fit, return unchanged
         
-        # Place in first valid location
-        y_offset, x_offset = 0, 0
-        from scipy.ndimage import label, find_objects
-        
-        labeled, _ = label(pattern != 0)
-        obj_slice = find_objects(labeled)[0]
-        obj = pattern[obj_slice]
-        ph, pw = obj.shape
-        
-        # locations[0] is the top-left of the bounding box relative to test grid
-        # We need to map the full pattern onto test grid using this offset
-        # Actually, find_fit_locations returns the top-left of where the *original pattern array* should start
-        # to align the object correctly.
-        
+        # locations[0] is where the *original pattern array* should start so the object lands in the fit
         y_orig, x_orig = locations[0]
-        # Copy non-zero pixels
-        for r in range(pattern.shape[0]):
-            for c in range(pattern.shape[1]):
-                 if pattern[r, c] != 0:
-                     if 0 <= y_orig + r < predicted.shape[0] and 0 <= x_orig + c < predicted.shape[1]:
-                          predicted[y_orig + r, x_orig + c] = pattern[r, c]
-                          
+        # Copy the pattern's non-zero pixels that land inside the grid
+        rows, cols = np.nonzero(pattern)
+        target_rows, target_cols = rows + y_orig, cols + x_orig
+        inside = (target_rows >= 0) & (target_rows < predicted.shape[0]) & \
+                 (target_cols >= 0) & (target_cols < predicted.shape[1])
+        predicted[target_rows[inside], target_cols[inside]] = pattern[rows[inside], cols[inside]]
         return predicted
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import uuid
+import structlog
+from typing import Any, Optional, Tuple
+
+from AGI.src.bridge.codec import decode_hypotheses, encode_hypotheses
+from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.swarm.comms import MessageBus
+from AGI.src.swarm.resp import RESPConnection
+from AGI.src.swarm.schemas import Hypothesis
+
+logger = structlog.get_logger()
+
+# Wire frame: kind (1 byte) + sender node id (16 bytes) + body
+_KIND_HYPOTHESIS = b"H"
+_KIND_JSON = b"J"
+_NODE_ID_BYTES = 16
+
+def encode_message(node_id: bytes, message: Any) -> bytes:
+    """Hypotheses travel in the binary codec format, anything else as JSON."""
+    if isinstance(message, Hypothesis):
+        return _KIND_HYPOTHESIS + node_id + encode_hypotheses([message])
+    return _KIND_JSON + node_id + json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+def decode_message(data: bytes) -> Tuple[bytes, Any]:
+    """(sender node id, message) from a wire frame."""
+    kind, node_id, body = data[:1], data[1:1 + _NODE_ID_BYTES], data[1 + _NODE_ID_BYTES:]
+    if kind == _KIND_HYPOTHESIS:
+        return node_id, decode_hypotheses(bytearray(body))[0]
+    if kind == _KIND_JSON:
+        return node_id, json.loads(body)
+    raise ValueError(f"Unknown bus message kind: {kind!r}")
+
+class RedisMessageBus(MessageBus):
+    """
+    MessageBus shared across processes and hosts through Redis pub/sub.
+
+    Topics map to channels `<channel_prefix>:<topic>`; every bus with the
+    same prefix joins one swarm. A publish reaches this process's
+    subscribers as on the in-memory bus, then goes out with PUBLISH. A
+    background reader (PSUBSCRIBE on the prefix) delivers other nodes'
+    messages to local callbacks and drops this node's own echoes.
+
+    Works against any RESP server: Redis itself, or `resp.RESPServer` as
+    a local stand-in.
+    """
+    def __init__(self, url: str = None, channel_prefix: str = None, **kwargs):
+        super().__init__(**kwargs)
+        config = DEFAULT_CONFIG.get("bus", {})
+        self.url = url or config.get("redis_url", "redis://localhost:6379/0")
+        self.channel_prefix = channel_prefix or config.get("channel_prefix", "brainv3")
+        self.node_id = uuid.uuid4().bytes
+        self._publisher: Optional[RESPConnection] = None
+        self._subscriber: Optional[RESPConnection] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.sent = 0
+        self.received = 0
+
+    def _channel(self, topic: str) -> str:
+        return f"{self.channel_prefix}:{topic}"
+
+    async def start(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._publisher is not None:
+                return
+            self._subscriber = await RESPConnection.open(self.url)
+            await self._subscriber.send("PSUBSCRIBE", self._channel("*"))
+            await self._subscriber.read()  # subscription confirmation
+            self._publisher = await RESPConnection.open(self.url)
+            self._reader = asyncio.create_task(self._read_loop())
+            logger.info("redis_bus_connected", url=self.url, prefix=self.channel_prefix)
+        await super().start()
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        await super().close()
+        for connection in (self._publisher, self._subscriber):
+            if connection is not None:
+                await connection.close()
+        self._publisher = self._subscriber = None
+
+    async def publish(self, topic: str, message: Any):
+        await super().publish(topic, message)
+        if self._publisher is None:
+            await self.start()
+        await self._publisher.command("PUBLISH", self._channel(topic), encode_message(self.node_id, message))
+        self.sent += 1
+
+    async def _read_loop(self):
+        prefix = self._channel("")
+        try:
+            while True:
+                reply = await self._subscriber.read()
+                if not isinstance(reply, list) or len(reply) != 4 or reply[0] != b"pmessage":
+                    continue
+                channel, data = reply[2].decode("utf-8"), reply[3]
+                try:
+                    node_id, message = decode_message(data)
+                except Exception as e:
+                    logger.warning("bus_message_undecodable", channel=channel, error=str(e))
+                    continue
+                if node_id == self.node_id:
+                    continue
+                self.received += 1
+                try:
+                    await self._deliver(channel[len(prefix):], message)
+                except Exception as e:
+                    logger.error("bus_callback_failed", channel=channel, error=str(e))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.warning("redis_bus_disconnected", error=str(e))
+
+    def stats(self):
+        return {"url": self.url, "prefix": self.channel_prefix, "sent": self.sent, "received": self.received,
+                "topics": super().stats()}
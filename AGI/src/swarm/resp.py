@@ -0,0 +1,190 @@
+"""
+Minimal asyncio client and server for the Redis wire protocol (RESP2).
+
+The client covers what the distributed MessageBus needs (AUTH, PING,
+PUBLISH, PSUBSCRIBE), so no Redis client library is required.
+`RESPServer` is an in-process stand-in with pub/sub only, for tests and
+for running several local processes without a Redis install.
+"""
+import asyncio
+import fnmatch
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+
+Reply = Union[None, int, bytes, str, List[Any]]
+
+class RESPError(Exception):
+    """Error reply from the server."""
+
+def _bulk(value: Union[str, bytes, int]) -> bytes:
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    elif isinstance(value, int):
+        value = str(value).encode("ascii")
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+def encode_command(*args: Union[str, bytes, int]) -> bytes:
+    """A command as a RESP array of bulk strings."""
+    return b"*%d\r\n" % len(args) + b"".join(_bulk(arg) for arg in args)
+
+async def read_reply(reader: asyncio.StreamReader) -> Reply:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body.decode("utf-8")
+    if prefix == b"-":
+        return RESPError(body.decode("utf-8"))
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise RESPError(f"Unknown reply type: {line!r}")
+
+def parse_url(url: str) -> Tuple[str, int, Optional[str]]:
+    """(host, port, password) from redis://[:password@]host[:port][/db]."""
+    parsed = urlparse(url)
+    return parsed.hostname or "localhost", parsed.port or 6379, parsed.password
+
+class RESPConnection:
+    """One connection to a Redis-compatible server."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def open(cls, url: str) -> "RESPConnection":
+        host, port, password = parse_url(url)
+        reader, writer = await asyncio.open_connection(host, port)
+        connection = cls(reader, writer)
+        if password:
+            await connection.command("AUTH", password)
+        return connection
+
+    async def command(self, *args) -> Reply:
+        """Send a command and return its reply (raising RESPError on an error reply)."""
+        async with self._lock:
+            self.writer.write(encode_command(*args))
+            await self.writer.drain()
+            reply = await read_reply(self.reader)
+        if isinstance(reply, RESPError):
+            raise reply
+        return reply
+
+    async def send(self, *args):
+        """Send without waiting for a reply (pub/sub mode pushes replies as messages)."""
+        self.writer.write(encode_command(*args))
+        await self.writer.drain()
+
+    async def read(self) -> Reply:
+        return await read_reply(self.reader)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+class RESPServer:
+    """
+    In-process pub/sub server speaking RESP: PING, ECHO, AUTH/SELECT
+    (accepted and ignored), PUBLISH, SUBSCRIBE, PSUBSCRIBE and their
+    UNSUBSCRIBE counterparts.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self._patterns: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> "RESPServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            for writers in list(self._channels.values()) + list(self._patterns.values()):
+                for writer in writers:
+                    writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "RESPServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @staticmethod
+    def _push(writer: asyncio.StreamWriter, *items):
+        writer.write(encode_command(*items))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_reply(reader)
+                if not isinstance(request, list) or not request:
+                    writer.write(b"-ERR protocol error\r\n")
+                    continue
+                self._dispatch(writer, [r.upper() if i == 0 else r for i, r in enumerate(request)])
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for subscribers in list(self._channels.values()) + list(self._patterns.values()):
+                subscribers.discard(writer)
+            writer.close()
+
+    def _dispatch(self, writer: asyncio.StreamWriter, request: List[bytes]):
+        command, args = request[0], request[1:]
+        if command == b"PING":
+            writer.write(b"+PONG\r\n")
+        elif command == b"ECHO":
+            writer.write(_bulk(args[0]))
+        elif command in (b"AUTH", b"SELECT"):
+            writer.write(b"+OK\r\n")
+        elif command == b"PUBLISH":
+            channel, message = args
+            receivers = 0
+            for subscriber in self._channels.get(channel, ()):
+                self._push(subscriber, b"message", channel, message)
+                receivers += 1
+            for pattern, subscribers in self._patterns.items():
+                if fnmatch.fnmatchcase(channel.decode("utf-8", "replace"), pattern.decode("utf-8", "replace")):
+                    for subscriber in subscribers:
+                        self._push(subscriber, b"pmessage", pattern, channel, message)
+                        receivers += 1
+            writer.write(b":%d\r\n" % receivers)
+        elif command in (b"SUBSCRIBE", b"PSUBSCRIBE"):
+            table = self._channels if command == b"SUBSCRIBE" else self._patterns
+            for name in args:
+                table.setdefault(name, set()).add(writer)
+                count = sum(writer in s for s in self._channels.values()) + \
+                    sum(writer in s for s in self._patterns.values())
+                writer.write(b"*3\r\n" + _bulk(command.lower()) + _bulk(name) + b":%d\r\n" % count)
+        elif command in (b"UNSUBSCRIBE", b"PUNSUBSCRIBE"):
+            table = self._channels if command == b"UNSUBSCRIBE" else self._patterns
+            for name in args or list(table):
+                table.get(name, set()).discard(writer)
+                writer.write(b"*3\r\n" + _bulk(command.lower()) + _bulk(name) + b":0\r\n")
+        else:
+            writer.write(b"-ERR unknown command '%s'\r\n" % command)
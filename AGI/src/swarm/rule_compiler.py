@@ -0,0 +1,132 @@
+"""
+Compiles textual ARC rules into executable plans.
+
+A rule such as "rotation 90, pattern_continuation horizontal" is split into
+atomic rules and each one is matched against the predictor's vocabulary
+once; the result is a plan, a tuple of (op, params) primitives that
+`ARCPredictor.run_plan` executes on NumPy arrays. Plans are memoized per
+rule text in a bounded LRU, so the swarm's repeated verifications of the
+same hypotheses skip the text processing entirely.
+
+Matching mirrors the order the predictor has always used (first match
+wins), so a compiled rule behaves exactly like the interpreted one did.
+"""
+import re
+import threading
+import structlog
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+
+logger = structlog.get_logger()
+
+Op = Tuple[str, Tuple[Any, ...]]
+Plan = Tuple[Op, ...]
+
+_SPLIT = re.compile(r",| including ")
+_FIT_PHRASES = ("fit", "same shape", "place pattern", "insert where matches", "shape match")
+# "90 degrees clockwise" is k=3 for np.rot90, which turns counter-clockwise
+_ROTATIONS = (("90", 3), ("180", 2), ("270", 1))
+
+def _compile_atomic(rule: str) -> Tuple[Tuple[Op, ...], bool]:
+    """(ops, parsed) for one lowercased, stripped atomic rule."""
+    if "identity" in rule:
+        return (), True
+    if "reflection" in rule:
+        if "top" in rule and "bottom" in rule:
+            return (("reflect_rows", ()),), True
+        if "left" in rule and "right" in rule:
+            return (("reflect_cols", ()),), True
+        return (), True
+    if "color_fill" in rule:
+        return (("color_fill", ()),), True
+    if "rotation" in rule:
+        for degrees, k in _ROTATIONS:
+            if degrees in rule:
+                return (("rotate", (k,)),), True
+        return (), True
+    if "pattern_continuation" in rule:
+        if "horizontal" in rule:
+            return (("continue_horizontal", ()),), True
+        if "vertical" in rule:
+            return (("continue_vertical", ()),), True
+        return (("continue_horizontal", ()), ("continue_vertical", ())), True
+    if any(phrase in rule for phrase in _FIT_PHRASES):
+        return (("shape_fit", ()),), True
+    return (), False
+
+def parse_rule(rule_content: str) -> Tuple[Plan, List[str]]:
+    """(plan, atomic rules that matched no primitive) for a rule text."""
+    ops: List[Op] = []
+    unparsed = []
+    for atom in _SPLIT.split(rule_content.lower()):
+        atom = atom.strip()
+        if not atom:
+            continue
+        atom_ops, parsed = _compile_atomic(atom)
+        ops.extend(atom_ops)
+        if not parsed:
+            unparsed.append(atom)
+    return tuple(ops), unparsed
+
+class RuleCompiler:
+    """
+    Bounded LRU of compiled plans keyed by rule text. Atomic rules that
+    match no primitive are skipped by their plan (as the interpreter
+    skipped them), logged once when first compiled, and counted in
+    `unparsed()`.
+    """
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or DEFAULT_CONFIG.get("swarm", {}).get("rule_plan_cache_size", 1024)
+        self._plans: "OrderedDict[str, Plan]" = OrderedDict()
+        self._unparsed: Counter = Counter()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, rule_content: str) -> Plan:
+        with self._lock:
+            plan = self._plans.get(rule_content)
+            if plan is not None:
+                self._plans.move_to_end(rule_content)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan, unparsed = parse_rule(rule_content)
+        for atom in unparsed:
+            logger.warning("sub_rule_not_implemented", rule=atom)
+
+        with self._lock:
+            self._unparsed.update(unparsed)
+            self._plans[rule_content] = plan
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def unparsed(self) -> Dict[str, int]:
+        """Atomic rules that matched no primitive, with how many compiled rules contained them."""
+        with self._lock:
+            return dict(self._unparsed.most_common())
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "plans": len(self._plans),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "unparsed": len(self._unparsed),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+            self._unparsed.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Process-wide instance used by ARCPredictor.apply_rule
+RULE_COMPILER = RuleCompiler()
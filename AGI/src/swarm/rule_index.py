@@ -0,0 +1,126 @@
+import numpy as np
+import structlog
+import torch
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.text_cache import TEXT_CACHE
+
+logger = structlog.get_logger()
+
+def embed_texts(handle, texts: Sequence[str], batch_size: int = 256) -> np.ndarray:
+    """
+    Unit-norm float32 text embeddings (len(texts), D) through the shared
+    text cache, encoded in batches.
+    """
+    chunks = [TEXT_CACHE.encode(handle, list(texts[start:start + batch_size])).cpu().numpy()
+              for start in range(0, len(texts), batch_size)]
+    return np.concatenate(chunks).astype(np.float32) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12)
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iterations: int = 10, sample: int = 64,
+                     seed: int = 0) -> np.ndarray:
+    """
+    Cosine k-means centroids (k, D), trained on at most `sample` points per
+    centroid.
+    """
+    rng = np.random.default_rng(seed)
+    train = vectors
+    if len(vectors) > k * sample:
+        train = vectors[rng.choice(len(vectors), k * sample, replace=False)]
+    centroids = train[rng.choice(len(train), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(train @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, train)
+        empty = np.bincount(assign, minlength=k) == 0
+        # Re-seed empty clusters from random points
+        sums[empty] = train[rng.choice(len(train), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+class RuleVectorIndex:
+    """
+    Nearest-rule search over unit-norm text embeddings.
+
+    Below `exact_threshold` rules the search is an exact matrix-vector
+    product. Above it, an IVF index is built: rules are bucketed by their
+    nearest k-means centroid (about sqrt(n) lists), and a query scans only
+    the `nprobe` closest lists. Rules added after the IVF build sit in an
+    exact-scanned tail until the index is rebuilt.
+    """
+    def __init__(self, exact_threshold: int = None, nprobe: int = None):
+        config = DEFAULT_CONFIG.get("memory", {}).get("index", {})
+        self.exact_threshold = exact_threshold or config.get("exact_threshold", 5000)
+        self.nprobe = nprobe or config.get("nprobe", 8)
+        self.texts: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        # IVF state: rows sorted by list, list boundaries, and the unindexed tail start
+        self.centroids: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._indexed = 0
+        # Rule texts known to RuleMemory but not embedded yet
+        self.pending: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self.rows
+
+    def embedding(self, text: str) -> Optional[np.ndarray]:
+        row = self.rows.get(text)
+        return None if row is None else self.vectors[row]
+
+    def add(self, texts: Sequence[str], embeddings: np.ndarray):
+        fresh = [i for i, t in enumerate(texts) if t not in self.rows]
+        if not fresh:
+            return
+        embeddings = _normalize(np.asarray(embeddings, dtype=np.float32)[fresh])
+        for i in fresh:
+            self.rows[texts[i]] = len(self.texts)
+            self.texts.append(texts[i])
+        self.vectors = embeddings if not len(self.vectors) else np.concatenate([self.vectors, embeddings])
+
+        if self.centroids is None:
+            if len(self) >= self.exact_threshold:
+                self._build_ivf()
+        elif len(self) - self._indexed > max(self._indexed // 10, 1):
+            # Tail has grown past 10% of the indexed rules
+            self._build_ivf()
+
+    def _build_ivf(self):
+        nlist = max(int(np.sqrt(len(self))), 1)
+        self.centroids = spherical_kmeans(self.vectors, nlist)
+        assign = np.argmax(self.vectors @ self.centroids.T, axis=1)
+        self._order = np.argsort(assign, kind="stable")
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))])
+        self._indexed = len(self)
+        logger.info("rule_index_built", rules=len(self), lists=nlist)
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        probe = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        parts = [self._order[self._offsets[c]:self._offsets[c + 1]] for c in probe]
+        parts.append(np.arange(self._indexed, len(self)))
+        return np.concatenate(parts)
+
+    def search(self, query, k: int = 5) -> List[Tuple[str, float]]:
+        """The k rules most similar to `query`, as (text, cosine) best first."""
+        if not len(self) or k <= 0:
+            return []
+        if isinstance(query, torch.Tensor):
+            query = query.detach().cpu().numpy()
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+
+        candidates = None if self.centroids is None else self._candidates(query)
+        matrix = self.vectors if candidates is None else self.vectors[candidates]
+        scores = matrix @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return [(self.texts[r], float(s)) for r, s in zip(rows, scores[top])]
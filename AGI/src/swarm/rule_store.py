@@ -0,0 +1,348 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import structlog
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+
+logger = structlog.get_logger()
+
+# Weight policy shared by every backend
+SUCCESS_BOOST = 0.5
+MAX_WEIGHT = 2.0
+DECAY_STEP = 0.01
+MIN_WEIGHT = 0.3
+
+BACKENDS = ("json", "sqlite")
+
+class RuleStore(ABC):
+    """
+    Persistence backend for RuleMemory. RuleMemory keeps the in-memory
+    indexes; the store owns durable state and applies mutations so a
+    backend can make them atomic across processes.
+    """
+    @abstractmethod
+    def load(self) -> List[Dict]:
+        """All rules in insertion order."""
+
+    @abstractmethod
+    def record_success(self, text: str, current: Optional[Dict], now: str) -> Dict:
+        """Apply one success to `text` and return the rule's new state."""
+
+    @abstractmethod
+    def decay(self, used: Set[str], rules: List[Dict]) -> List[Dict]:
+        """Decay every rule not in `used`; returns the resulting rules list."""
+
+    @abstractmethod
+    def get_hint(self) -> Optional[Dict[str, Any]]:
+        """Latest human hint as {"hint", "timestamp"[, "solution"]}, or None."""
+
+    @abstractmethod
+    def set_hint(self, text: str, solution: Optional[List[List[int]]] = None):
+        pass
+
+    def maybe_flush(self):
+        """Called after each change has been applied in memory; flush if a batch is due."""
+        pass
+
+    def flush(self):
+        pass
+
+    def compact(self):
+        pass
+
+    def close(self):
+        pass
+
+def _boosted(current: Optional[Dict], text: str, now: str) -> Dict:
+    if current is None:
+        return {"text": text, "weight": 1.0, "success_count": 1, "last_used": now}
+    return dict(current, success_count=current.get("success_count", 0) + 1,
+                weight=min(MAX_WEIGHT, current.get("weight", 1.0) + SUCCESS_BOOST), last_used=now)
+
+def _decay_in_place(rules: List[Dict], used: Set[str]):
+    for rule in rules:
+        if rule["text"] not in used:
+            rule["weight"] = max(MIN_WEIGHT, rule.get("weight", 1.0) - DECAY_STEP)
+
+class JournalRuleStore(RuleStore):
+    """
+    JSON snapshot plus a write-behind journal.
+
+    Changes are appended as JSON lines to `<storage_path>.journal` in fsync'd
+    batches, and the journal is compacted into the snapshot file once it
+    grows past `compact_bytes`. Loading replays the journal over the
+    snapshot; ops carry a sequence number so a crash between compaction and
+    journal removal never applies an op twice. Single-writer only.
+    """
+    def __init__(self, storage_path: str):
+        config = DEFAULT_CONFIG.get("memory", {}).get("journal", {})
+        self.storage_path = storage_path
+        self.journal_path = f"{storage_path}.journal"
+        self.hints_path = os.path.join(os.path.dirname(storage_path), "hints.json")
+        self.fsync_every = config.get("fsync_every", 32)
+        self.fsync_interval_seconds = config.get("fsync_interval_seconds", 5.0)
+        self.compact_bytes = config.get("compact_bytes", 1048576)
+        self._rules: List[Dict] = []
+        self._seq = 0
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def load(self) -> List[Dict]:
+        rules: List[Dict] = []
+        if os.path.exists(self.storage_path):
+            with open(self.storage_path, 'r') as f:
+                try:
+                    data = json.load(f)
+                    # Support legacy dict format if it exists, or the new list format
+                    if isinstance(data, dict) and "rules" not in data:
+                        # Convert legacy Dict[str, float] to List[Dict]
+                        rules = [
+                            {
+                                "text": text,
+                                "weight": weight,
+                                "success_count": int(weight * 2), # Heuristic conversion
+                                "last_used": datetime.now().isoformat()
+                            }
+                            for text, weight in data.items()
+                        ]
+                    else:
+                        rules = data.get("rules", [])
+                        self._seq = data.get("seq", 0)
+                except Exception as e:
+                    logger.error("memory_load_failed", error=str(e))
+
+        self._rules = rules
+        self._replay_journal()
+        return self._rules
+
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        by_text = {}
+        for rule in self._rules:
+            by_text.setdefault(rule["text"], rule)
+        replayed = 0
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    # Torn final write from a crash; everything before it is intact
+                    logger.warning("memory_journal_truncated", path=self.journal_path)
+                    break
+                if op["seq"] <= self._seq:
+                    continue  # already in the snapshot
+                if op["op"] == "upsert":
+                    rule = op["rule"]
+                    if rule["text"] in by_text:
+                        by_text[rule["text"]].update(rule)
+                    else:
+                        self._rules.append(rule)
+                        by_text[rule["text"]] = rule
+                elif op["op"] == "decay":
+                    _decay_in_place(self._rules, set(op["used"]))
+                self._seq = op["seq"]
+                replayed += 1
+        logger.debug("memory_journal_replayed", ops=replayed)
+
+    def _log(self, op: str, **fields: Any):
+        """Queue a journal entry; `maybe_flush` appends them in fsync'd batches."""
+        self._seq += 1
+        self._pending.append(json.dumps(dict(fields, op=op, seq=self._seq)))
+
+    def maybe_flush(self):
+        # Deferred until RuleMemory has applied the change, so a compaction
+        # triggered here snapshots it along with its sequence number
+        if len(self._pending) >= self.fsync_every or \
+                time.monotonic() - self._last_flush >= self.fsync_interval_seconds:
+            self.flush()
+
+    def record_success(self, text: str, current: Optional[Dict], now: str) -> Dict:
+        rule = _boosted(current, text, now)
+        self._log("upsert", rule=rule)
+        return rule
+
+    def decay(self, used: Set[str], rules: List[Dict]) -> List[Dict]:
+        self._rules = rules
+        _decay_in_place(rules, used)
+        # Only texts that exist matter for replay
+        self._log("decay", used=sorted(used & {r["text"] for r in rules}))
+        return rules
+
+    def flush(self):
+        """Append pending changes to the journal and fsync; compact if it has grown too large."""
+        if self._pending:
+            os.makedirs(os.path.dirname(self.storage_path) or ".", exist_ok=True)
+            with open(self.journal_path, 'a') as f:
+                f.write("\n".join(self._pending) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending = []
+        self._last_flush = time.monotonic()
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) >= self.compact_bytes:
+            self.compact()
+
+    def compact(self):
+        """Write the full state to the snapshot file atomically and drop the journal."""
+        os.makedirs(os.path.dirname(self.storage_path) or ".", exist_ok=True)
+        tmp = f"{self.storage_path}.tmp{os.getpid()}"
+        with open(tmp, 'w') as f:
+            json.dump({"rules": self._rules, "seq": self._seq}, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.storage_path)
+        self._pending = []
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        logger.info("memory_compacted", rules=len(self._rules), seq=self._seq)
+
+    def get_hint(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.hints_path):
+            return None
+        try:
+            with open(self.hints_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error("hints_load_failed", error=str(e))
+            return None
+        return data if data.get("hint") else None
+
+    def set_hint(self, text: str, solution: Optional[List[List[int]]] = None):
+        data = {"hint": text, "timestamp": datetime.now().isoformat()}
+        if solution:
+            data["solution"] = solution
+        os.makedirs(os.path.dirname(self.hints_path) or ".", exist_ok=True)
+        tmp = f"{self.hints_path}.tmp{os.getpid()}"
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.hints_path)
+
+class SQLiteRuleStore(RuleStore):
+    """
+    Rules and hints in a SQLite database in WAL mode, so many readers can
+    run alongside a writer and several swarm processes can share one memory.
+    Successes are a single atomic upsert and decay a single UPDATE, so
+    concurrent writers never lose each other's changes.
+
+    An empty database is seeded from the JSON snapshot and hints.json at
+    `seed_path`, if present.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL UNIQUE,
+            weight REAL NOT NULL DEFAULT 1.0,
+            success_count INTEGER NOT NULL DEFAULT 0,
+            last_used TEXT
+        );
+        CREATE INDEX IF NOT EXISTS rules_weight ON rules(weight);
+        CREATE INDEX IF NOT EXISTS rules_last_used ON rules(last_used);
+        CREATE TABLE IF NOT EXISTS hints (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            solution TEXT,
+            created_at TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: str, seed_path: Optional[str] = None, timeout: float = 30.0):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Autocommit: every statement is its own transaction unless we BEGIN one
+        self._conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        if seed_path:
+            self._seed(seed_path)
+
+    def _seed(self, seed_path: str):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                has_rules = self._conn.execute("SELECT 1 FROM rules LIMIT 1").fetchone()
+                has_hints = self._conn.execute("SELECT 1 FROM hints LIMIT 1").fetchone()
+                seed = JournalRuleStore(seed_path)
+                if not has_rules and os.path.exists(seed_path):
+                    rules = seed.load()
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO rules (text, weight, success_count, last_used) VALUES (?, ?, ?, ?)",
+                        [(r["text"], r.get("weight", 1.0), r.get("success_count", 0), r.get("last_used")) for r in rules])
+                    logger.info("rule_store_seeded", source=seed_path, rules=len(rules))
+                hint = None if has_hints else seed.get_hint()
+                if hint:
+                    self._conn.execute("INSERT INTO hints (text, solution, created_at) VALUES (?, ?, ?)",
+                                       (hint["hint"], json.dumps(hint.get("solution")), datetime.now().isoformat()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT text, weight, success_count, last_used FROM rules ORDER BY id").fetchall()
+        return [{"text": t, "weight": w, "success_count": c, "last_used": u} for t, w, c, u in rows]
+
+    def record_success(self, text: str, current: Optional[Dict], now: str) -> Dict:
+        # Increment in SQL rather than writing back our (possibly stale) copy
+        with self._lock:
+            weight, count, last_used = self._conn.execute(
+                """
+                INSERT INTO rules (text, weight, success_count, last_used) VALUES (?, 1.0, 1, ?)
+                ON CONFLICT(text) DO UPDATE SET
+                    success_count = success_count + 1,
+                    weight = MIN(?, weight + ?),
+                    last_used = excluded.last_used
+                RETURNING weight, success_count, last_used
+                """, (text, now, MAX_WEIGHT, SUCCESS_BOOST)).fetchone()
+        return {"text": text, "weight": weight, "success_count": count, "last_used": last_used}
+
+    def decay(self, used: Set[str], rules: List[Dict]) -> List[Dict]:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE rules SET weight = MAX(?, weight - ?) WHERE text NOT IN (SELECT value FROM json_each(?))",
+                (MIN_WEIGHT, DECAY_STEP, json.dumps(sorted(used))))
+        # Pick up other writers' changes along with ours
+        return self.load()
+
+    def get_hint(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, solution, created_at FROM hints ORDER BY id DESC LIMIT 1").fetchone()
+        if row is None:
+            return None
+        hint = {"hint": row[0], "timestamp": row[2]}
+        solution = json.loads(row[1]) if row[1] else None
+        if solution:
+            hint["solution"] = solution
+        return hint
+
+    def set_hint(self, text: str, solution: Optional[List[List[int]]] = None):
+        with self._lock:
+            self._conn.execute("INSERT INTO hints (text, solution, created_at) VALUES (?, ?, ?)",
+                               (text, json.dumps(solution) if solution else None, datetime.now().isoformat()))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def create_rule_store(storage_path: str, backend: Optional[str] = None) -> RuleStore:
+    """
+    Build the configured backend (`memory.backend`). The SQLite database sits
+    next to the JSON snapshot, e.g. rule_memory.json -> rule_memory.db.
+    """
+    backend = backend or DEFAULT_CONFIG.get("memory", {}).get("backend", "json")
+    if backend == "json":
+        return JournalRuleStore(storage_path)
+    if backend == "sqlite":
+        return SQLiteRuleStore(os.path.splitext(storage_path)[0] + ".db", seed_path=storage_path)
+    raise ValueError(f"Unknown rule memory backend: {backend} (expected one of {BACKENDS})")
@@ -0,0 +1,135 @@
+import asyncio
+import time
+import structlog
+from pydantic import BaseModel, Field
+from typing import Any, Awaitable, Callable, Dict, List
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+
+logger = structlog.get_logger()
+
+class IterationReport(BaseModel):
+    """Outcome of one scheduled iteration, by job name."""
+    completed: List[str] = Field(default_factory=list)
+    failed: List[str] = Field(default_factory=list)
+    stragglers: List[str] = Field(default_factory=list)
+    skipped: List[str] = Field(default_factory=list)
+    seconds: float = 0.0
+
+class IterationScheduler:
+    """
+    Deadline-based iteration stepping with straggler tolerance.
+
+    Every job (normally one agent's reasoning step) starts as its own task,
+    and the iteration waits with `asyncio.wait` until all are done or the
+    deadline passes. Finished jobs keep their results. A job still running
+    at the deadline is not cancelled: it carries on into the next iteration,
+    where no new step starts for it until it finishes. Iteration latency is
+    therefore bounded by the deadline, not by the slowest agent.
+
+    Per-job latency is tracked as an exponential moving average. A job that
+    misses `skip_after_misses` deadlines in a row sits out the next
+    `skip_iterations` iterations.
+    """
+    def __init__(self, deadline_seconds: float = None, skip_after_misses: int = None,
+                 skip_iterations: int = None, latency_alpha: float = 0.3):
+        swarm_config = DEFAULT_CONFIG.get("swarm", {})
+        config = swarm_config.get("scheduler", {})
+        self.deadline_seconds = deadline_seconds or swarm_config.get("agent_timeout_seconds", 5.0)
+        self.skip_after_misses = config.get("skip_after_misses", 3) if skip_after_misses is None else skip_after_misses
+        self.skip_iterations = config.get("skip_iterations", 2) if skip_iterations is None else skip_iterations
+        self.latency_alpha = latency_alpha
+
+        self.iteration = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._benched_until: Dict[str, int] = {}
+        self.latency: Dict[str, float] = {}
+        self.misses: Dict[str, int] = {}
+        self.completed: Dict[str, int] = {}
+
+    def _record(self, name: str, started: float, task: asyncio.Task):
+        # Runs when the job finishes, which may be iterations after it started
+        if self._inflight.get(name) is task:
+            del self._inflight[name]
+        if task.cancelled():
+            return
+        elapsed = time.perf_counter() - started
+        previous = self.latency.get(name)
+        self.latency[name] = elapsed if previous is None else \
+            previous + self.latency_alpha * (elapsed - previous)
+        self.completed[name] = self.completed.get(name, 0) + 1
+        error = task.exception()
+        if error is not None:
+            logger.error("agent_unhandled_error", job=name, error=str(error))
+
+    def _start(self, name: str, job: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.ensure_future(job())
+        task.add_done_callback(lambda t, started=time.perf_counter(): self._record(name, started, t))
+        self._inflight[name] = task
+        return task
+
+    async def run_iteration(self, jobs: Dict[str, Callable[[], Awaitable[Any]]]) -> IterationReport:
+        """
+        Start `jobs` (name -> coroutine factory) and wait up to the deadline.
+        Jobs still running from an earlier iteration are waited on instead of
+        being started again.
+        """
+        start = time.perf_counter()
+        report = IterationReport()
+        waiting: Dict[asyncio.Task, str] = {}
+        for name, job in jobs.items():
+            if self._benched_until.get(name, -1) >= self.iteration:
+                report.skipped.append(name)
+                continue
+            task = self._inflight.get(name) or self._start(name, job)
+            waiting[task] = name
+
+        if waiting:
+            done, pending = await asyncio.wait(list(waiting), timeout=self.deadline_seconds)
+        else:
+            done, pending = set(), set()
+
+        for task in done:
+            name = waiting[task]
+            self.misses[name] = 0
+            if task.cancelled() or task.exception() is not None:
+                report.failed.append(name)
+            else:
+                report.completed.append(name)
+        for task in pending:
+            name = waiting[task]
+            report.stragglers.append(name)
+            self.misses[name] = self.misses.get(name, 0) + 1
+            if self.skip_after_misses and self.misses[name] >= self.skip_after_misses:
+                # Chronically slow: once its current step lands, let it sit out a few iterations
+                self._benched_until[name] = self.iteration + self.skip_iterations
+                self.misses[name] = 0
+                logger.warning("agent_benched", job=name, iterations=self.skip_iterations)
+
+        if report.stragglers:
+            logger.warning("agent_deadline_missed", step=self.iteration, stragglers=len(report.stragglers),
+                           deadline=self.deadline_seconds)
+        report.seconds = time.perf_counter() - start
+        self.iteration += 1
+        return report
+
+    async def finish(self, grace_seconds: float = 0.0):
+        """Give in-flight stragglers `grace_seconds` to land, then cancel the rest."""
+        tasks = list(self._inflight.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=grace_seconds) if grace_seconds > 0 else (set(), set(tasks))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "latency_ms": round(self.latency.get(name, 0.0) * 1000, 2),
+                "completed": self.completed.get(name, 0),
+                "consecutive_misses": self.misses.get(name, 0),
+                "in_flight": name in self._inflight,
+            }
+            for name in sorted(set(self.latency) | set(self.misses) | set(self._inflight))
+        }
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+from AGI.src.swarm.predictor import ARCPredictor
+
+Grid = List[List[int]]
+
+def grid_hash(grid: Optional[Any]) -> str:
+    """Fingerprint of a grid's shape and cell values."""
+    if grid is None:
+        return "none"
+    array = np.ascontiguousarray(np.asarray(grid, dtype=np.int64))
+    digest = hashlib.blake2b(array.tobytes(), digest_size=16)
+    digest.update(str(array.shape).encode("ascii"))
+    return digest.hexdigest()
+
+def demo_hash(demo_pair: Optional[Dict[str, Any]]) -> str:
+    if not demo_pair:
+        return "none"
+    return f"{grid_hash(demo_pair.get('input'))}:{grid_hash(demo_pair.get('output'))}"
+
+class _Entry:
+    __slots__ = ("predicted", "error", "matches")
+
+    def __init__(self, predicted: Optional[Grid], error: Optional[Exception]):
+        self.predicted = predicted
+        self.error = error
+        self.matches: Dict[str, bool] = {}
+
+class VerificationCache:
+    """
+    Bounded LRU memo of `ARCPredictor.apply_rule` keyed by
+    (normalized rule text, input grid hash, demo pair hash). Each entry keeps
+    the predicted grid (or the error the rule raised) and the match result
+    against each expected output it was checked against.
+
+    apply_rule lowercases and strips its input, so normalizing the key the
+    same way never merges rules that would execute differently.
+    """
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or DEFAULT_CONFIG.get("swarm", {}).get("verification_cache_size", 4096)
+        self._entries: "OrderedDict[Tuple[str, str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(rule: str, input_grid: Grid, demo_pair: Optional[Dict[str, Any]] = None) -> Tuple[str, str, str]:
+        return (rule.lower().strip(), grid_hash(input_grid), demo_hash(demo_pair))
+
+    def _entry(self, rule: str, input_grid: Grid, demo_pair: Optional[Dict[str, Any]]) -> _Entry:
+        key = self.make_key(rule, input_grid, demo_pair)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        try:
+            entry = _Entry(ARCPredictor.apply_rule(rule, input_grid, demo_pair=demo_pair), None)
+        except Exception as e:
+            entry = _Entry(None, e)
+
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def predict(self, rule: str, input_grid: Grid, demo_pair: Optional[Dict[str, Any]] = None) -> Grid:
+        """Cached `ARCPredictor.apply_rule`; re-raises the rule's error if it failed."""
+        entry = self._entry(rule, input_grid, demo_pair)
+        if entry.error is not None:
+            raise entry.error
+        # Hand out a copy so callers can't edit the cached grid
+        return [list(row) for row in entry.predicted]
+
+    def verify(self, rule: str, input_grid: Grid, expected: Grid, demo_pair: Optional[Dict[str, Any]] = None) -> bool:
+        """True if the rule maps `input_grid` to `expected`. Rules that raise never match."""
+        entry = self._entry(rule, input_grid, demo_pair)
+        if entry.error is not None:
+            return False
+        expected_key = grid_hash(expected)
+        match = entry.matches.get(expected_key)
+        if match is None:
+            match = entry.matches[expected_key] = entry.predicted == expected
+        return match
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Process-wide instance for callers outside a Swarm (e.g. the HITL server)
+VERIFICATION_CACHE = VerificationCache()
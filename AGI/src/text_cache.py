@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+import numpy as np
+import structlog
+import torch
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from AGI.src.config_loader import DEFAULT_CONFIG
+
+logger = structlog.get_logger()
+
+class TextEmbeddingCache:
+    """
+    Process-wide LRU of normalized CLIP text embeddings keyed by
+    (model, text). The prompt bank is small and fixed, so after the first
+    iteration almost every lookup is a hit. Misses in one call are encoded
+    together in a single text-tower pass.
+
+    With a `path`, entries are loaded on first use and written back by `save()`.
+    """
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[Tuple[str, str], torch.Tensor]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = path is None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def model_key(handle: Any) -> str:
+        return f"{handle.model_name}@{handle.dtype}"
+
+    def encode(self, handle: Any, texts: List[str]) -> torch.Tensor:
+        """Unit-norm float32 embeddings (len(texts), D) on the handle's device."""
+        model = self.model_key(handle)
+        with self._lock:
+            self._load()
+            rows: List[Optional[torch.Tensor]] = []
+            missing: List[str] = []
+            for text in texts:
+                row = self._entries.get((model, text))
+                if row is None:
+                    missing.append(text)
+                else:
+                    self._entries.move_to_end((model, text))
+                rows.append(row)
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            unique = list(dict.fromkeys(missing))
+            features = handle.text_features(unique).detach().cpu()
+            features = features / features.norm(dim=-1, keepdim=True).clamp_min(1e-12)
+            encoded = dict(zip(unique, features))
+            with self._lock:
+                for text, row in encoded.items():
+                    self._entries[(model, text)] = row
+                    self._entries.move_to_end((model, text))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            rows = [encoded[text] if row is None else row for text, row in zip(texts, rows)]
+
+        return torch.stack(rows).to(handle.device)
+
+    def _load(self):
+        # Called with the lock held
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                index = json.loads(str(data["index"]))
+                for i, (model, text) in enumerate(index):
+                    self._entries[(model, text)] = torch.from_numpy(data[f"e{i}"].copy())
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("text_cache_load_failed", path=self.path, error=str(e))
+        logger.info("text_cache_loaded", path=self.path, entries=len(self._entries))
+
+    def save(self):
+        """Persist entries to `path` (no-op without one). Written atomically."""
+        if self.path is None:
+            return
+        with self._lock:
+            self._load()
+            items = list(self._entries.items())
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        arrays = {f"e{i}": row.numpy() for i, (_, row) in enumerate(items)}
+        index = np.array(json.dumps([list(key) for key, _ in items]))
+        tmp = f"{self.path}.tmp{os.getpid()}.npz"
+        np.savez(tmp, index=index, **arrays)
+        os.replace(tmp, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "path": self.path,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+def _from_config() -> TextEmbeddingCache:
+    config = DEFAULT_CONFIG.get("text_cache", {})
+    path = config.get("path") if config.get("persist", False) else None
+    return TextEmbeddingCache(max_entries=config.get("max_entries", 4096), path=path)
+
+# Global cache instance shared by agents, the swarm and the HITL server
+TEXT_CACHE = _from_config()
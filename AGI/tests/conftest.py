@@ -0,0 +1,57 @@
+import os
+import shutil
+import pytest
+import torch
+from transformers import BatchEncoding, CLIPConfig, CLIPImageProcessor, CLIPModel
+from AGI.src.model_registry import ModelHandle
+
+class TinyProcessor:
+    """
+    Stand-in for CLIPProcessor: real image preprocessing, plus a toy word-hash
+    tokenizer so text features work without downloading a vocabulary.
+    """
+    def __init__(self):
+        self.image_processor = CLIPImageProcessor()
+
+    def __call__(self, images=None, text=None, return_tensors="pt", padding=True):
+        if images is not None:
+            return self.image_processor(images=images, return_tensors=return_tensors)
+        ids = [[sum(map(ord, word)) % 997 + 1 for word in t.lower().split()][:16] for t in text]
+        width = max(len(row) for row in ids)
+        input_ids = torch.tensor([row + [0] * (width - len(row)) for row in ids])
+        attention_mask = (input_ids != 0).long()
+        return BatchEncoding({"input_ids": input_ids, "attention_mask": attention_mask})
+
+def make_tiny_handle(name: str = "tiny-clip") -> ModelHandle:
+    """A randomly initialised miniature CLIP so tests never download weights."""
+    torch.manual_seed(0)
+    config = CLIPConfig(
+        text_config=dict(hidden_size=32, intermediate_size=64, num_hidden_layers=1,
+                         num_attention_heads=2, vocab_size=1000, max_position_embeddings=77),
+        vision_config=dict(hidden_size=32, intermediate_size=64, num_hidden_layers=1,
+                           num_attention_heads=2, image_size=224, patch_size=32),
+        projection_dim=16,
+    )
+    return ModelHandle(name, "cpu", model=CLIPModel(config).eval(), processor=TinyProcessor())
+
+@pytest.fixture
+def tiny_handle():
+    return make_tiny_handle()
+
+@pytest.fixture
+def isolated_memory(tmp_path, monkeypatch):
+    """
+    Point RuleMemory's default storage at a copy of the project's rules and
+    hints under tmp_path, so swarm runs never write to AGI/data.
+    """
+    from AGI.src.swarm import memory
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    source_dir = os.path.dirname(memory.DEFAULT_STORAGE_PATH)
+    for name in ("rule_memory.json", "hints.json"):
+        if os.path.exists(os.path.join(source_dir, name)):
+            shutil.copy(os.path.join(source_dir, name), data_dir / name)
+    path = str(data_dir / "rule_memory.json")
+    monkeypatch.setattr(memory, "DEFAULT_STORAGE_PATH", path)
+    return path
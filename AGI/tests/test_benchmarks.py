@@ -4,19 +4,22 @@ from AGI.src.swarm.core import Swarm
 from typing import List, Optional, Dict, Any
 from AGI.src.bridge.schemas import AgentToken
 from AGI.src.swarm.agent import OmnidirectionalAgent
+from AGI.src.swarm.schemas import Hypothesis
+
+# Swarm runs read and write rule memory; keep them off the project's AGI/data
+pytestmark = pytest.mark.usefixtures("isolated_memory")
 
 class LogicPuzzleAgent(OmnidirectionalAgent):
     """
     Subclass of agent that 'solves' a simple logic puzzle by finding a specific keyword.
     """
-    async def propose_hypothesis(self, context: str) -> Any:
-        h = await super().propose_hypothesis(context)
-        # If this agent 'sees' a certain token, it might increase the score
-        for token in self.memory:
-            if "clue" in token.token_id:
-                h.score = 0.99
-                h.content = "Solved: The clue was found."
-        return h
+    async def generate_candidate(self, context: str) -> List[Hypothesis]:
+        candidates = await super().generate_candidate(context)
+        # If this agent 'sees' a certain token, its best candidate becomes the solution
+        if candidates and any("clue" in token_id for token_id in self.memory.token_ids):
+            candidates[0].score = 0.99
+            candidates[0].content = "Solved: The clue was found."
+        return candidates
 
 @pytest.mark.asyncio
 async def test_logic_puzzle_benchmark():
@@ -46,9 +49,9 @@ async def test_agent_timeout_safeguard():
     Test that the swarm continues if an agent hangs.
     """
     class SlowAgent(OmnidirectionalAgent):
-        async def propose_hypothesis(self, context: str):
+        async def generate_candidate(self, context: str):
             await asyncio.sleep(10) # Longer than timeout
-            return await super().propose_hypothesis(context)
+            return await super().generate_candidate(context)
             
     swarm = Swarm(num_agents=2)
     swarm.timeout = 0.1 # short timeout for test
@@ -24,3 +24,42 @@ def test_translate_batch():
     assert len(tokens) == 2
     assert tokens[0].token_id == "token_s1"
     assert tokens[1].token_id == "token_s2"
+
+def test_token_batch_is_columnar():
+    import numpy as np
+    from AGI.src.bridge.batch import TokenBatch
+    segments = [VisualSegment(segment_id=f"s{i}", embedding=[float(i)] * 4, metadata={"i": i}) for i in range(3)]
+    batch = Bridge.translate_batch(segments)
+    assert isinstance(batch, TokenBatch)
+    assert batch.vectors.shape == (3, 4) and batch.vectors.dtype == np.float32
+
+    # Zero-copy tensor view of the whole matrix
+    tensor = batch.tensor()
+    assert tensor.data_ptr() == batch.vectors.ctypes.data
+    assert batch.tensor([2, 0])[:, 0].tolist() == [2.0, 0.0]
+
+    # Compatibility view
+    tokens = batch.to_tokens()
+    assert [t.token_id for t in tokens] == ["token_s0", "token_s1", "token_s2"]
+    assert tokens[1].vector == [1.0] * 4 and tokens[1].metadata == {"i": 1}
+    assert TokenBatch.from_tokens(tokens).token_ids == batch.token_ids
+
+def test_token_batch_float16_storage():
+    import numpy as np
+    import torch
+    from AGI.src.bridge.batch import TokenBatch
+    segments = [VisualSegment(segment_id=f"s{i}", embedding=[0.5 * i, 1.0]) for i in range(2)]
+    batch = Bridge.translate_batch(segments, dtype="float16")
+    assert batch.vectors.dtype == np.float16
+    assert batch.tensor().dtype == torch.float32
+
+    merged = TokenBatch.concat([batch, Bridge.translate_batch(segments)])
+    assert len(merged) == 4 and merged.vectors.dtype == np.float32
+
+def test_empty_input_translates_to_empty_batch():
+    from AGI.src.bridge.batch import TokenBatch
+    # e.g. an all-background grid yields no segments
+    batch = Bridge.translate_batch([])
+    assert len(batch) == 0 and batch.vectors.shape == (0, 0) and batch.to_tokens() == []
+    assert len(TokenBatch.from_tokens([])) == 0
+    assert len(TokenBatch.concat([batch, Bridge.translate_batch([VisualSegment(segment_id="s1", embedding=[0.1])])])) == 1
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from AGI.src.bridge import codec
+from AGI.src.bridge.batch import TokenBatch
+from AGI.src.bridge.schemas import VisualSegment
+from AGI.src.swarm.schemas import Hypothesis
+
+def test_segments_round_trip():
+    segments = [
+        VisualSegment(segment_id=f"s{i}", embedding=np.linspace(0, 1, 512).astype(np.float32).tolist(),
+                      metadata={"position_normalized": {"x": 0.25, "y": np.float64(0.5)}, "area": np.int64(3)})
+        for i in range(5)
+    ]
+    buf = codec.encode_segments(segments)
+    assert codec.peek_kind(buf) == codec.KIND_SEGMENTS
+    decoded = codec.decode_segments(buf)
+    assert [s.segment_id for s in decoded] == [s.segment_id for s in segments]
+    assert decoded[2].embedding == segments[2].embedding
+    assert decoded[0].metadata == {"position_normalized": {"x": 0.25, "y": 0.5}, "area": 3}
+    # Raw float32 block instead of text: ~4 bytes per value
+    assert len(buf) < 5 * 512 * 4 + 1024
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float16])
+def test_tokens_round_trip_zero_copy(dtype):
+    rng = np.random.default_rng(0)
+    batch = TokenBatch(rng.standard_normal((7, 16)).astype(dtype), [f"t{i}" for i in range(7)],
+                       context_refs=[f"s{i}" for i in range(7)], metadata=[{"i": i} for i in range(7)])
+    buf = bytearray(codec.encode_tokens(batch))
+    decoded = codec.decode_tokens(buf)
+
+    assert decoded.token_ids == batch.token_ids
+    assert decoded.context_refs == batch.context_refs
+    assert decoded.metadata == batch.metadata
+    assert decoded.vectors.dtype == dtype
+    assert np.array_equal(decoded.vectors, batch.vectors)
+    assert np.array_equal(decoded.timestamps, batch.timestamps)
+    # The decoded matrix is a view into the buffer, not a copy
+    assert np.shares_memory(decoded.vectors, np.frombuffer(buf, dtype=np.uint8))
+
+def test_tokens_file_round_trip(tmp_path):
+    batch = TokenBatch(np.ones((3, 4), dtype=np.float32), ["a", "b", "c"])
+    path = str(tmp_path / "tokens.brv3")
+    codec.write_file(path, codec.encode_tokens(batch.to_tokens()))
+    decoded = codec.decode_tokens(codec.read_file(path))
+    assert decoded.tensor().sum().item() == 12.0
+
+def test_empty_batches_round_trip():
+    assert codec.decode_segments(codec.encode_segments([])) == []
+    decoded = codec.decode_tokens(codec.encode_tokens([]))
+    assert len(decoded) == 0 and decoded.vectors.shape == (0, 0)
+    decoded = codec.decode_tokens(bytearray(codec.encode_tokens(TokenBatch.empty(16, dtype=np.float16))))
+    assert decoded.vectors.shape == (0, 16) and decoded.vectors.dtype == np.float16
+
+def test_hypotheses_round_trip():
+    hyps = [Hypothesis(hypothesis_id=f"h{i}", content=f"rule {i}", score=0.1 * i, agent_id="a1",
+                       evidence=["e1", "e2"], iteration=i, metadata={"clip_raw_score": None})
+            for i in range(4)]
+    decoded = codec.decode_hypotheses(codec.encode_hypotheses(hyps))
+    assert [h.model_dump() for h in decoded] == [h.model_dump() for h in hyps]
+
+def test_rejects_wrong_kind():
+    buf = codec.encode_hypotheses([])
+    with pytest.raises(codec.CodecError):
+        codec.decode_tokens(buf)
+    with pytest.raises(codec.CodecError):
+        codec.decode_tokens(b"nope" + bytes(16))
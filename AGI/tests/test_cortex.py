@@ -0,0 +1,171 @@
+import pytest
+import numpy as np
+import torch
+from PIL import Image
+from AGI.src.cortex.cortex import CLIPVisualCortex
+from AGI.src.cortex.cache import EmbeddingCache
+from AGI.src.model_registry import ModelRegistry
+
+def make_tiny_cortex(handle, batch_size: int = 64, cache: EmbeddingCache = None) -> CLIPVisualCortex:
+    cortex = CLIPVisualCortex(batch_size=batch_size, handle=handle)
+    cortex.cache = cache  # never touch the shared on-disk cache from tests
+    return cortex
+
+@pytest.fixture
+def image_paths(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(2):
+        path = tmp_path / f"img_{i}.png"
+        Image.fromarray(rng.integers(0, 255, (64, 96, 3), dtype=np.uint8)).save(path)
+        paths.append(str(path))
+    return paths
+
+def test_batched_matches_per_patch(image_paths, tiny_handle):
+    cortex = make_tiny_cortex(tiny_handle, batch_size=16)
+    image = Image.open(image_paths[0]).convert("RGB")
+    patches, coords = cortex._crop_patches(image)
+    assert len(patches) == 49
+
+    batched = cortex._embed_patches(patches)
+    single = np.stack([cortex._embed_patches([p])[0] for p in patches])
+    assert batched.shape == (49, 16)
+    assert np.allclose(batched, single, atol=1e-5)
+
+def test_process_batch_matches_process(image_paths, tiny_handle):
+    cortex = make_tiny_cortex(tiny_handle, batch_size=20)
+    batched = cortex.process_batch(image_paths)
+    assert len(batched) == 2
+    for path, segments in zip(image_paths, batched):
+        expected = cortex.process(path)
+        assert len(segments) == len(expected) == 49
+        assert np.allclose([s.embedding for s in segments], [s.embedding for s in expected], atol=1e-5)
+        assert segments[8].metadata["position_normalized"] == expected[8].metadata["position_normalized"]
+
+def test_warm_cache_skips_model(image_paths, tmp_path, tiny_handle):
+    cache = EmbeddingCache(cache_dir=str(tmp_path / "cache"))
+    cortex = make_tiny_cortex(tiny_handle, cache=cache)
+    cold = cortex.process(image_paths[0])
+    assert cache.stats()["misses"] == 1
+
+    cortex.handle._model = None  # any forward pass would now try to load "tiny-clip"
+    warm = cortex.process(image_paths[0])
+    assert cache.stats()["hits"] == 1
+    assert not cortex.handle.loaded
+    assert np.allclose([s.embedding for s in warm], [s.embedding for s in cold])
+    assert warm[3].metadata["position_normalized"] == cold[3].metadata["position_normalized"]
+
+    embeddings, _ = cache.get(cortex._cache_key(open(image_paths[0], "rb").read()))
+    assert isinstance(embeddings, np.memmap)
+
+def test_cache_keys_on_precision(image_paths, tmp_path, tiny_handle):
+    import copy
+    from AGI.src.model_registry import ModelHandle, apply_precision
+    int8 = ModelHandle("tiny-clip", "cpu", "int8", model=apply_precision(copy.deepcopy(tiny_handle.model), "int8", "cpu"),
+                       processor=tiny_handle.processor)
+    cache = EmbeddingCache(cache_dir=str(tmp_path / "cache"))
+    fp32_cortex, int8_cortex = make_tiny_cortex(tiny_handle, cache=cache), make_tiny_cortex(int8, cache=cache)
+
+    image_bytes = open(image_paths[0], "rb").read()
+    assert fp32_cortex._cache_key(image_bytes) != int8_cortex._cache_key(image_bytes)
+    fp32_cortex.process(image_paths[0])
+    int8_cortex.process(image_paths[0])  # must not be served the fp32 entry
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 0
+
+def test_cache_evicts_by_size(tmp_path):
+    cache = EmbeddingCache(cache_dir=str(tmp_path / "cache"), max_bytes=12000)
+    for i in range(3):
+        cache.put(f"key{i}", np.zeros((4, 512), dtype=np.float32), np.zeros((4, 2)))
+    # Each entry is ~8KB, so only the newest one survives
+    assert cache.get("key2") is not None
+    assert cache.get("key0") is None
+
+def test_grid_cortex_objects():
+    from AGI.src.cortex.grid import GridVisualCortex
+    grid = [[0] * 7 for _ in range(6)]
+    grid[1][1:4] = [3, 3, 3]
+    grid[2][2] = 3
+    grid[3][5] = grid[4][5] = 2
+    grid[4][0] = 3
+
+    segments = GridVisualCortex().process({"input": grid, "output": grid})
+    assert len(segments) == 6
+    inputs = [s for s in segments if s.metadata["role"] == "input"]
+    t_shape = inputs[0].metadata
+    assert t_shape["bbox"] == {"y0": 1, "x0": 1, "y1": 2, "x1": 3}
+    assert t_shape["color"] == 3 and t_shape["area"] == 4
+    assert t_shape["mask"] == [[1, 1, 1], [0, 1, 0]]
+    assert t_shape["symmetry"]["left_right"] and not t_shape["symmetry"]["up_down"]
+    assert inputs[2].metadata["symmetry"]["diagonal"]
+    assert len(inputs[0].embedding) == GridVisualCortex.embedding_dim
+
+def test_create_cortex_grid_loads_no_model():
+    from AGI.src.cortex import create_cortex, GridVisualCortex
+    cortex = create_cortex({"type": "grid"})
+    assert isinstance(cortex, GridVisualCortex)
+    assert not hasattr(cortex, "model")
+
+def test_registry_shares_lazy_handles():
+    registry = ModelRegistry()
+    handle = registry.get("some/clip", "cpu")
+    assert registry.get("some/clip", "cpu") is handle
+    assert registry.get("some/clip", "cpu", "bf16") is not handle
+    assert not handle.loaded
+    assert registry.stats()[0]["memory_bytes"] == 0
+
+@pytest.mark.parametrize("dtype", ["bf16", "int8"])
+def test_reduced_precision_tracks_fp32(tiny_handle, dtype):
+    import copy
+    from AGI.src.model_registry import ModelHandle, apply_precision
+    model = apply_precision(copy.deepcopy(tiny_handle.model), dtype, "cpu")
+    reduced = ModelHandle("tiny-clip", "cpu", dtype, model=model, processor=tiny_handle.processor)
+
+    prompts = ["mirror the top half", "shift objects right", "fill the background"]
+    images = [Image.fromarray(np.full((32, 32, 3), 40 * i, dtype=np.uint8)) for i in range(3)]
+    for encode in ("text_features", "image_features"):
+        inputs = prompts if encode == "text_features" else images
+        ref = getattr(tiny_handle, encode)(inputs)
+        out = getattr(reduced, encode)(inputs)
+        assert out.dtype == ref.dtype
+        cos = torch.nn.functional.cosine_similarity(ref, out, dim=-1)
+        assert cos.min() > 0.95
+
+    assert reduced.memory_bytes() < tiny_handle.memory_bytes()
+
+@pytest.mark.asyncio
+async def test_stream_yields_chunks(image_paths, tiny_handle):
+    cortex = make_tiny_cortex(tiny_handle, batch_size=64)
+    cortex.stream_chunk_size = 16
+    chunks = [chunk async for chunk in cortex.stream(image_paths[0])]
+    assert [len(c) for c in chunks] == [16, 16, 16, 1]
+
+    expected = cortex.process(image_paths[0])
+    streamed = [s for chunk in chunks for s in chunk]
+    assert np.allclose([s.embedding for s in streamed], [s.embedding for s in expected], atol=1e-5)
+
+def test_text_cache_hits_and_persists(tiny_handle, tmp_path):
+    from AGI.src.text_cache import TextEmbeddingCache
+
+    calls = []
+    encode = tiny_handle.text_features
+    tiny_handle.text_features = lambda texts: calls.append(list(texts)) or encode(texts)
+
+    path = str(tmp_path / "text.npz")
+    cache = TextEmbeddingCache(max_entries=2, path=path)
+    first = cache.encode(tiny_handle, ["mirror left", "fill holes", "mirror left"])
+    assert calls == [["mirror left", "fill holes"]]  # misses encoded together, once each
+    assert torch.allclose(first.norm(dim=-1), torch.ones(3))
+    reference = encode(["fill holes"])
+    assert torch.allclose(first[1], (reference / reference.norm(dim=-1, keepdim=True))[0], atol=1e-6)
+
+    again = cache.encode(tiny_handle, ["fill holes"])
+    assert len(calls) == 1 and torch.equal(again[0], first[1])
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+    cache.encode(tiny_handle, ["gravity"])  # evicts the least recently used "mirror left"
+    assert cache.stats()["entries"] == 2
+    cache.save()
+
+    reloaded = TextEmbeddingCache(path=path)
+    assert torch.equal(reloaded.encode(tiny_handle, ["fill holes"])[0], first[1])
+    assert reloaded.stats()["hits"] == 1 and len(calls) == 2
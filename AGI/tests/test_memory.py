@@ -0,0 +1,174 @@
+import json
+import random
+from collections import Counter
+import numpy as np
+from AGI.src.swarm.memory import RuleMemory, _FenwickTree
+from AGI.src.swarm.rule_index import RuleVectorIndex
+
+def make_memory(tmp_path, weights):
+    path = tmp_path / "rule_memory.json"
+    rules = [{"text": f"rule {i}", "weight": w, "success_count": 0, "last_used": ""} for i, w in enumerate(weights)]
+    path.write_text(json.dumps({"rules": rules}))
+    return RuleMemory(storage_path=str(path))
+
+def test_indexes_match_linear_behaviour(tmp_path):
+    random.seed(0)
+    weights = [round(random.uniform(0.3, 2.0), 2) for _ in range(200)] + [1.0, 1.0, 0.5]
+    memory = make_memory(tmp_path, weights)
+
+    def sorted_rules():
+        return sorted(memory.rules, key=lambda x: x.get("weight", 1.0), reverse=True)
+
+    assert memory.get_weighted_rules() == sorted_rules()
+    assert memory.get_weighted_rules(top_n=10) == sorted_rules()[:10]
+    assert "rule 7" in memory and "rule 999" not in memory and len(memory) == 203
+
+    memory.add_or_update("rule 7")
+    memory.add_or_update("brand new rule")
+    assert memory.get("brand new rule")["weight"] == 1.0
+    assert memory.get_weighted_rules() == sorted_rules()
+
+    memory.decay_unused(["rule 1", "rule 2"])
+    assert memory.get_weighted_rules() == sorted_rules()
+
+    low = {r["text"] for r in memory.rules if r["weight"] < 0.8}
+    picks = memory.get_rehearsal_candidates(n=len(memory))
+    assert {r["text"] for r in picks} == low
+
+def test_weighted_sampling_follows_weights(tmp_path):
+    random.seed(1)
+    memory = make_memory(tmp_path, [0.5, 1.0, 2.0, 0.5])
+    memory.add_or_update("rule 0")  # 0.5 -> 1.0
+    counts = Counter(r["text"] for r in memory.sample_weighted(k=20000))
+    total = 1.0 + 1.0 + 2.0 + 0.5
+    for i, weight in enumerate([1.0, 1.0, 2.0, 0.5]):
+        assert abs(counts[f"rule {i}"] / 20000 - weight / total) < 0.02
+
+def test_fenwick_tree_prefix_sums():
+    values = [0.5, 2.0, 0.0, 1.5, 3.0, 1.0, 0.25]
+    tree = _FenwickTree(values)
+    assert abs(tree.total() - sum(values)) < 1e-9
+    # find() maps a cumulative position to the value covering it
+    assert [tree.find(t) for t in (0.0, 0.49, 0.5, 2.49, 2.5, 3.99, 4.0, 8.2)] == [0, 0, 1, 1, 3, 3, 4, 6]
+    tree.add(2, 1.0)
+    assert tree.find(2.6) == 2
+
+def test_journal_replays_and_compacts(tmp_path):
+    memory = make_memory(tmp_path, [0.5, 1.0])
+    snapshot = (tmp_path / "rule_memory.json").read_text()
+    memory.store.fsync_every = 3
+    memory.add_or_update("rule 0")
+    memory.add_or_update("new rule")
+    assert not (tmp_path / "rule_memory.json.journal").exists()  # still buffered
+
+    memory.decay_unused(["new rule"])  # third entry triggers the batched append
+    assert len((tmp_path / "rule_memory.json.journal").read_text().splitlines()) == 3
+    assert (tmp_path / "rule_memory.json").read_text() == snapshot  # no full rewrite
+
+    memory.add_or_update("rule 1")
+    memory.flush()
+    reloaded = RuleMemory(storage_path=str(tmp_path / "rule_memory.json"))
+    assert reloaded.rules == memory.rules
+    assert reloaded.get_weighted_rules() == memory.get_weighted_rules()
+
+    # Compaction folds the journal into the snapshot; replaying stale entries is a no-op
+    journal = (tmp_path / "rule_memory.json.journal").read_text()
+    memory.compact()
+    assert not (tmp_path / "rule_memory.json.journal").exists()
+    (tmp_path / "rule_memory.json.journal").write_text(journal + '{"op": "upsert", "se')  # torn write
+    assert RuleMemory(storage_path=str(tmp_path / "rule_memory.json")).rules == memory.rules
+
+def test_journal_compacts_past_size_limit(tmp_path):
+    memory = make_memory(tmp_path, [1.0])
+    memory.store.fsync_every = 1
+    memory.store.compact_bytes = 400
+    for i in range(10):
+        memory.add_or_update(f"learned {i}")
+    journal = tmp_path / "rule_memory.json.journal"
+    assert not journal.exists() or journal.stat().st_size < 400
+    assert len(json.loads((tmp_path / "rule_memory.json").read_text())["rules"]) >= 5
+    memory.flush()
+    assert RuleMemory(storage_path=str(tmp_path / "rule_memory.json")).rules == memory.rules
+
+def test_sqlite_store_matches_json_and_seeds(tmp_path):
+    (tmp_path / "hints.json").write_text(json.dumps({"hint": "rule 2", "timestamp": "now"}))
+    json_memory = make_memory(tmp_path, [0.5, 1.0, 0.35])
+    sql_memory = RuleMemory(storage_path=str(tmp_path / "rule_memory.json"), backend="sqlite")
+    assert (tmp_path / "rule_memory.db").exists()
+    assert sql_memory.rules == json_memory.rules  # seeded from the snapshot, hint applied on top
+    assert sql_memory.get_hint()["hint"] == "rule 2" and sql_memory.get("rule 2")["weight"] == 3.0
+
+    # Compare the weight policy without the hint overlay
+    (tmp_path / "hints.json").unlink()
+    sql_memory.store._conn.execute("DELETE FROM hints")
+    sql_memory.reload()
+    json_memory.reload()
+
+    for memory in (json_memory, sql_memory):
+        memory.add_or_update("rule 0")
+        memory.add_or_update("fresh")
+        memory.decay_unused(["fresh"])
+    strip = lambda rules: [{k: r[k] for k in ("text", "weight", "success_count")} for r in rules]
+    assert strip(sql_memory.rules) == strip(json_memory.rules)
+    assert sql_memory.get_weighted_rules() == sorted(sql_memory.rules, key=lambda r: r["weight"], reverse=True)
+
+    sql_memory.set_hint("gravity", [[1, 2]])
+    assert sql_memory.get_hint() == {"hint": "gravity", "timestamp": sql_memory.get_hint()["timestamp"],
+                                     "solution": [[1, 2]]}
+
+def test_sqlite_store_concurrent_writers_lose_nothing(tmp_path):
+    import threading
+    path = str(tmp_path / "rule_memory.json")
+    writers = [RuleMemory(storage_path=path, backend="sqlite") for _ in range(4)]
+
+    def work(memory):
+        for _ in range(25):
+            memory.add_or_update("shared rule")
+
+    threads = [threading.Thread(target=work, args=(m,)) for m in writers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    reader = RuleMemory(storage_path=path, backend="sqlite")
+    assert reader.get("shared rule")["success_count"] == 100
+    assert reader.get("shared rule")["weight"] == 2.0
+    assert reader.store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_rule_index_ivf_recalls_exact_neighbours():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32))
+    vectors = (centers[rng.integers(0, 20, 2000)] + 0.3 * rng.normal(size=(2000, 32))).astype(np.float32)
+    texts = [f"rule {i}" for i in range(len(vectors))]
+
+    exact = RuleVectorIndex(exact_threshold=10**9)
+    exact.add(texts, vectors)
+    ivf = RuleVectorIndex(exact_threshold=1000, nprobe=8)
+    ivf.add(texts, vectors)
+    assert exact.centroids is None and ivf.centroids is not None
+
+    recall = []
+    for query in rng.normal(size=(20, 32)):
+        truth = {t for t, _ in exact.search(query, k=10)}
+        recall.append(len(truth & {t for t, _ in ivf.search(query, k=10)}) / 10)
+    assert np.mean(recall) > 0.9
+
+    # A rule's own embedding finds it first, including rules added after the IVF build
+    ivf.add(["late rule"], vectors[:1] * -1)
+    assert ivf.search(vectors[5], k=1)[0][0] == "rule 5"
+    assert ivf.search(-vectors[0], k=1)[0][0] == "late rule"
+
+def test_nearest_rules_tracks_memory(tmp_path, tiny_handle):
+    path = tmp_path / "rule_memory.json"
+    texts = ["reflection: mirror left to right", "color_fill: paint zeros blue", "translation: shift objects up"]
+    path.write_text(json.dumps({"rules": [{"text": t, "weight": 1.0, "success_count": 0, "last_used": ""} for t in texts]}))
+    memory = RuleMemory(storage_path=str(path))
+    query = memory.rule_embedding(tiny_handle, texts[1])
+    assert [r["text"] for r in memory.nearest_rules(tiny_handle, query, k=1)] == [texts[1]]
+
+    memory.add_or_update("gravity: move all objects down")
+    query = memory.rule_embedding(tiny_handle, "gravity: move all objects down")
+    assert query is not None
+    assert memory.nearest_rules(tiny_handle, query, k=1)[0]["text"] == "gravity: move all objects down"
+    assert len(memory.nearest_rules(tiny_handle, query, k=10)) == 4
@@ -0,0 +1,78 @@
+import pytest
+from unittest import mock
+from AGI.src.swarm.predictor import ARCPredictor
+from AGI.src.swarm.verification import VerificationCache, grid_hash
+
+GRID = [[1, 2, 0, 0], [3, 4, 0, 0]]
+FLIPPED = [[1, 2, 2, 1], [3, 4, 4, 3]]
+MIRROR = "reflection: mirror the left half of the input to the right output"
+
+def test_verification_cache_matches_apply_rule():
+    cache = VerificationCache(max_entries=8)
+    assert cache.predict(MIRROR, GRID) == ARCPredictor.apply_rule(MIRROR, GRID)
+    assert cache.verify(MIRROR, GRID, FLIPPED)
+    assert not cache.verify(MIRROR, GRID, GRID)
+    assert cache.verify("identity", GRID, GRID)
+
+def test_verification_cache_memoizes_by_fingerprint():
+    cache = VerificationCache(max_entries=2)
+    with mock.patch.object(ARCPredictor, "apply_rule", wraps=ARCPredictor.apply_rule) as apply_rule:
+        cache.verify(MIRROR, GRID, FLIPPED)
+        # Case/whitespace variants and equal-valued grids hit the same entry
+        cache.verify("  " + MIRROR.upper(), [list(row) for row in GRID], FLIPPED)
+        assert apply_rule.call_count == 1
+
+        # A different demo pair is a different key
+        cache.predict(MIRROR, GRID, demo_pair={"input": GRID, "output": FLIPPED})
+        assert apply_rule.call_count == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["entries"] == 2
+
+    cache.predict("identity", GRID)  # bounded: evicts the least recently used entry
+    assert cache.stats()["entries"] == 2
+    assert grid_hash([[1, 2, 3]]) != grid_hash([[1], [2], [3]])
+
+def test_verification_cache_returns_copies_and_caches_errors():
+    cache = VerificationCache()
+    predicted = cache.predict("identity", GRID)
+    predicted[0][0] = 9
+    assert cache.predict("identity", GRID) == GRID
+
+    with mock.patch.object(ARCPredictor, "apply_rule", side_effect=ValueError("bad grid")) as apply_rule:
+        assert not cache.verify("rotation 90", GRID, GRID)
+        with pytest.raises(ValueError):
+            cache.predict("rotation 90", GRID)
+        assert apply_rule.call_count == 1
+
+def test_rule_compiler_caches_plans_and_reports_unparsed_rules():
+    from AGI.src.swarm.rule_compiler import RuleCompiler
+
+    compiler = RuleCompiler(max_entries=2)
+    plan = compiler.compile("Rotation 90, pattern_continuation including gravity drop")
+    assert plan == (("rotate", (3,)), ("continue_horizontal", ()), ("continue_vertical", ()))
+    assert compiler.compile("Rotation 90, pattern_continuation including gravity drop") is plan
+    assert compiler.compile("identity, reflection") == ()
+    assert compiler.unparsed() == {"gravity drop": 1}
+
+    compiler.compile("rotation 180")  # bounded: evicts the least recently used plan
+    assert compiler.stats()["plans"] == 2 and compiler.stats()["hits"] == 1
+
+def test_apply_rule_runs_compiled_plan():
+    assert ARCPredictor.apply_rule("rotation 90", [[1, 2], [3, 4]]) == [[3, 1], [4, 2]]
+    assert ARCPredictor.apply_rule("identity including " + MIRROR, GRID) == FLIPPED
+    assert ARCPredictor.apply_rule("color_fill, unknown op", [[1, 0], [1, 2]]) == [[1, 1], [1, 2]]
+
+def test_pattern_continuation_fills_forward_and_batches():
+    import numpy as np
+
+    grid = np.array([[0, 2, 0, 0, 3, 0],
+                     [0, 0, 0, 0, 0, 0],
+                     [1, 0, 0, 4, 0, 0]])
+    assert ARCPredictor.apply_pattern_continuation_horizontal(grid).tolist() == [
+        [0, 2, 2, 2, 3, 3], [0, 0, 0, 0, 0, 0], [1, 1, 1, 4, 4, 4]]
+    assert ARCPredictor.apply_pattern_continuation_vertical(grid).tolist() == [
+        [0, 2, 0, 0, 3, 0], [0, 2, 0, 0, 3, 0], [1, 2, 0, 4, 3, 0]]
+    assert grid[0, 2] == 0  # input untouched
+
+    batch = np.stack([grid, grid[::-1], np.zeros_like(grid)])
+    filled = ARCPredictor.apply_pattern_continuation_vertical(batch)
+    assert all(np.array_equal(f, ARCPredictor.apply_pattern_continuation_vertical(g)) for f, g in zip(filled, batch))
@@ -3,6 +3,9 @@ import asyncio
 from AGI.src.swarm.core import Swarm
 from AGI.src.bridge.schemas import AgentToken
 
+# Swarm runs read and write rule memory; keep them off the project's AGI/data
+pytestmark = pytest.mark.usefixtures("isolated_memory")
+
 @pytest.mark.asyncio
 async def test_swarm_consensus():
     swarm = Swarm(num_agents=3)
@@ -34,3 +37,542 @@ async def test_swarm_early_stopping():
     
     best_h = await swarm.run_consensus_loop(tokens)
     assert swarm.iteration_count < swarm.max_iterations - 1
+
+@pytest.mark.asyncio
+async def test_swarm_shares_model_handle(tiny_handle):
+    swarm = Swarm(num_agents=2, model_handle=tiny_handle)
+    swarm.max_iterations = 2
+    assert all(agent.model_handle is tiny_handle for agent in swarm.agents)
+
+    tokens = [AgentToken(token_id=f"t{i}", vector=[0.1 * i] * 16, timestamp=1.0) for i in range(1, 5)]
+    await swarm.run_consensus_loop(tokens)
+    assert swarm.global_hypotheses
+
+@pytest.mark.asyncio
+async def test_swarm_consumes_token_stream():
+    from AGI.src.bridge.batch import TokenBatch
+    import numpy as np
+
+    async def token_stream():
+        for chunk in range(3):
+            await asyncio.sleep(0.01)
+            yield TokenBatch(np.full((4, 8), 0.1 * (chunk + 1), dtype=np.float32),
+                             [f"c{chunk}_{i}" for i in range(4)])
+
+    swarm = Swarm(num_agents=2)
+    swarm.max_iterations = 3
+    await swarm.run_consensus_loop(token_stream())
+    # Every agent ends up with every streamed token, each exactly once
+    for agent in swarm.agents:
+        assert len(agent.memory) == 12
+        assert len(set(agent.memory.token_ids)) == 12
+
+def test_evidence_index_prefers_salient_tokens():
+    from AGI.src.bridge.batch import TokenBatch
+    from AGI.src.swarm.evidence import EvidenceIndex
+    import numpy as np
+    import torch
+
+    # 20 near-identical "background" patches and two distinct object patches
+    vectors = np.tile(np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32), (22, 1))
+    vectors[5] = [0.0, 1.0, 0.0, 0.0]
+    vectors[17] = [0.0, 0.0, 1.0, 0.0]
+    metadata = [{"position_normalized": {"x": 0.5, "y": 0.5}} for _ in range(22)]
+    metadata[17] = {"position_normalized": {"x": 1.0, "y": 1.0}}
+    index = EvidenceIndex(TokenBatch(vectors, [f"t{i}" for i in range(22)], metadata=metadata))
+
+    assert index.ranked[:2].tolist() == [5, 17]
+    assert index.sample(2, "topk").tolist() == [5, 17]
+    assert torch.allclose(index.weights[[5, 17]], torch.tensor([1.0, 0.1]), atol=1e-3)
+    assert torch.allclose(index.normalized.norm(dim=-1), torch.ones(22))
+
+    picks = index.sample(3, "importance", generator=torch.Generator().manual_seed(0))
+    assert len(set(picks.tolist())) == 3 and 5 in picks.tolist()
+    assert len(index.sample(50, "random")) == 22
+    with pytest.raises(ValueError):
+        index.sample(2, "nearest")
+
+@pytest.mark.asyncio
+async def test_agent_builds_evidence_index_on_perceive(tiny_handle):
+    from AGI.src.swarm.agent import OmnidirectionalAgent
+    agent = OmnidirectionalAgent(model_handle=tiny_handle)
+    agent.evidence_sampling = "topk"
+    agent.evidence_size = 2
+    tokens = [AgentToken(token_id=f"t{i}", vector=[1.0] + [0.0] * 15, timestamp=1.0) for i in range(6)]
+    tokens.append(AgentToken(token_id="object", vector=[0.0, 1.0] + [0.0] * 14, timestamp=1.0))
+    agent.perceive(tokens)
+    assert agent.evidence_index.size == 7
+
+    candidates = await agent.generate_candidate("test")
+    assert candidates
+    assert all(h.evidence[0] == "object" and len(h.evidence) == 2 for h in candidates)
+
+def test_weighted_similarity_matches_per_prompt_loop():
+    import torch
+    from AGI.src.swarm.evidence import weighted_similarity
+
+    torch.manual_seed(0)
+    text = torch.nn.functional.normalize(torch.randn(4, 16), dim=-1)
+    evidence = torch.nn.functional.normalize(torch.randn(12, 16), dim=-1)
+    weights = torch.rand(12) + 0.1
+
+    batched = weighted_similarity(text, evidence, weights)
+    serial = torch.stack([(torch.mm(t[None], evidence.T)[0] * weights).sum() / weights.sum() for t in text])
+    assert batched.shape == (4,)
+    assert torch.allclose(batched, serial, atol=1e-6)
+
+@pytest.mark.asyncio
+async def test_agent_encodes_all_prompts_in_one_call(tiny_handle):
+    from AGI.src.swarm.agent import OmnidirectionalAgent
+    from AGI.src.text_cache import TEXT_CACHE
+
+    TEXT_CACHE.clear()
+    calls = []
+    encode = tiny_handle.text_features
+    tiny_handle.text_features = lambda texts: calls.append(list(texts)) or encode(texts)
+
+    agent = OmnidirectionalAgent(model_handle=tiny_handle)
+    agent.perceive([AgentToken(token_id=f"t{i}", vector=[0.1 * (i + 1)] * 16, timestamp=1.0) for i in range(8)])
+    candidates = await agent.generate_candidate("test")
+    assert len(calls) == 1 and len(calls[0]) == len(candidates) == agent.max_per_iter
+    assert all(-1.0 <= h.metadata["clip_raw_score"] <= 1.0 for h in candidates)
+
+@pytest.mark.asyncio
+async def test_broker_coalesces_agent_requests(tiny_handle):
+    import torch
+    from AGI.src.swarm.broker import InferenceBroker
+    from AGI.src.swarm.evidence import weighted_similarity
+    from AGI.src.text_cache import TextEmbeddingCache
+
+    calls = []
+    encode = tiny_handle.text_features
+    tiny_handle.text_features = lambda texts: calls.append(list(texts)) or encode(texts)
+    broker = InferenceBroker(tiny_handle, max_batch_size=8, max_wait_ms=5, cache=TextEmbeddingCache())
+
+    torch.manual_seed(0)
+    requests = []
+    for k in (3, 5, 12):
+        evidence = torch.nn.functional.normalize(torch.randn(k, 16), dim=-1)
+        requests.append((["mirror left", f"shift {k}"], evidence, torch.rand(k) + 0.1))
+
+    results = await asyncio.gather(*[broker.score(*r) for r in requests], broker.embed(["gravity"]))
+    assert len(calls) == 1 and len(calls[0]) == 5  # one encoder pass for the union of texts
+    assert broker.stats()["batches"] == 1 and broker.stats()["requests"] == 4
+
+    for (prompts, evidence, weights), scores in zip(requests, results):
+        expected = weighted_similarity(broker.cache.encode(tiny_handle, prompts), evidence, weights)
+        assert torch.allclose(scores, expected, atol=1e-5)
+    assert results[-1].shape == (1, 16)
+
+    # Hitting max_batch_size flushes without waiting for the timer
+    broker.max_batch_size = 2
+    await asyncio.wait_for(asyncio.gather(broker.embed(["a"]), broker.embed(["b"])), timeout=1)
+    assert broker.stats()["batches"] == 2
+
+@pytest.mark.asyncio
+async def test_swarm_agents_share_one_scoring_call(tiny_handle):
+    from AGI.src.text_cache import TEXT_CACHE
+
+    swarm = Swarm(num_agents=3, model_handle=tiny_handle)
+    swarm.max_iterations = 1
+    assert all(agent.broker is swarm.broker for agent in swarm.agents)
+    TEXT_CACHE.clear()
+
+    tokens = [AgentToken(token_id=f"t{i}", vector=[0.1 * i] * 16, timestamp=1.0) for i in range(1, 9)]
+    await swarm.run_consensus_loop(tokens)
+    assert swarm.broker.stats()["batches"] == 1
+    assert swarm.broker.stats()["requests"] == 3
+
+@pytest.mark.asyncio
+async def test_swarm_shares_verification_cache():
+    task = {"input": [[1, 0], [2, 0]], "output": [[1, 1], [2, 2]]}
+    swarm = Swarm(num_agents=3, task_data=task)
+    swarm.max_iterations = 2
+    assert all(agent.verification_cache is swarm.verification_cache for agent in swarm.agents)
+
+    await swarm.run_consensus_loop([AgentToken(token_id="t1", vector=[0.1], timestamp=1.0)])
+    stats = swarm.verification_cache.stats()
+    assert stats["hits"] > 0 and stats["entries"] <= stats["misses"]
+
+def _agents_with_hypotheses():
+    from AGI.src.swarm.agent import OmnidirectionalAgent
+    from AGI.src.swarm.schemas import Hypothesis
+
+    texts = [
+        "reflection: mirror the left half of the input to the right output",
+        "reflection: mirror the top half of the input to the bottom output",
+        "gravity: move all objects to the bottom of the grid",
+        "color_fill: replace all 0-cells with the most frequent non-0 color",
+        "the left half",
+        "identity",
+    ]
+    scores = [0.98, 0.5, 0.03, 0.7, -0.05, 1.0]
+    agents = []
+    for a in range(3):
+        agent = OmnidirectionalAgent(agent_id=f"ag{a}_agent")
+        for i, (text, score) in enumerate(zip(texts[a:] + texts[:a], scores)):
+            h = Hypothesis(hypothesis_id=f"h{a}_{i}", content=text, score=score, agent_id=agent.agent_id)
+            agent.active_hypotheses[h.hypothesis_id] = h
+        agents.append(agent)
+    publications = [h.model_copy() for agent in agents for h in list(agent.active_hypotheses.values())[:3]]
+    return agents, publications
+
+@pytest.mark.asyncio
+async def test_epoch_cross_validation_matches_sequential():
+    from AGI.src.swarm.cross_validation import EpochCrossValidator
+
+    sequential, publications = _agents_with_hypotheses()
+    for publication in publications:
+        for agent in sequential:
+            await agent.cross_validate(publication)
+
+    epoch, publications = _agents_with_hypotheses()
+    EpochCrossValidator.apply(epoch, publications)
+
+    for seq_agent, epoch_agent in zip(sequential, epoch):
+        for hid, expected in seq_agent.active_hypotheses.items():
+            actual = epoch_agent.active_hypotheses[hid]
+            assert actual.score == expected.score
+            # One marker per boosting peer instead of one per boost
+            assert actual.evidence == list(dict.fromkeys(expected.evidence))
+
+@pytest.mark.asyncio
+async def test_swarm_runs_epoch_cross_validation():
+    swarm = Swarm(num_agents=2)
+    swarm.max_iterations = 2
+    assert swarm.cross_validation == "epoch"
+    assert swarm.bus.subscribers["hypotheses"] == [swarm._handle_new_hypothesis]
+
+    await swarm.run_consensus_loop([AgentToken(token_id="t1", vector=[0.1], timestamp=1.0)])
+    assert not swarm._epoch_publications
+    for agent in swarm.agents:
+        assert all(h.score >= 0.4 for h in agent.active_hypotheses.values())
+
+@pytest.mark.asyncio
+async def test_swarm_runs_agents_in_worker_processes(tiny_handle):
+    from conftest import make_tiny_handle
+
+    task = {"input": [[1, 0], [2, 0]], "output": [[1, 1], [2, 2]]}
+    swarm = Swarm(num_agents=3, model_handle=tiny_handle, model_factory=make_tiny_handle, task_data=task)
+    swarm.execution = "process"
+    swarm.max_iterations = 2
+    swarm.scheduler.deadline_seconds = 120.0  # keep every step inside its iteration
+    published = []
+    swarm.bus.subscribe("hypotheses", published.append)
+
+    tokens = [AgentToken(token_id=f"t{i}", vector=[0.1 * i] * 16, timestamp=1.0) for i in range(1, 9)]
+    best = await swarm.run_consensus_loop(tokens)
+
+    assert best is not None
+    assert swarm.process_pool is None  # workers are shut down after the run
+    assert {h.agent_id for h in published} == {agent.agent_id for agent in swarm.agents}
+    # Candidates were scored against the tokens the workers received
+    assert all(set(h.evidence) & {f"t{i}" for i in range(1, 9)} for h in published)
+    assert all(agent.iteration == swarm.iteration_count + 1 for agent in swarm.agents)
+    # Scheduled per agent, not as one pool-wide job
+    assert set(swarm.scheduler.stats()) == {agent.agent_id for agent in swarm.agents}
+
+@pytest.mark.asyncio
+async def test_process_mode_requires_factory_for_preloaded_handle(tiny_handle):
+    swarm = Swarm(num_agents=2, model_handle=tiny_handle)
+    swarm.execution = "process"
+    with pytest.raises(ValueError, match="model_factory"):
+        await swarm.run_consensus_loop([AgentToken(token_id="t1", vector=[0.1] * 16, timestamp=1.0)])
+    assert swarm.process_pool is None  # failed before starting any worker
+
+@pytest.mark.asyncio
+async def test_process_pool_close_does_not_wait_for_running_step():
+    import time
+    from AGI.src.swarm.parallel import ProcessAgentPool
+
+    pool = ProcessAgentPool(num_workers=1)
+    await pool._each(abs, 1)  # worker is up
+    running = asyncio.ensure_future(pool._each(time.sleep, 3))
+    await asyncio.sleep(0.5)
+    start = time.perf_counter()
+    pool.close()
+    assert time.perf_counter() - start < 1.0
+    running.cancel()
+
+@pytest.mark.asyncio
+async def test_scheduler_keeps_finished_results_and_carries_stragglers():
+    from AGI.src.swarm.scheduler import IterationScheduler
+
+    scheduler = IterationScheduler(deadline_seconds=0.05, skip_after_misses=2, skip_iterations=1)
+    calls = {"fast": 0, "slow": 0, "broken": 0}
+
+    async def fast():
+        calls["fast"] += 1
+
+    async def slow():
+        calls["slow"] += 1
+        await asyncio.sleep(0.12)
+
+    async def broken():
+        calls["broken"] += 1
+        raise RuntimeError("boom")
+
+    jobs = {"fast": fast, "slow": slow, "broken": broken}
+    first = await scheduler.run_iteration(jobs)
+    assert sorted(first.completed) == ["fast"] and first.failed == ["broken"] and first.stragglers == ["slow"]
+    assert first.seconds < 0.1  # bounded by the deadline, not the slow job
+
+    # The straggler is still running: it is waited on, not started again
+    second = await scheduler.run_iteration(jobs)
+    assert calls["slow"] == 1 and second.stragglers == ["slow"]
+    # Two misses in a row: the slow job sits out the next iteration
+    await asyncio.sleep(0.05)
+    third = await scheduler.run_iteration(jobs)
+    assert third.skipped == ["slow"] and calls["slow"] == 1
+    assert scheduler.stats()["slow"]["completed"] == 1
+    assert scheduler.latency["slow"] >= 0.1
+
+    fourth = await scheduler.run_iteration(jobs)
+    assert calls["slow"] == 2 and "slow" in fourth.stragglers
+    await scheduler.finish()
+    assert not scheduler.stats()["slow"]["in_flight"]
+
+@pytest.mark.asyncio
+async def test_swarm_keeps_results_from_agents_that_met_the_deadline():
+    swarm = Swarm(num_agents=3)
+    swarm.max_iterations = 3
+    swarm.scheduler.deadline_seconds = 0.05
+    swarm.scheduler.skip_after_misses = 0  # no benching, which would reset the miss count
+    slow_agent = swarm.agents[0]
+    original = slow_agent.run_reasoning_step
+
+    async def slow_step(context):
+        await asyncio.sleep(0.5)
+        return await original(context)
+    slow_agent.run_reasoning_step = slow_step
+
+    tokens = [AgentToken(token_id="t1", vector=[0.1], timestamp=1.0)]
+    start = asyncio.get_running_loop().time()
+    await swarm.run_consensus_loop(tokens)
+    assert asyncio.get_running_loop().time() - start < 0.4
+
+    producers = {h.agent_id for h in swarm.global_hypotheses}
+    assert producers and slow_agent.agent_id not in producers
+    assert swarm.scheduler.misses[slow_agent.agent_id] > 0
+
+@pytest.mark.asyncio
+async def test_redis_bus_delivers_across_nodes():
+    from AGI.src.swarm.redis_bus import RedisMessageBus
+    from AGI.src.swarm.resp import RESPServer
+    from AGI.src.swarm.schemas import Hypothesis
+
+    async with RESPServer() as server:
+        a, b = RedisMessageBus(server.url, "test"), RedisMessageBus(server.url, "test")
+        other = RedisMessageBus(server.url, "elsewhere")
+        received = {"a": [], "b": [], "other": []}
+        a.subscribe("hypotheses", received["a"].append)
+        b.subscribe("hypotheses", received["b"].append)
+        other.subscribe("hypotheses", received["other"].append)
+        for bus in (a, b, other):
+            await bus.start()
+
+        hyp = Hypothesis(hypothesis_id="h1", content="gravity: move all objects down", score=0.7,
+                         agent_id="agent_a", evidence=["t1"], metadata={"context": "sector_0"})
+        await a.publish("hypotheses", hyp)
+        await a.publish("hypotheses", {"kind": "note"})
+        await a.drain()
+        for _ in range(100):
+            if len(received["b"]) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        # Local delivery once (no echo), remote delivery decoded, other prefixes untouched
+        assert received["a"] == [hyp, {"kind": "note"}]
+        assert received["b"][0].model_dump() == hyp.model_dump() and received["b"][1] == {"kind": "note"}
+        assert received["other"] == []
+        assert a.stats()["sent"] == 2 and b.stats()["received"] == 2
+        for bus in (a, b, other):
+            await bus.close()
+
+@pytest.mark.asyncio
+async def test_swarms_share_hypotheses_over_redis_bus():
+    from AGI.src.swarm.comms import create_bus
+    from AGI.src.swarm.resp import RESPServer
+
+    async with RESPServer() as server:
+        swarms = [Swarm(num_agents=2, bus=create_bus("redis", url=server.url, channel_prefix="shared"))
+                  for _ in range(2)]
+        seen = [[], []]
+        for swarm, log in zip(swarms, seen):
+            swarm.max_iterations = 3
+            swarm.bus.subscribe("hypotheses", log.append)
+
+        tokens = [AgentToken(token_id="t1", vector=[0.1], timestamp=1.0)]
+        await asyncio.gather(*(swarm.run_consensus_loop(tokens) for swarm in swarms))
+
+        for swarm, log, peer in zip(swarms, seen, reversed(swarms)):
+            peer_ids = {agent.agent_id for agent in peer.agents}
+            assert {h.agent_id for h in log} & peer_ids
+            assert swarm.bus._publisher is None  # closed after the run
+
+@pytest.mark.asyncio
+async def test_queued_bus_does_not_wait_for_subscribers():
+    from AGI.src.swarm.comms import MessageBus
+
+    bus = MessageBus(delivery="queued", batch_size=8)
+    release = asyncio.Event()
+    slow_seen, fast_seen = [], []
+
+    async def slow(message):
+        await release.wait()
+        slow_seen.append(message)
+
+    bus.subscribe("t", slow)
+    bus.subscribe("t", fast_seen.append)
+    for i in range(5):
+        await asyncio.wait_for(bus.publish("t", i), timeout=0.1)  # returns without the slow callback
+    await asyncio.sleep(0)
+    assert fast_seen == [0, 1, 2, 3, 4] and slow_seen == []
+    assert bus.stats()["t"]["depth"] > 0
+
+    release.set()
+    await bus.drain()
+    assert slow_seen == [0, 1, 2, 3, 4]
+    stats = bus.stats()["t"]
+    assert stats["delivered"] == 10 and stats["depth"] == 0 and stats["max_lag_ms"] > 0
+    await bus.close()
+
+@pytest.mark.asyncio
+async def test_queued_bus_overflow_policies():
+    from AGI.src.swarm.comms import MessageBus
+    from AGI.src.swarm.schemas import Hypothesis
+
+    async def run(policy, messages):
+        bus = MessageBus(delivery="queued", queue_size=2, overflow=policy)
+        gate, seen = asyncio.Event(), []
+
+        async def consumer(message):
+            await gate.wait()
+            seen.append(message)
+        bus.subscribe("t", consumer)
+        await bus.publish("t", messages[0])
+        await asyncio.sleep(0)  # the consumer takes the first message and waits
+        publishes = [asyncio.ensure_future(bus.publish("t", m)) for m in messages[1:]]
+        await asyncio.sleep(0.01)
+        blocked = sum(not p.done() for p in publishes)
+        gate.set()
+        await asyncio.gather(*publishes)
+        await bus.drain()
+        return seen, blocked, bus.stats()["t"]
+
+    seen, blocked, stats = await run("block", [0, 1, 2, 3, 4])
+    assert seen == [0, 1, 2, 3, 4] and blocked > 0 and stats["dropped"] == 0
+
+    seen, blocked, stats = await run("drop_oldest", [0, 1, 2, 3, 4])
+    assert seen == [0, 3, 4] and blocked == 0 and stats["dropped"] == 2
+
+    def hyp(hid, score):
+        return Hypothesis(hypothesis_id=hid, content="c", score=score, agent_id="a")
+    seen, blocked, stats = await run("coalesce", [hyp("x", 0.1), hyp("y", 0.1), hyp("y", 0.5), hyp("y", 0.9)])
+    assert [(h.hypothesis_id, h.score) for h in seen] == [("x", 0.1), ("y", 0.9)]
+    assert stats["coalesced"] == 2 and stats["dropped"] == 0
+
+def test_shared_board_lanes_ring_and_torn_records():
+    from AGI.src.swarm.board import SharedHypothesisBoard
+    from AGI.src.swarm.schemas import Hypothesis
+
+    board = SharedHypothesisBoard(lanes=2, capacity=4, rule_capacity=8)
+    peer = SharedHypothesisBoard.attach(board.name, lane=1)
+    try:
+        for i in range(6):
+            board.append(Hypothesis(hypothesis_id=f"a{i}", content=f"rule {i % 2}", score=i / 10, agent_id="a"))
+        peer.append(Hypothesis(hypothesis_id="b0", content="gravity", score=0.9, agent_id="b"))
+
+        # Lane 0 wrapped: only its last `capacity` records survive; rules are shared by id
+        records, cursor = peer.read()
+        assert [r.decode() for r in records["hypothesis_id"]] == ["a2", "a3", "a4", "a5", "b0"]
+        assert cursor == [6, 1]
+        assert [h.content for h in board.to_hypotheses(board.top(2))] == ["gravity", "rule 1"]
+        assert board.stats()["rules"] == 3
+
+        # Incremental reads skip this process's own lane
+        board.append(Hypothesis(hypothesis_id="a6", content="rule 0", score=0.1, agent_id="a"))
+        records, cursor = board.read(cursor, skip_own=True)
+        assert len(records) == 0 and cursor == [7, 1]
+
+        # A record caught mid-write (odd seq) is skipped rather than read torn
+        board._records["seq"][0, 6 % 4] += 1
+        ids = [r.decode() for r in peer.read()[0]["hypothesis_id"]]
+        assert "a6" not in ids and ids == ["a3", "a4", "a5", "b0"]
+    finally:
+        peer.close()
+        board.close()
+        board.unlink()
+
+def _write_to_board(name, lane, count):
+    from AGI.src.swarm.board import SharedHypothesisBoard
+    from AGI.src.swarm.schemas import Hypothesis
+
+    board = SharedHypothesisBoard.attach(name, lane)
+    for i in range(count):
+        board.append(Hypothesis(hypothesis_id=f"p{lane}_{i}", content=f"remote rule {i}", score=i / count,
+                                agent_id=f"proc{lane}"))
+    board.close()
+
+def test_shared_board_across_processes():
+    import multiprocessing
+    from AGI.src.swarm.board import SharedHypothesisBoard
+
+    board = SharedHypothesisBoard(lanes=3, capacity=64, rule_capacity=64)
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=_write_to_board, args=(board.name, lane, 20)) for lane in (1, 2)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=60)
+            assert p.exitcode == 0
+        records, _ = board.read()
+        assert len(records) == 40 and set(records["lane"]) == {1, 2}
+        best = board.to_hypotheses(board.top(1))[0]
+        assert best.content == "remote rule 19" and best.metadata["board_lane"] in (1, 2)
+    finally:
+        board.close()
+        board.unlink()
+
+@pytest.mark.asyncio
+async def test_swarms_share_hypotheses_through_board():
+    from AGI.src.swarm.board import SharedHypothesisBoard
+
+    board = SharedHypothesisBoard(lanes=2, capacity=1024, rule_capacity=256)
+    peer_board = SharedHypothesisBoard.attach(board.name, lane=1)
+    try:
+        swarms = [Swarm(num_agents=2, board=board), Swarm(num_agents=2, board=peer_board)]
+        seen = [[], []]
+        for swarm, log in zip(swarms, seen):
+            swarm.max_iterations = 3
+            swarm.bus.subscribe("hypotheses", log.append)
+
+        tokens = [AgentToken(token_id="t1", vector=[0.1], timestamp=1.0)]
+        await asyncio.gather(*(swarm.run_consensus_loop(tokens) for swarm in swarms))
+
+        for log, peer in zip(seen, reversed(swarms)):
+            peer_ids = {agent.agent_id for agent in peer.agents}
+            assert {h.agent_id for h in log if "board_lane" in h.metadata} & peer_ids
+        leaders = swarms[0].leaderboard(5)
+        assert leaders and leaders[0].score == max(h.score for h in board.to_hypotheses(board.latest()))
+    finally:
+        peer_board.close()
+        board.close()
+        board.unlink()
+
+@pytest.mark.asyncio
+async def test_swarm_releases_board_it_created(monkeypatch):
+    from multiprocessing import shared_memory
+    from AGI.src.config_loader import DEFAULT_CONFIG
+
+    monkeypatch.setitem(DEFAULT_CONFIG["swarm"], "board",
+                        {"enabled": True, "lanes": 2, "capacity": 256, "rule_capacity": 64})
+    swarm = Swarm(num_agents=2)
+    swarm.max_iterations = 2
+    name = swarm.board.name
+    await swarm.run_consensus_loop([AgentToken(token_id="t1", vector=[0.1], timestamp=1.0)])
+
+    assert swarm.board is None and swarm.leaderboard(1) == swarm.global_hypotheses[:1]
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)